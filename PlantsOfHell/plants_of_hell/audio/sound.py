@@ -1,46 +1,249 @@
 import math
 import random
 import struct
-import wave
+import threading
+import time
+from array import array
 from io import BytesIO
 
 import pygame as pg
 
 
+# Mixer channel layout: effects get a fixed pool, music its own channel.
+# All channels are reserved so Sound.play() never grabs one on its own.
+NUM_CHANNELS = 8
+EFFECT_CHANNELS = range(0, NUM_CHANNELS - 1)
+MUSIC_CHANNEL = NUM_CHANNELS - 1
+# Requests for the same sound closer together than this are rate limited.
+VOICE_WINDOW = 0.03
+
+# Streamed music: chunk length and how long each chord is held.
+MUSIC_CHUNK_SECONDS = 0.5
+MUSIC_CHORD_SECONDS = (3.0, 7.0)
+# Amplitude of each chord voice: the levels of the original 1.2 s loop, so a
+# given music volume sounds as loud as it always did; the swell moves around them.
+MUSIC_LEVELS = (600 * 0.4, 500 * 0.4, 400 * 0.4)
+_MUSIC_CHORDS = (
+    (220.00, 261.63, 329.63),  # A minor
+    (196.00, 246.94, 293.66),  # G major
+    (174.61, 220.00, 261.63),  # F major
+    (164.81, 196.00, 246.94),  # E minor
+    (146.83, 174.61, 220.00),  # D minor
+)
+
+
+class VoiceManager:
+    """Plays one-shot effects on a reserved pool of mixer channels.
+
+    Each registered sound has a cap on concurrent voices (the oldest of its own
+    voices is restarted past the cap) and may start at most `per_window` voices
+    per VOICE_WINDOW; further requests in that window are coalesced into the
+    last voice by raising its volume instead, as long as that voice is still
+    playing this sound.
+    """
+
+    def __init__(self, channel_ids, window: float = VOICE_WINDOW):
+        self.channels = [pg.mixer.Channel(i) for i in channel_ids]
+        self.window = window
+        self._specs = {}
+        self._owners = [None] * len(self.channels)  # (name, start time) per channel
+        self._windows = {}  # name -> [window start, voices started, channel index, volume]
+        self.played = 0
+        self.coalesced = 0
+
+    def register(self, name: str, sound, max_voices: int = 3, per_window: int = 2):
+        self._specs[name] = (sound, max_voices, per_window)
+
+    def _pick_channel(self, name, max_voices):
+        busy = [i for i, ch in enumerate(self.channels) if ch.get_busy()]
+        own = [i for i in busy if self._owners[i] and self._owners[i][0] == name]
+        if len(own) >= max_voices:
+            return min(own, key=lambda i: self._owners[i][1])
+        for i, ch in enumerate(self.channels):
+            if not ch.get_busy():
+                return i
+        return min(busy, key=lambda i: self._owners[i][1] if self._owners[i] else 0.0)
+
+    def _still_playing(self, i, name):
+        owner = self._owners[i] if i is not None else None
+        return owner is not None and owner[0] == name and self.channels[i].get_busy()
+
+    def play(self, name: str, volume: float):
+        spec = self._specs.get(name)
+        if spec is None or volume <= 0:
+            return
+        sound, max_voices, per_window = spec
+        now = time.perf_counter()
+        win = self._windows.get(name)
+        if win is not None and now - win[0] < self.window and self._still_playing(win[2], name):
+            if win[1] >= per_window:
+                win[3] = min(1.0, win[3] + volume * 0.2)
+                self.channels[win[2]].set_volume(win[3])
+                self.coalesced += 1
+                return
+            win[1] += 1
+        else:
+            # no window yet, it expired, or its voice ended or was stolen by another sound
+            win = [now, 1, None, volume]
+            self._windows[name] = win
+        i = self._pick_channel(name, max_voices)
+        ch = self.channels[i]
+        ch.set_volume(volume)
+        ch.play(sound)
+        self._owners[i] = (name, now)
+        win[2] = i
+        win[3] = volume
+        self.played += 1
+
+    def stop(self):
+        for ch in self.channels:
+            ch.stop()
+
+
+class MusicStream:
+    """Synthesizes ambient music chunk by chunk on a background thread.
+
+    One chunk is always queued behind the playing one on the music channel, so
+    memory stays flat no matter how long it runs. Chords drift randomly with a
+    glide between them, so the music doesn't loop. Nothing is generated while
+    the volume is 0; the thread only starts once music is first turned up.
+    """
+
+    def __init__(self, channel, seed=None):
+        self.channel = channel
+        self.rate, _size, self.nchannels = pg.mixer.get_init()
+        self.rng = random.Random(seed)
+        self.volume = 0.0
+        self._freqs = list(_MUSIC_CHORDS[0])
+        self._targets = list(_MUSIC_CHORDS[0])
+        self._phases = [0.0, 0.0, 0.0]
+        self._chord_left = self.rng.uniform(*MUSIC_CHORD_SECONDS)
+        self._t = 0.0
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def set_volume(self, v: float):
+        self.volume = v
+        self.channel.set_volume(v)
+        if v > 0:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="music-stream", daemon=True)
+                self._thread.start()
+            self._wake.set()
+
+    def close(self):
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.channel.stop()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.clear()
+            if self.volume <= 0:
+                self._wake.wait()
+                continue
+            if self.channel.get_queue() is None:
+                sound = pg.mixer.Sound(buffer=self.render_chunk())
+                if self.channel.get_busy():
+                    self.channel.queue(sound)
+                else:
+                    self.channel.play(sound)
+            self._wake.wait(MUSIC_CHUNK_SECONDS / 4)
+
+    def _next_chord(self):
+        current = tuple(self._targets)
+        choices = [c for c in _MUSIC_CHORDS if c != current]
+        chord = self.rng.choice(choices)
+        # occasional octave drops and slight detune keep repeats from sounding identical
+        self._targets = [f * (0.5 if self.rng.random() < 0.2 else 1.0) * self.rng.uniform(0.997, 1.003) for f in chord]
+        self._chord_left = self.rng.uniform(*MUSIC_CHORD_SECONDS)
+
+    def render_chunk(self) -> bytes:
+        rate = self.rate
+        n = int(rate * MUSIC_CHUNK_SECONDS)
+        tau = 2 * math.pi
+        samples = array('h')
+        block = 256
+        p0, p1, p2 = self._phases
+        a0, a1, a2 = MUSIC_LEVELS
+        t = self._t
+        dt = 1.0 / rate
+        for start in range(0, n, block):
+            self._chord_left -= block * dt
+            if self._chord_left <= 0:
+                self._next_chord()
+            for k in range(3):
+                self._freqs[k] += (self._targets[k] - self._freqs[k]) * 0.03
+            i0, i1, i2 = (tau * f * dt for f in self._freqs)
+            for _ in range(min(block, n - start)):
+                swell = 1.0 + 0.35 * math.sin(tau * 0.09 * t)
+                val = (a0 * math.sin(p0) + a1 * math.sin(p1) + a2 * math.sin(p2)) * swell
+                samples.append(int(val))
+                p0 += i0
+                p1 += i1
+                p2 += i2
+                t += dt
+        self._phases = [p0 % tau, p1 % tau, p2 % tau]
+        self._t = t
+        if self.nchannels == 1:
+            return samples.tobytes()
+        out = array('h', bytes(len(samples) * 2 * self.nchannels))
+        for c in range(self.nchannels):
+            out[c::self.nchannels] = samples
+        return out.tobytes()
+
+
 class SoundBank:
     def __init__(self):
         self.enabled = False
         try:
             pg.mixer.pre_init(44100, -16, 1, 256)
             pg.mixer.init()
+            pg.mixer.set_num_channels(NUM_CHANNELS)
+            pg.mixer.set_reserved(NUM_CHANNELS)
             self.enabled = True
         except Exception:
             self.enabled = False
+        self.voices = None
         self.shoot_snd = None
         self.hit_snd = None
-        self.music_snd = None
-        self.music_channel = None
+        self.music = None
         self.effects_volume = 0.8
         self.music_volume = 0.0
+        # fast-forward plays one effect request in `thin`; 0 mutes effects
+        self.thin = 1
+        self._requests = 0
+        self._prepared = False
+        if self.enabled and abs(pg.mixer.get_init()[1]) == 16:
+            # music is generated on demand in a dedicated channel
+            self.music = MusicStream(pg.mixer.Channel(MUSIC_CHANNEL))
+
+    def prepare(self):
+        """Synthesize the effects; done once, on the first effect or after the first frame is up."""
+        if self._prepared:
+            return
+        self._prepared = True
         if self.enabled:
             try:
                 self.shoot_snd = self._build_shoot()
                 self.hit_snd = self._build_hit()
-                self.music_snd = self._build_music()
             except Exception:
                 try:
                     self.shoot_snd = self._build_shoot(fallback_to_file=True)
                     self.hit_snd = self._build_hit(fallback_to_file=True)
-                    self.music_snd = self._build_music(fallback_to_file=True)
                 except Exception:
                     self.enabled = False
-        if self.enabled and self.music_snd:
-            # start looping "music" in a dedicated channel
-            self.music_channel = pg.mixer.Channel(7)
-            self.music_channel.set_volume(self.music_volume)
-            self.music_channel.play(self.music_snd, loops=-1)
+        if self.enabled:
+            self.voices = VoiceManager(EFFECT_CHANNELS)
+            self.voices.register('shoot', self.shoot_snd, max_voices=3, per_window=2)
+            self.voices.register('hit', self.hit_snd, max_voices=3, per_window=2)
 
     def _tone_bytes(self, samplerate, samples):
+        import wave
+
         buf = BytesIO()
         with wave.open(buf, 'wb') as w:
             w.setnchannels(1)
@@ -85,47 +288,34 @@ class SoundBank:
         tmp = BytesIO(data)
         return pg.mixer.Sound(file=tmp)
 
+    def _thinned(self) -> bool:
+        if self.thin == 1:
+            return False
+        self._requests += 1
+        return not self.thin or self._requests % self.thin
+
     def play_shoot(self):
-        if self.enabled and self.shoot_snd:
-            s = self.shoot_snd
-            s.set_volume(self.effects_volume)
-            s.play()
+        if self.enabled and not self._thinned():
+            self.prepare()
+            if self.shoot_snd:
+                self.voices.play('shoot', self.effects_volume)
 
     def play_hit(self):
-        if self.enabled and self.hit_snd:
-            s = self.hit_snd
-            s.set_volume(self.effects_volume)
-            s.play()
+        if self.enabled and not self._thinned():
+            self.prepare()
+            if self.hit_snd:
+                self.voices.play('hit', self.effects_volume)
 
     def set_effects_volume(self, v: float):
         self.effects_volume = max(0.0, min(1.0, v))
 
     def set_music_volume(self, v: float):
         self.music_volume = max(0.0, min(1.0, v))
-        if self.music_channel:
-            self.music_channel.set_volume(self.music_volume)
+        if self.music:
+            self.music.set_volume(self.music_volume)
 
-    def _build_music(self, fallback_to_file: bool = False):
-        # generate a soft ambient loop
-        sr = 22050
-        dur = 1.2  # short loop
-        n = int(sr * dur)
-        samples = []
-        for i in range(n):
-            t = i / sr
-            # simple chord-ish blend with slow wobble
-            a = 220  # A3
-            c = 261.63  # C4
-            e = 329.63  # E4
-            wob = 0.5 + 0.5 * math.sin(2 * math.pi * 0.25 * t)
-            val = (
-                600 * math.sin(2 * math.pi * a * t) +
-                500 * math.sin(2 * math.pi * c * t * (0.995 + 0.01 * wob)) +
-                400 * math.sin(2 * math.pi * e * t * (1.005 - 0.01 * wob))
-            ) * 0.4
-            samples.append(val)
-        data = self._tone_bytes(sr, samples)
-        if not fallback_to_file:
-            return pg.mixer.Sound(buffer=data)
-        tmp = BytesIO(data)
-        return pg.mixer.Sound(file=tmp)
+    def close(self):
+        if self.music:
+            self.music.close()
+        if self.voices:
+            self.voices.stop()
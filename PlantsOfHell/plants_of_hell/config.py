@@ -16,6 +16,14 @@ WIDTH = GRID_LEFT + COLS * TILE_W + MARGIN_RIGHT
 HEIGHT = GRID_TOP + ROWS * TILE_H + BAR_H + MARGIN_BOTTOM
 
 FPS = 60
+# Longest block in pg.event.wait while paused (settings open, game over, window unfocused)
+IDLE_WAIT_MS = 250
+
+# Fast-forward: simulation ticks per displayed tick; 0 runs as fast as possible.
+# Turbo modes always step at 1 / FPS so collisions behave as at normal speed.
+SPEED_MODES = (1, 2, 4, 8, 0)
+SPEED_MAX_DRAW_EVERY = 4  # at max speed, draw one frame in this many
+SPEED_MAX_LAG_FRAMES = 3  # turbo never tries to catch up more than this many frames of ticks
 
 # Gameplay tuning
 PEA_SPEED = 360.0  # px/s
@@ -29,6 +37,21 @@ ZOMBIE_EAT_DPS = 28  # damage per second to plants
 
 PLANT_MAX_HP = 100
 
+# Effects
+PARTICLE_BUDGET = 256  # max live particles
+PARTICLE_COALESCE_PX = 12  # hits closer than this in one tick share a burst
+
+# Save states
+REWIND_EVERY_TICKS = 15  # one rewind snapshot every quarter second at 60 FPS
+REWIND_SLOTS = 240  # one minute of history
+REWIND_STEP = 8  # snapshots dropped per rewind key press (two seconds)
+
+# Profiling (F8 captures the next PROFILE_FRAMES frames)
+PROFILE_FRAMES = 300
+
+# Surface cache (render/surface_cache.py): derived sprites beyond this are evicted, least recently used first
+SURFACE_CACHE_MB = 64
+
 # Colors
 BG = (28, 120, 65)
 GRID_DARK = (22, 100, 55)
@@ -46,11 +69,30 @@ RED = (220, 60, 60)
 PACKAGE_DIR = Path(__file__).resolve().parent
 ROOT_DIR = PACKAGE_DIR.parent
 ASSETS_DIR = ROOT_DIR / "assets"
+SAVE_DIR = ROOT_DIR / "saves"
+PROFILE_DIR = ROOT_DIR / "profiles"
 
 
 def grid_rect(row: int, col: int) -> pg.Rect:
     return pg.Rect(GRID_LEFT + col * TILE_W, GRID_TOP + row * TILE_H, TILE_W, TILE_H)
 
 
+# Shared per-cell rects for per-frame code, indexed [row][col]. Never mutate
+# them; use grid_rect() for a private copy.
+CELL_RECTS = tuple(tuple(grid_rect(r, c) for c in range(COLS)) for r in range(ROWS))
+
+
+def speed_label(mode: int) -> str:
+    return f"{mode}x" if mode else "Max"
+
+
 def clamp(v, a, b):
     return max(a, min(b, v))
+
+
+MIN_RENDER_SCALE = 0.5
+
+
+def snap_render_scale(value: float) -> float:
+    # 5% steps keep the number of pre-scaled sprite variants small
+    return clamp(round(value * 20) / 20, MIN_RENDER_SCALE, 1.0)
@@ -1,8 +1,19 @@
+import random
+
 import pygame as pg
 from ..config import clamp
+from ..render.surface_cache import SURFACES
+
+
+def _disc(radius, color) -> pg.Surface:
+    s = pg.Surface((radius * 2, radius * 2), pg.SRCALPHA)
+    pg.draw.circle(s, color, (radius, radius), radius)
+    return s
 
 
 class Particle:
+    snapshot_fields = ("x", "y", "radius", "life", "color", "fade")
+
     def __init__(self, x, y, vx, vy, radius, life, color, fade=True):
         self.x = x
         self.y = y
@@ -26,8 +37,155 @@ class Particle:
         alpha = 255
         if self.fade:
             alpha = int(255 * clamp(self.life, 0, 1))
-        col = (*self.color, alpha)
-        s = pg.Surface((self.radius * 2, self.radius * 2), pg.SRCALPHA)
-        pg.draw.circle(s, col, (self.radius, self.radius), self.radius)
+        # an opaque disc faded with surface alpha blends exactly like a disc drawn in that alpha
+        s = SURFACES.get("particle", lambda: _disc(self.radius, self.color), variant=self.radius, tint=self.color)
+        s.set_alpha(alpha)
         surf.blit(s, (int(self.x - self.radius), int(self.y - self.radius)))
 
+    def reset(self, x, y, vx, vy, radius, life, color, fade=True):
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.radius = radius
+        self.life = life
+        self.color = color
+        self.fade = fade
+
+
+# Effect priorities: when the budget runs low, lower priorities are refused first.
+PRIORITY_SMOKE = 0
+PRIORITY_BITE = 1
+PRIORITY_SPARK = 2
+PRIORITY_FLASH = 3
+
+# A burst landing where one of its kind already went off this tick is merged
+# into it: the first burst's particles grow a pixel (up to the cap) and live a
+# little longer, instead of a second set of particles being emitted.
+BURST_MERGE_GROWTH = 1
+BURST_MERGE_MAX_RADIUS = 6
+BURST_MERGE_LIFE = 0.05
+
+# Fraction of the budget an effect may fill before new emissions of it are dropped.
+# Sparks and flashes are always admitted and overwrite the oldest particle instead.
+_ADMIT_LIMIT = {
+    PRIORITY_SMOKE: 0.5,
+    PRIORITY_BITE: 0.75,
+    PRIORITY_SPARK: 1.0,
+    PRIORITY_FLASH: 1.0,
+}
+
+
+class ParticlePool:
+    """Fixed-capacity particle storage backed by a ring of reusable Particles.
+
+    Particles are written at the head in emission order. Since lifetimes are
+    short and similar, they die roughly in that order too, so the tail just
+    skips past dead slots; when the ring is full the oldest particle is
+    overwritten.
+
+    Emitters draw their randomness from `rng`, never the global `random` the
+    simulation uses, so how many particles get emitted (thinned by budget or
+    fast-forward) cannot change how the game plays out.
+    """
+
+    def __init__(self, capacity: int, coalesce_px: int = 12, seed=None):
+        self.capacity = capacity
+        self.coalesce_px = coalesce_px
+        self.rng = random.Random(seed)
+        self._ring = [Particle(0, 0, 0, 0, 1, 0.0, (0, 0, 0)) for _ in range(capacity)]
+        self._head = 0  # total particles ever written; slot = index % capacity
+        self._tail = 0
+        self.live = 0
+        self.dropped = 0
+        self.merged = 0
+        # fast-forward keeps one emission in `thin`; 0 stops emitting altogether
+        self.thin = 1
+        self._thinned = 0
+        self._bursts = {}  # (kind, cell x, cell y) -> ring indices of this tick's burst there
+
+    def __len__(self):
+        return self.live
+
+    def __iter__(self):
+        ring, cap = self._ring, self.capacity
+        for i in range(self._tail, self._head):
+            p = ring[i % cap]
+            if p.life > 0:
+                yield p
+
+    def clear(self):
+        for p in self._ring:
+            p.life = 0.0
+        self._head = self._tail = 0
+        self.live = 0
+        self._bursts.clear()
+
+    def free_fraction(self) -> float:
+        return 1.0 - self.live / self.capacity
+
+    def scaled_count(self, count: int, priority: int) -> int:
+        """How many of `count` particles to emit given the remaining budget."""
+        # full density until half the budget is used, then thinning down to nothing
+        if not self.thin:
+            return 0
+        n = round(count * min(1.0, self.free_fraction() * 2))
+        if priority >= PRIORITY_SPARK:
+            n = max(1, n)
+        return n
+
+    def claim_burst(self, x, y, kind):
+        """A list to pass to emit() as `burst`, or None if one of this kind already
+        went off near (x, y) this tick; that burst is reinforced instead."""
+        key = (kind, int(x) // self.coalesce_px, int(y) // self.coalesce_px)
+        burst = self._bursts.get(key)
+        if burst is not None:
+            ring, cap, tail = self._ring, self.capacity, self._tail
+            for i in burst:
+                # below the tail the slot may already hold another effect's particle
+                if i < tail:
+                    continue
+                p = ring[i % cap]
+                if p.life > 0:
+                    p.radius = min(BURST_MERGE_MAX_RADIUS, p.radius + BURST_MERGE_GROWTH)
+                    p.life += BURST_MERGE_LIFE
+            self.merged += 1
+            return None
+        burst = self._bursts[key] = []
+        return burst
+
+    def emit(self, x, y, vx, vy, radius, life, color, priority=PRIORITY_SPARK, fade=True, burst=None):
+        if self.thin != 1:
+            self._thinned += 1
+            if not self.thin or self._thinned % self.thin:
+                return None
+        if self.live >= self.capacity * _ADMIT_LIMIT[priority] and priority < PRIORITY_SPARK:
+            self.dropped += 1
+            return None
+        if self._head - self._tail >= self.capacity:
+            oldest = self._ring[self._tail % self.capacity]
+            if oldest.life > 0:
+                oldest.life = 0.0
+                self.live -= 1
+                self.dropped += 1
+            self._tail += 1
+        p = self._ring[self._head % self.capacity]
+        p.reset(x, y, vx, vy, radius, life, color, fade)
+        if burst is not None:
+            burst.append(self._head)
+        self._head += 1
+        self.live += 1
+        return p
+
+    def update(self, dt):
+        ring, cap = self._ring, self.capacity
+        for i in range(self._tail, self._head):
+            p = ring[i % cap]
+            if p.life > 0:
+                p.update(dt)
+                if p.life <= 0:
+                    self.live -= 1
+        while self._tail < self._head and ring[self._tail % cap].life <= 0:
+            self._tail += 1
+        # coalescing only merges hits within the same tick
+        self._bursts.clear()
@@ -1,6 +1,14 @@
+import itertools
+
+# ids are unique for the lifetime of the process, so observers can follow an
+# entity across ticks without holding a reference to it
+_ids = itertools.count(1)
+
+
 class Entity:
     def __init__(self):
         self.alive = True
+        self.id = next(_ids)
 
     def update(self, dt, game):
         pass
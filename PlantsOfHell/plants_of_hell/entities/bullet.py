@@ -1,22 +1,33 @@
 import pygame as pg
 from ..config import WIDTH, PEA_DAMAGE, PEA_GREEN
+from .base import Entity
 
 
-class Bullet:
+class Bullet(Entity):
+    snapshot_fields = ("alive", "id", "x", "y", "radius", "color")
+
     def __init__(self, x: float, y: float, vx: float, radius: int = 7, damage: int = PEA_DAMAGE, *, color=None, slow: float = 0.0, slow_time: float = 0.0):
+        super().__init__()
         self.x = x
         self.y = y
         self.vx = vx
         self.radius = radius
         self.damage = damage
-        self.alive = True
         self.color = color or PEA_GREEN
         # slow is multiplier applied to zombie speed (e.g., 0.5), slow_time is duration in seconds
         self.slow = slow
         self.slow_time = slow_time
 
+    _rect = None
+
     def rect(self) -> pg.Rect:
-        return pg.Rect(int(self.x - self.radius), int(self.y - self.radius), self.radius * 2, self.radius * 2)
+        """The bullet's bounds, updated in place; the same Rect is returned every call."""
+        r = self._rect
+        if r is None:
+            r = self._rect = pg.Rect(0, 0, self.radius * 2, self.radius * 2)
+        r.x = int(self.x - self.radius)
+        r.y = int(self.y - self.radius)
+        return r
 
     def update(self, dt):
         self.x += self.vx * dt
@@ -24,8 +35,11 @@ class Bullet:
             self.alive = False
 
     def draw(self, surf, fancy_vfx: bool = True):
-        cx, cy = int(self.x), int(self.y)
-        pg.draw.circle(surf, self.color, (cx, cy), self.radius)
-        pg.draw.circle(surf, (220, 255, 220), (cx - 2, cy - 2), max(1, self.radius - 5))
+        self.draw_at(surf, int(self.x), int(self.y), self.color, self.radius, fancy_vfx)
+
+    @staticmethod
+    def draw_at(surf, cx, cy, color, radius, fancy_vfx):
+        pg.draw.circle(surf, color, (cx, cy), radius)
+        pg.draw.circle(surf, (220, 255, 220), (cx - 2, cy - 2), max(1, radius - 5))
         if fancy_vfx:
-            pg.draw.circle(surf, (120, 220, 120), (cx - 8, cy), max(1, self.radius - 3))
+            pg.draw.circle(surf, (120, 220, 120), (cx - 8, cy), max(1, radius - 3))
@@ -1,9 +1,10 @@
+import math
 import pygame as pg
 from dataclasses import dataclass
 from ..config import (
     PLANT_MAX_HP,
     BLACK,
-    grid_rect,
+    CELL_RECTS,
     clamp,
     PEASHOOTER_FIRE_RATE,
     PEA_GREEN,
@@ -12,14 +13,25 @@ from ..config import (
     ASSETS_DIR,
 )
 from ..entities.bullet import Bullet
+from ..render.surface_cache import SURFACES
 from .base import Entity
 
 
-_PEASHOOTER_SURF = None
-_PEASHOOTER_FRAMES = None
-_REPEATER_SURF = None
-_SNOWPEA_SURF = None
-_WALLNUT_SURF = None
+# Plant art, its scaled and tinted variants and the health bars all live in
+# SURFACES. Loaded art is pinned (a missing file is cached as None and not
+# retried); variants are rebuilt on demand if the cache evicted them.
+# A hurt plant is drawn pre-tinted, at one of HURT_TINT_STEPS strengths rounded
+# up from hurt_timer; the step is the variant's tint.
+HURT_TIME = 0.25
+HURT_TINT = (255, 120, 120, 100)
+HURT_TINT_STEPS = 4
+HP_BAR_BACK = (50, 50, 50)
+HP_BAR_FILL = (60, 220, 90)
+# colors of the plain fallback body, untinted first
+BODY_COLORS = tuple(
+    tuple(round(c + (t - c) * 120 * step / HURT_TINT_STEPS / 255) for c, t in zip((40, 180, 60), (255, 80, 80)))
+    for step in range(HURT_TINT_STEPS + 1)
+)
 
 
 def _scale_surface_to_tile(surface: pg.Surface, scale=(0.92, 0.95)) -> pg.Surface:
@@ -36,9 +48,82 @@ def _scale_surface_to_tile(surface: pg.Surface, scale=(0.92, 0.95)) -> pg.Surfac
     return pg.transform.smoothscale(surface, new_size)
 
 
+def get_scaled_sprite(sprite: pg.Surface, scale: float) -> pg.Surface:
+    if scale == 1.0:
+        return sprite
+
+    def build():
+        w, h = sprite.get_size()
+        return pg.transform.smoothscale(sprite, (max(1, round(w * scale)), max(1, round(h * scale))))
+    return SURFACES.derive(sprite, build, scale=scale)
+
+
+def _tint_surface(sprite: pg.Surface, strength: float) -> pg.Surface:
+    # blend the opaque pixels toward the tint color, leaving alpha alone
+    r, g, b, a = HURT_TINT
+    f = a * strength / 255
+    keep = round(255 * (1 - f))
+    tinted = sprite.copy()
+    tinted.fill((keep, keep, keep), special_flags=pg.BLEND_RGB_MULT)
+    tinted.fill((round(r * f), round(g * f), round(b * f)), special_flags=pg.BLEND_RGB_ADD)
+    return tinted
+
+
+def hurt_step(hurt_timer: float) -> int:
+    """The tint step (0 = none) for a plant hurt `hurt_timer` seconds ago."""
+    if hurt_timer <= 0:
+        return 0
+    return max(1, min(HURT_TINT_STEPS, math.ceil(hurt_timer / HURT_TIME * HURT_TINT_STEPS)))
+
+
+def get_hurt_sprite(sprite: pg.Surface, step: int) -> pg.Surface:
+    if step <= 0:
+        return sprite
+    return SURFACES.derive(sprite, lambda: _tint_surface(sprite, step / HURT_TINT_STEPS), tint=step)
+
+
+def get_hp_bar(width: int, filled: int, color=HP_BAR_FILL, height: int = 6, radius: int = 3) -> pg.Surface:
+    """A health bar `filled` of `width` pixels full; the ratio is quantized to whole pixels."""
+    def build():
+        bar = pg.Surface((max(1, width), max(1, height)), pg.SRCALPHA)
+        rect = bar.get_rect()
+        pg.draw.rect(bar, HP_BAR_BACK, rect, border_radius=radius)
+        if filled > 0:
+            rect.width = filled
+            pg.draw.rect(bar, color, rect, border_radius=radius)
+        return bar
+    return SURFACES.get("hp_bar", build, variant=(width, height, filled, radius), tint=color)
+
+
+def get_plant_body(size, step: int) -> pg.Surface:
+    """The plain fallback body: a rounded rect of `size` in BODY_COLORS[step]."""
+    def build():
+        body = pg.Surface(size, pg.SRCALPHA)
+        pg.draw.rect(body, BODY_COLORS[step], body.get_rect(), border_radius=10)
+        return body
+    return SURFACES.get("plant_body", build, variant=tuple(size), tint=step)
+
+
+def get_fallback_art(plant) -> pg.Surface:
+    """The plant's vector fallback art on a transparent tile, for renderers that cannot draw it in place."""
+    def build():
+        art = pg.Surface(plant.cell.size, pg.SRCALPHA)
+        plant.draw_fallback(art, art.get_rect())
+        return art
+    return SURFACES.get(type(plant).__name__, build, variant=("fallback", plant.cell.size))
+
+
+def _convert_alpha(image: pg.Surface) -> pg.Surface:
+    # The texture renderer opens its own window without a display surface, and
+    # convert_alpha() needs one; the raw 32-bit PNG surface works fine there.
+    if pg.display.get_surface() is None:
+        return image
+    return image.convert_alpha()
+
+
 def _load_surface(path, scale=(0.92, 0.95)):
     try:
-        image = pg.image.load(path.as_posix()).convert_alpha()
+        image = _convert_alpha(pg.image.load(path.as_posix()))
     except Exception:
         return None
     return _scale_surface_to_tile(image, scale)
@@ -59,19 +144,12 @@ class PlantArtRegistry:
         "sunflower": {"folder": "04 Sunflower", "file": "sunflower"},
         "wallnut": {"folder": "05 Wallnut", "file": "wallnut", "scale": (0.85, 0.95)},
     }
-    _cache: dict[str, PlantArt] = {}
 
     @classmethod
     def get(cls, key: str | None) -> PlantArt:
         if not key:
             return PlantArt()
         key = key.lower()
-        if key not in cls._cache:
-            cls._cache[key] = cls._load_art(key)
-        return cls._cache[key]
-
-    @classmethod
-    def _load_art(cls, key: str) -> PlantArt:
         spec = cls.SPECS.get(key)
         if not spec:
             return PlantArt()
@@ -79,35 +157,29 @@ class PlantArtRegistry:
         scale = spec.get("scale", (0.92, 0.95))
 
         def load_variant(tag: str):
-            filename = f"{spec['file']} ({tag}).png"
-            return _load_surface(base_dir / filename, scale=scale)
+            path = base_dir / f"{spec['file']} ({tag}).png"
+            return SURFACES.get(key, lambda: _load_surface(path, scale=scale), variant=tag, pin=True)
 
-        normal = load_variant("normal")
-        zombie = load_variant("zombified")
-        return PlantArt(normal=normal, zombie=zombie)
+        return PlantArt(normal=load_variant("normal"), zombie=load_variant("zombified"))
 
 
 def get_peashooter_surface():
-    global _PEASHOOTER_SURF
-    if _PEASHOOTER_SURF is None:
+    def load():
         path = ASSETS_DIR / "plants" / "peashooter.png"
         try:
-            img = pg.image.load(path.as_posix()).convert_alpha()
-            target_w = int(TILE_W * 0.85)
-            target_h = int(TILE_H * 0.85)
-            _PEASHOOTER_SURF = pg.transform.smoothscale(img, (target_w, target_h))
+            img = _convert_alpha(pg.image.load(path.as_posix()))
+            return pg.transform.smoothscale(img, (int(TILE_W * 0.85), int(TILE_H * 0.85)))
         except Exception:
-            _PEASHOOTER_SURF = None
-    return _PEASHOOTER_SURF
+            return None
+    return SURFACES.get("peashooter", load, variant="standalone", pin=True)
 
 
 def get_peashooter_frames():
-    global _PEASHOOTER_FRAMES
-    if _PEASHOOTER_FRAMES is None:
+    def load():
         path = ASSETS_DIR / "plants" / "peashooter - spritesheet - shooting animation - 25 sprites.png"
         frames = []
         try:
-            sheet = pg.image.load(path.as_posix()).convert_alpha()
+            sheet = _convert_alpha(pg.image.load(path.as_posix()))
             cols = rows = 5
             frame_w = sheet.get_width() // cols
             frame_h = sheet.get_height() // rows
@@ -121,8 +193,8 @@ def get_peashooter_frames():
                     frames.append(pg.transform.smoothscale(frame, (target_w, target_h)))
         except Exception:
             frames = []
-        _PEASHOOTER_FRAMES = frames
-    return _PEASHOOTER_FRAMES
+        return tuple(frames)
+    return SURFACES.get("peashooter", load, variant="shooting", pin=True)
 
 
 def _build_vector_surface(draw_fn, scale=(0.9, 0.92)):
@@ -133,95 +205,99 @@ def _build_vector_surface(draw_fn, scale=(0.9, 0.92)):
 
 
 def get_repeater_surface():
-    global _REPEATER_SURF
-    if _REPEATER_SURF is None:
-        def draw(canvas, r):
-            base = r.inflate(-18, -18)
-            stem = pg.Rect(0, 0, 16, base.height - 14)
-            stem.midbottom = (base.centerx - 14, base.bottom)
-            pg.draw.rect(canvas, (42, 150, 80), stem, border_radius=6)
-            leaf1 = pg.Rect(0, 0, 30, 18); leaf1.midleft = (stem.centerx - 6, stem.centery + 8)
-            leaf2 = pg.Rect(0, 0, 30, 18); leaf2.midright = (stem.centerx + 12, stem.centery - 6)
-            pg.draw.ellipse(canvas, (68, 200, 90), leaf1)
-            pg.draw.ellipse(canvas, (68, 200, 90), leaf2)
-            body = pg.Rect(0, 0, 48, 38)
-            body.center = (base.centerx + 4, base.centery)
-            pg.draw.ellipse(canvas, (70, 200, 120), body)
-            pg.draw.ellipse(canvas, (120, 235, 150), body.inflate(-14, -12))
-            head_front = pg.Rect(0, 0, 38, 32)
-            head_front.midleft = (body.right - 4, body.centery - 8)
-            pg.draw.ellipse(canvas, (90, 240, 150), head_front)
-            pg.draw.ellipse(canvas, (200, 255, 220), head_front.inflate(-18, -16))
-            head_back = head_front.copy()
-            head_back.centery += 12
-            head_back.centerx -= 6
-            pg.draw.ellipse(canvas, (86, 225, 140), head_back)
-            pg.draw.ellipse(canvas, (200, 250, 220), head_back.inflate(-18, -16))
-            nozzle = pg.Rect(0, 0, 16, 12)
-            nozzle.midleft = (head_front.right - 8, head_front.centery)
-            pg.draw.ellipse(canvas, (230, 255, 230), nozzle)
-        _REPEATER_SURF = _build_vector_surface(draw, (0.96, 0.94))
-    return _REPEATER_SURF
+    def draw(canvas, r):
+        base = r.inflate(-18, -18)
+        stem = pg.Rect(0, 0, 16, base.height - 14)
+        stem.midbottom = (base.centerx - 14, base.bottom)
+        pg.draw.rect(canvas, (42, 150, 80), stem, border_radius=6)
+        leaf1 = pg.Rect(0, 0, 30, 18); leaf1.midleft = (stem.centerx - 6, stem.centery + 8)
+        leaf2 = pg.Rect(0, 0, 30, 18); leaf2.midright = (stem.centerx + 12, stem.centery - 6)
+        pg.draw.ellipse(canvas, (68, 200, 90), leaf1)
+        pg.draw.ellipse(canvas, (68, 200, 90), leaf2)
+        body = pg.Rect(0, 0, 48, 38)
+        body.center = (base.centerx + 4, base.centery)
+        pg.draw.ellipse(canvas, (70, 200, 120), body)
+        pg.draw.ellipse(canvas, (120, 235, 150), body.inflate(-14, -12))
+        head_front = pg.Rect(0, 0, 38, 32)
+        head_front.midleft = (body.right - 4, body.centery - 8)
+        pg.draw.ellipse(canvas, (90, 240, 150), head_front)
+        pg.draw.ellipse(canvas, (200, 255, 220), head_front.inflate(-18, -16))
+        head_back = head_front.copy()
+        head_back.centery += 12
+        head_back.centerx -= 6
+        pg.draw.ellipse(canvas, (86, 225, 140), head_back)
+        pg.draw.ellipse(canvas, (200, 250, 220), head_back.inflate(-18, -16))
+        nozzle = pg.Rect(0, 0, 16, 12)
+        nozzle.midleft = (head_front.right - 8, head_front.centery)
+        pg.draw.ellipse(canvas, (230, 255, 230), nozzle)
+    return SURFACES.get("repeater", lambda: _build_vector_surface(draw, (0.96, 0.94)), variant="vector", pin=True)
 
 
 def get_snowpea_surface():
-    global _SNOWPEA_SURF
-    if _SNOWPEA_SURF is None:
-        def draw(canvas, r):
-            base = r.inflate(-18, -18)
-            stem = pg.Rect(0, 0, 16, base.height - 14)
-            stem.midbottom = (base.centerx - 12, base.bottom)
-            pg.draw.rect(canvas, (40, 150, 190), stem, border_radius=6)
-            leaf1 = pg.Rect(0, 0, 30, 18); leaf1.midleft = (stem.centerx - 6, stem.centery + 8)
-            leaf2 = pg.Rect(0, 0, 30, 18); leaf2.midright = (stem.centerx + 12, stem.centery - 6)
-            pg.draw.ellipse(canvas, (60, 190, 220), leaf1)
-            pg.draw.ellipse(canvas, (60, 190, 220), leaf2)
-            body = pg.Rect(0, 0, 46, 36)
-            body.center = (base.centerx + 6, base.centery - 6)
-            pg.draw.ellipse(canvas, (110, 210, 240), body)
-            pg.draw.ellipse(canvas, (180, 240, 255), body.inflate(-12, -12))
-            head = pg.Rect(0, 0, 40, 34)
-            head.midleft = (body.right - 4, body.centery)
-            pg.draw.ellipse(canvas, (150, 240, 255), head)
-            pg.draw.ellipse(canvas, (230, 255, 255), head.inflate(-16, -16))
-            nose = pg.Rect(0, 0, 18, 16)
-            nose.midleft = (head.right - 6, head.centery - 2)
-            pg.draw.ellipse(canvas, (210, 255, 255), nose)
-        _SNOWPEA_SURF = _build_vector_surface(draw, (0.96, 0.94))
-    return _SNOWPEA_SURF
+    def draw(canvas, r):
+        base = r.inflate(-18, -18)
+        stem = pg.Rect(0, 0, 16, base.height - 14)
+        stem.midbottom = (base.centerx - 12, base.bottom)
+        pg.draw.rect(canvas, (40, 150, 190), stem, border_radius=6)
+        leaf1 = pg.Rect(0, 0, 30, 18); leaf1.midleft = (stem.centerx - 6, stem.centery + 8)
+        leaf2 = pg.Rect(0, 0, 30, 18); leaf2.midright = (stem.centerx + 12, stem.centery - 6)
+        pg.draw.ellipse(canvas, (60, 190, 220), leaf1)
+        pg.draw.ellipse(canvas, (60, 190, 220), leaf2)
+        body = pg.Rect(0, 0, 46, 36)
+        body.center = (base.centerx + 6, base.centery - 6)
+        pg.draw.ellipse(canvas, (110, 210, 240), body)
+        pg.draw.ellipse(canvas, (180, 240, 255), body.inflate(-12, -12))
+        head = pg.Rect(0, 0, 40, 34)
+        head.midleft = (body.right - 4, body.centery)
+        pg.draw.ellipse(canvas, (150, 240, 255), head)
+        pg.draw.ellipse(canvas, (230, 255, 255), head.inflate(-16, -16))
+        nose = pg.Rect(0, 0, 18, 16)
+        nose.midleft = (head.right - 6, head.centery - 2)
+        pg.draw.ellipse(canvas, (210, 255, 255), nose)
+    return SURFACES.get("snowpea", lambda: _build_vector_surface(draw, (0.96, 0.94)), variant="vector", pin=True)
 
 
 def get_wallnut_surface():
-    global _WALLNUT_SURF
-    if _WALLNUT_SURF is None:
-        def draw(canvas, r):
-            body = r.inflate(-24, -12)
-            pg.draw.ellipse(canvas, (160, 110, 70), body)
-            pg.draw.ellipse(canvas, (195, 150, 95), body.inflate(-18, -18))
-            crack = pg.Rect(0, 0, 6, body.height - 18)
-            crack.midtop = (body.centerx + 8, body.top + 12)
-            pg.draw.rect(canvas, (150, 100, 60), crack, border_radius=3)
-            eye1 = pg.Rect(0, 0, 8, 8); eye1.center = (body.centerx - 14, body.centery - 8)
-            eye2 = pg.Rect(0, 0, 8, 8); eye2.center = (body.centerx + 10, body.centery - 6)
-            pg.draw.ellipse(canvas, (10, 10, 10), eye1)
-            pg.draw.ellipse(canvas, (10, 10, 10), eye2)
-        _WALLNUT_SURF = _build_vector_surface(draw, (0.85, 0.96))
-    return _WALLNUT_SURF
+    def draw(canvas, r):
+        body = r.inflate(-24, -12)
+        pg.draw.ellipse(canvas, (160, 110, 70), body)
+        pg.draw.ellipse(canvas, (195, 150, 95), body.inflate(-18, -18))
+        crack = pg.Rect(0, 0, 6, body.height - 18)
+        crack.midtop = (body.centerx + 8, body.top + 12)
+        pg.draw.rect(canvas, (150, 100, 60), crack, border_radius=3)
+        eye1 = pg.Rect(0, 0, 8, 8); eye1.center = (body.centerx - 14, body.centery - 8)
+        eye2 = pg.Rect(0, 0, 8, 8); eye2.center = (body.centerx + 10, body.centery - 6)
+        pg.draw.ellipse(canvas, (10, 10, 10), eye1)
+        pg.draw.ellipse(canvas, (10, 10, 10), eye2)
+    return SURFACES.get("wallnut", lambda: _build_vector_surface(draw, (0.85, 0.96)), variant="vector", pin=True)
 
 
 class Plant(Entity):
     art_key = None
+    snapshot_fields = (
+        "alive", "id", "row", "col", "x", "y", "hp", "max_hp", "hurt_timer", "muzzle_timer",
+        "use_base_body", "sprite", "sprite_normal", "sprite_zombie", "zombified", "_last_sprite_rect",
+        "cell", "body", "hp_bar", "_sprite_rect",
+    )
+    # (outer radius, outer color, inner radius, inner color) of the muzzle flash
+    muzzle_style = (6, (250, 255, 200), 3, (255, 240, 120))
 
     def __init__(self, row: int, col: int):
         super().__init__()
         self.row = row
         self.col = col
-        r = grid_rect(row, col)
+        # plants never move, so their rects are computed once: the shared tile
+        # rect, the body zombies collide with, and scratch rects for drawing
+        self.cell = r = CELL_RECTS[row][col]
+        self.body = r.inflate(-16, -16)
+        self.hp_bar = pg.Rect(self.body.left, self.body.top - 8, self.body.width, 6)
+        self._sprite_rect = pg.Rect(0, 0, 0, 0)
         self.x = r.centerx
         self.y = r.centery
         self.max_hp = PLANT_MAX_HP
         self.hp = float(self.max_hp)
         self.hurt_timer = 0.0
+        self.muzzle_timer = 0.0
         self.use_base_body = True
         self.sprite = None
         self._last_sprite_rect = None
@@ -231,7 +307,7 @@ class Plant(Entity):
 
     def take_damage(self, d):
         self.hp = max(0.0, self.hp - d)
-        self.hurt_timer = 0.25
+        self.hurt_timer = HURT_TIME
         if self.hp <= 0:
             self.alive = False
 
@@ -243,34 +319,40 @@ class Plant(Entity):
             self.hurt_timer = max(0.0, self.hurt_timer - dt)
 
     def draw(self, surf):
-        r = grid_rect(self.row, self.col)
-        inner = r.inflate(-16, -16)
+        inner = self.body
         if self.use_base_body:
-            pg.draw.rect(surf, (40, 180, 60), inner, border_radius=10)
+            pg.draw.rect(surf, BODY_COLORS[hurt_step(self.hurt_timer)], inner, border_radius=10)
         hp_ratio = clamp(self.hp / self.max_hp, 0, 1)
-        hb_bg = pg.Rect(inner.left, inner.top - 8, inner.width, 6)
-        hb_fg = pg.Rect(inner.left, inner.top - 8, int(inner.width * hp_ratio), 6)
-        pg.draw.rect(surf, (50, 50, 50), hb_bg, border_radius=3)
-        pg.draw.rect(surf, (60, 220, 90), hb_fg, border_radius=3)
-        if self.hurt_timer > 0:
-            strength = clamp(self.hurt_timer / 0.25, 0, 1)
-            if self.use_base_body:
-                overlay = pg.Surface((inner.width, inner.height), pg.SRCALPHA)
-                overlay.fill((255, 80, 80, int(120 * strength)))
-                surf.blit(overlay, inner.topleft)
-            elif self._last_sprite_rect is not None:
-                overlay = pg.Surface(self._last_sprite_rect.size, pg.SRCALPHA)
-                overlay.fill((255, 120, 120, int(100 * strength)))
-                surf.blit(overlay, self._last_sprite_rect.topleft)
+        surf.blit(get_hp_bar(inner.width, int(inner.width * hp_ratio)), self.hp_bar)
+
+    def sprite_pose(self):
+        """Return the sprite to draw this frame and its offset from the tile's midbottom."""
+        return None, (0, 0)
+
+    def draw_fallback(self, surf, r):
+        """Vector art in tile rect `r`, drawn when the plant has no sprite."""
+
+    def muzzle_points(self):
+        return ()
+
+    def draw_muzzle(self, surf):
+        if self.muzzle_timer <= 0:
+            return
+        outer_r, outer_col, inner_r, inner_col = self.muzzle_style
+        for pos in self.muzzle_points():
+            pg.draw.circle(surf, outer_col, pos, outer_r)
+            pg.draw.circle(surf, inner_col, pos, inner_r)
 
     def blit_sprite(self, surf, sprite, offset=(0, 0)):
         if sprite is None:
             return False
-        r = grid_rect(self.row, self.col)
-        rect = sprite.get_rect()
+        r = self.cell
+        rect = self._sprite_rect
+        rect.width = sprite.get_width()
+        rect.height = sprite.get_height()
         rect.midbottom = (r.centerx + offset[0], r.bottom + offset[1])
-        surf.blit(sprite, rect)
-        self._last_sprite_rect = rect.copy()
+        surf.blit(get_hurt_sprite(sprite, hurt_step(self.hurt_timer)), rect)
+        self._last_sprite_rect = rect
         return True
 
     @classmethod
@@ -292,6 +374,11 @@ class Plant(Entity):
             self.sprite = fallback
         if art.zombie is not None:
             self.sprite_zombie = art.zombie
+        # tint the art up front so the first hit does not stall a frame
+        for sprite in (self.sprite_normal, self.sprite_zombie):
+            if sprite is not None:
+                for step in range(1, HURT_TINT_STEPS + 1):
+                    get_hurt_sprite(sprite, step)
         return art
 
     def get_render_sprite(self):
@@ -307,6 +394,7 @@ class Plant(Entity):
 
 class Peashooter(Plant):
     art_key = "peashooter"
+    snapshot_fields = Plant.snapshot_fields + ("recoil_timer", "anim_frames", "anim_index", "anim_playing")
 
     def __init__(self, row, col):
         super().__init__(row, col)
@@ -374,11 +462,8 @@ class Peashooter(Plant):
                 self.anim_playing = False
                 break
 
-    def draw(self, surf):
-        r = grid_rect(self.row, self.col)
+    def sprite_pose(self):
         sway = -6 * clamp(self.recoil_timer / 0.14, 0, 1)
-        self._last_sprite_rect = None
-        sprite = None
         if self.zombified and self.sprite_zombie:
             sprite = self.sprite_zombie
         elif self.sprite_normal is not None:
@@ -388,21 +473,30 @@ class Peashooter(Plant):
             sprite = self.anim_frames[min(idx, len(self.anim_frames) - 1)]
         else:
             sprite = self.sprite
-        if not self.blit_sprite(surf, sprite, (4 + int(sway), -6)):
-            # fallback to vector art if sprite missing
-            base = r.inflate(-18, -18)
-            stem = pg.Rect(0, 0, 12, base.height - 18)
-            stem.midbottom = (base.centerx - 8, base.bottom)
-            pg.draw.rect(surf, (40, 160, 70), stem, border_radius=6)
-            leaf1 = pg.Rect(0, 0, 26, 16); leaf1.midleft = (stem.centerx - 4, stem.centery + 6)
-            leaf2 = pg.Rect(0, 0, 26, 16); leaf2.midright = (stem.centerx + 10, stem.centery - 8)
-            pg.draw.ellipse(surf, (60, 200, 90), leaf1)
-            pg.draw.ellipse(surf, (60, 200, 90), leaf2)
+        return sprite, (4 + int(sway), -6)
+
+    def muzzle_points(self):
+        r = self.cell
+        return ((r.centerx + 30, r.centery - 8),)
+
+    def draw_fallback(self, surf, r):
+        base = r.inflate(-18, -18)
+        stem = pg.Rect(0, 0, 12, base.height - 18)
+        stem.midbottom = (base.centerx - 8, base.bottom)
+        pg.draw.rect(surf, (40, 160, 70), stem, border_radius=6)
+        leaf1 = pg.Rect(0, 0, 26, 16); leaf1.midleft = (stem.centerx - 4, stem.centery + 6)
+        leaf2 = pg.Rect(0, 0, 26, 16); leaf2.midright = (stem.centerx + 10, stem.centery - 8)
+        pg.draw.ellipse(surf, (60, 200, 90), leaf1)
+        pg.draw.ellipse(surf, (60, 200, 90), leaf2)
+
+    def draw(self, surf):
+        r = self.cell
+        self._last_sprite_rect = None
+        sprite, offset = self.sprite_pose()
+        if not self.blit_sprite(surf, sprite, offset):
+            self.draw_fallback(surf, r)
         # muzzle flash overlay stays the same
-        if self.muzzle_timer > 0:
-            muzzle_pos = (r.centerx + 30, r.centery - 8)
-            pg.draw.circle(surf, (250, 255, 200), muzzle_pos, 6)
-            pg.draw.circle(surf, (255, 240, 120), muzzle_pos, 3)
+        self.draw_muzzle(surf)
         super().draw(surf)
 
     @classmethod
@@ -418,6 +512,8 @@ class Peashooter(Plant):
 
 class Repeater(Plant):
     art_key = "repeater"
+    snapshot_fields = Plant.snapshot_fields + ("recoil_timer",)
+    muzzle_style = (5, (250, 255, 200), 3, (255, 240, 120))
 
     def __init__(self, row, col):
         super().__init__(row, col)
@@ -461,26 +557,31 @@ class Repeater(Plant):
         if game.snd:
             game.snd.play_shoot()
 
-    def draw(self, surf):
-        r = grid_rect(self.row, self.col)
+    def sprite_pose(self):
         rx = -5 * clamp(self.recoil_timer / 0.12, 0, 1)
+        return self.get_render_sprite(), (int(rx), -6)
+
+    def muzzle_points(self):
+        r = self.cell
+        return ((r.centerx + 24, r.centery - 10), (r.centerx + 34, r.centery))
+
+    def draw_fallback(self, surf, r):
+        base = r.inflate(-18, -18)
+        stem = pg.Rect(0, 0, 12, base.height - 18)
+        stem.midbottom = (base.centerx - 8, base.bottom)
+        pg.draw.rect(surf, (40, 160, 70), stem, border_radius=6)
+        leaf1 = pg.Rect(0, 0, 26, 16); leaf1.midleft = (stem.centerx - 4, stem.centery + 6)
+        leaf2 = pg.Rect(0, 0, 26, 16); leaf2.midright = (stem.centerx + 10, stem.centery - 8)
+        pg.draw.ellipse(surf, (60, 200, 90), leaf1)
+        pg.draw.ellipse(surf, (60, 200, 90), leaf2)
+
+    def draw(self, surf):
+        r = self.cell
         self._last_sprite_rect = None
-        sprite = self.get_render_sprite()
-        if not self.blit_sprite(surf, sprite, (int(rx), -6)):
-            base = r.inflate(-18, -18)
-            stem = pg.Rect(0, 0, 12, base.height - 18)
-            stem.midbottom = (base.centerx - 8, base.bottom)
-            pg.draw.rect(surf, (40, 160, 70), stem, border_radius=6)
-            leaf1 = pg.Rect(0, 0, 26, 16); leaf1.midleft = (stem.centerx - 4, stem.centery + 6)
-            leaf2 = pg.Rect(0, 0, 26, 16); leaf2.midright = (stem.centerx + 10, stem.centery - 8)
-            pg.draw.ellipse(surf, (60, 200, 90), leaf1)
-            pg.draw.ellipse(surf, (60, 200, 90), leaf2)
-        if self.muzzle_timer > 0:
-            muzzle1 = (r.centerx + 24, r.centery - 10)
-            muzzle2 = (r.centerx + 34, r.centery)
-            for pos in (muzzle1, muzzle2):
-                pg.draw.circle(surf, (250, 255, 200), pos, 5)
-                pg.draw.circle(surf, (255, 240, 120), pos, 3)
+        sprite, offset = self.sprite_pose()
+        if not self.blit_sprite(surf, sprite, offset):
+            self.draw_fallback(surf, r)
+        self.draw_muzzle(surf)
         super().draw(surf)
 
     @classmethod
@@ -493,6 +594,8 @@ class Repeater(Plant):
 
 class SnowPea(Plant):
     art_key = "snowpea"
+    snapshot_fields = Plant.snapshot_fields + ("recoil_timer",)
+    muzzle_style = (6, (230, 245, 255), 3, (180, 230, 255))
 
     def __init__(self, row, col):
         super().__init__(row, col)
@@ -526,24 +629,31 @@ class SnowPea(Plant):
         if game.snd:
             game.snd.play_shoot()
 
-    def draw(self, surf):
-        r = grid_rect(self.row, self.col)
+    def sprite_pose(self):
         rx = -6 * clamp(self.recoil_timer / 0.14, 0, 1)
+        return self.get_render_sprite(), (int(rx), -6)
+
+    def muzzle_points(self):
+        r = self.cell
+        return ((r.centerx + 28, r.centery - 6),)
+
+    def draw_fallback(self, surf, r):
+        base = r.inflate(-18, -18)
+        stem = pg.Rect(0, 0, 12, base.height - 18)
+        stem.midbottom = (base.centerx - 8, base.bottom)
+        pg.draw.rect(surf, (40, 140, 160), stem, border_radius=6)
+        leaf1 = pg.Rect(0, 0, 26, 16); leaf1.midleft = (stem.centerx - 4, stem.centery + 6)
+        leaf2 = pg.Rect(0, 0, 26, 16); leaf2.midright = (stem.centerx + 10, stem.centery - 8)
+        pg.draw.ellipse(surf, (60, 170, 200), leaf1)
+        pg.draw.ellipse(surf, (60, 170, 200), leaf2)
+
+    def draw(self, surf):
+        r = self.cell
         self._last_sprite_rect = None
-        sprite = self.get_render_sprite()
-        if not self.blit_sprite(surf, sprite, (int(rx), -6)):
-            base = r.inflate(-18, -18)
-            stem = pg.Rect(0, 0, 12, base.height - 18)
-            stem.midbottom = (base.centerx - 8, base.bottom)
-            pg.draw.rect(surf, (40, 140, 160), stem, border_radius=6)
-            leaf1 = pg.Rect(0, 0, 26, 16); leaf1.midleft = (stem.centerx - 4, stem.centery + 6)
-            leaf2 = pg.Rect(0, 0, 26, 16); leaf2.midright = (stem.centerx + 10, stem.centery - 8)
-            pg.draw.ellipse(surf, (60, 170, 200), leaf1)
-            pg.draw.ellipse(surf, (60, 170, 200), leaf2)
-        if self.muzzle_timer > 0:
-            muzzle_pos = (r.centerx + 28, r.centery - 6)
-            pg.draw.circle(surf, (230, 245, 255), muzzle_pos, 6)
-            pg.draw.circle(surf, (180, 230, 255), muzzle_pos, 3)
+        sprite, offset = self.sprite_pose()
+        if not self.blit_sprite(surf, sprite, offset):
+            self.draw_fallback(surf, r)
+        self.draw_muzzle(surf)
         super().draw(surf)
 
     @classmethod
@@ -565,18 +675,24 @@ class Wallnut(Plant):
         self.use_base_body = False
         self.apply_art_from_registry(fallback=self.sprite)
 
+    def sprite_pose(self):
+        return self.get_render_sprite(), (0, -4)
+
+    def draw_fallback(self, surf, r):
+        body = r.inflate(-20, -20)
+        pg.draw.ellipse(surf, (160, 110, 70), body)
+        pg.draw.ellipse(surf, (190, 140, 100), body.inflate(-18, -18))
+        eye1 = pg.Rect(0, 0, 6, 6); eye1.center = (body.centerx - 12, body.centery - 6)
+        eye2 = pg.Rect(0, 0, 6, 6); eye2.center = (body.centerx + 8, body.centery - 4)
+        pg.draw.ellipse(surf, (10, 10, 10), eye1)
+        pg.draw.ellipse(surf, (10, 10, 10), eye2)
+
     def draw(self, surf):
-        r = grid_rect(self.row, self.col)
+        r = self.cell
         self._last_sprite_rect = None
-        sprite = self.get_render_sprite()
-        if not self.blit_sprite(surf, sprite, (0, -4)):
-            body = r.inflate(-20, -20)
-            pg.draw.ellipse(surf, (160, 110, 70), body)
-            pg.draw.ellipse(surf, (190, 140, 100), body.inflate(-18, -18))
-            eye1 = pg.Rect(0, 0, 6, 6); eye1.center = (body.centerx - 12, body.centery - 6)
-            eye2 = pg.Rect(0, 0, 6, 6); eye2.center = (body.centerx + 8, body.centery - 4)
-            pg.draw.ellipse(surf, (10, 10, 10), eye1)
-            pg.draw.ellipse(surf, (10, 10, 10), eye2)
+        sprite, offset = self.sprite_pose()
+        if not self.blit_sprite(surf, sprite, offset):
+            self.draw_fallback(surf, r)
         super().draw(surf)
 
     @classmethod
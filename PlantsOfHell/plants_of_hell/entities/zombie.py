@@ -1,18 +1,19 @@
 import math
 import random
 import pygame as pg
-from ..config import ZOMBIE_SPEED, ZOMBIE_HP, ZOMBIE_EAT_DPS, grid_rect, clamp, RED, ZOMBIE_COL, GRID_LEFT, COLS
+from ..config import ZOMBIE_SPEED, ZOMBIE_HP, ZOMBIE_EAT_DPS, CELL_RECTS, clamp, RED, ZOMBIE_COL, GRID_LEFT, COLS
 from .base import Entity
 
 
 class ZombieBase(Entity):
     width = 52
     height = 76
+    snapshot_fields = ("alive", "id", "row", "x", "y", "hp", "color", "eating", "anim_phase")
 
     def __init__(self, row: int, *, hp_mult: float = 1.0, speed_mult: float = 1.0, color=None):
         super().__init__()
         self.row = row
-        r = grid_rect(row, COLS - 1)
+        r = CELL_RECTS[row][COLS - 1]
         self.x = r.right + 50
         self.y = r.centery
         self.speed_base = ZOMBIE_SPEED * speed_mult * random.uniform(0.95, 1.05)
@@ -25,8 +26,16 @@ class ZombieBase(Entity):
         self.anim_phase = random.random() * math.tau
         self.bite_timer = random.uniform(0.3, 0.5)
 
+    _rect = None
+
     def rect(self) -> pg.Rect:
-        return pg.Rect(int(self.x - self.width // 2), int(self.y - self.height // 2), self.width, self.height)
+        """The zombie's bounds, updated in place; the same Rect is returned every call."""
+        r = self._rect
+        if r is None:  # first call, or a snapshot copy that must not share the live rect
+            r = self._rect = pg.Rect(0, 0, self.width, self.height)
+        r.x = int(self.x - self.width // 2)
+        r.y = int(self.y - self.height // 2)
+        return r
 
     def apply_slow(self, mult: float, time: float):
         # Keep strongest slow and longest time
@@ -65,33 +74,40 @@ class ZombieBase(Entity):
 
         zr = self.rect()
         for p in game.plants:
-            if getattr(p, 'row', None) != self.row or not p.alive:
+            if p.row != self.row or not p.alive:
                 continue
-            pr = grid_rect(p.row, p.col).inflate(-16, -16)
-            if zr.colliderect(pr):
+            if zr.colliderect(p.body):
                 self.eating = True
                 self.target_plant = p
                 break
 
-    def draw(self, surf):
-        r = self.rect()
+    def pose_offsets(self):
         sway = math.sin(self.anim_phase * (1.4 if self.eating else 1.0)) * (4 if self.eating else 2)
         bob = math.sin(self.anim_phase * 2.2) * (2 if self.eating else 1)
+        return int(sway * 0.3), int(bob), int(sway), int(bob * 0.5)
+
+    @staticmethod
+    def draw_figure(surf, r, color, eating, offsets):
+        body_dx, body_dy, head_dx, head_dy = offsets
         body = r.copy()
-        body.y += 4 + int(bob)
-        body.x += int(sway * 0.3)
-        pg.draw.rect(surf, self.color, body, border_radius=6)
+        body.y += 4 + body_dy
+        body.x += body_dx
+        pg.draw.rect(surf, color, body, border_radius=6)
         head = pg.Rect(0, 0, body.width - 10, 28)
         head.midbottom = (body.centerx, body.top + 18)
-        head.x += int(sway)
-        head.y += int(bob * 0.5)
+        head.x += head_dx
+        head.y += head_dy
         pg.draw.rect(surf, (140, 160, 160), head, border_radius=6)
         pg.draw.circle(surf, (10, 10, 10), (head.left + 14, head.centery), 3)
         pg.draw.circle(surf, (10, 10, 10), (head.left + 28, head.centery + 2), 3)
-        if self.eating:
+        if eating:
             mouth = pg.Rect(0, 0, head.width - 14, 8)
             mouth.midtop = (head.centerx, head.bottom - 6)
             pg.draw.rect(surf, (160, 60, 60), mouth, border_radius=4)
+
+    def draw(self, surf):
+        r = self.rect()
+        self.draw_figure(surf, r, self.color, self.eating, self.pose_offsets())
         hp_ratio = clamp(self.hp / ZOMBIE_HP, 0, 1)
         hb_bg = pg.Rect(r.left, r.top - 10, r.width, 6)
         hb_fg = pg.Rect(r.left, r.top - 10, int(r.width * hp_ratio), 6)
@@ -1,11 +1,14 @@
 import random
 import sys
+import time
+from contextlib import nullcontext
 import pygame as pg
 
 from .config import (
     WIDTH,
     HEIGHT,
     FPS,
+    IDLE_WAIT_MS,
     BG,
     BORDER,
     GRID_TOP,
@@ -15,29 +18,57 @@ from .config import (
     TILE_H,
     BAR_H,
     ZOMBIE_SPAWN_EVERY,
+    PARTICLE_BUDGET,
+    PARTICLE_COALESCE_PX,
+    REWIND_EVERY_TICKS,
+    REWIND_SLOTS,
+    REWIND_STEP,
+    SAVE_DIR,
+    PROFILE_FRAMES,
+    PROFILE_DIR,
+    SURFACE_CACHE_MB,
+    SPEED_MODES,
+    SPEED_MAX_DRAW_EVERY,
+    SPEED_MAX_LAG_FRAMES,
     WHITE,
     grid_rect,
+    speed_label,
 )
 from .ui.board import Tile
 from .ui.cards import PlantCard
-from .ui.widgets import Button
+from .ui.widgets import Button, LazyPanel
+from .render.surface_cache import SURFACES, get_text
 from .entities.plants import Peashooter, Repeater, SnowPea, Wallnut
 from .entities.bullet import Bullet
-from .entities.zombie import BasicZombie, FastZombie, TankZombie
-from .effects.particles import Particle
+from .effects.particles import ParticlePool, PRIORITY_SMOKE, PRIORITY_BITE, PRIORITY_SPARK, PRIORITY_FLASH
 from .audio.sound import SoundBank
-from .config import clamp
+from .config import clamp, snap_render_scale
 from .config import PEA_SPEED
-from .ui.settings import SettingsPanel
-from .ui.plant_settings import PlantInspector
+from .sim.lanes import step_lanes, SPAWN_TYPES, SPAWN_WEIGHTS
+from .sim import savestate
+from .perf.profiler import FrameProfiler
+from .perf.metrics import TickCounters
+from .perf.pacing import FramePacer, LatencyStats
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, renderer: str = "surface", render_driver: str | None = None, render_scale: float = 1.0,
+                 threaded: bool = False, export_shm: str | None = None, spectate=None,
+                 profile_dir=PROFILE_DIR, profile_frames: int = PROFILE_FRAMES, profile_sampling: bool = False,
+                 metrics_path=None, low_latency: bool = False, latency_stats: bool = False,
+                 numpy_kernel: bool = False):
         pg.init()
         pg.display.set_caption("Plants of Hell")
-        self.screen = pg.display.set_mode((WIDTH, HEIGHT))
+        self.renderer = None
+        if renderer == "sdl2":
+            from .render.sdl2_backend import TextureRenderer
+            self.renderer = TextureRenderer.create((WIDTH, HEIGHT), "Plants of Hell", driver=render_driver)
+        # the texture renderer owns its window; the surface path draws straight to the display
+        self.screen = pg.display.set_mode((WIDTH, HEIGHT)) if self.renderer is None else None
         self.clock = pg.time.Clock()
+        # low latency: precise frame pacing and input polled just before drawing
+        self.pacer = FramePacer(FPS) if low_latency else None
+        self.latency = LatencyStats(FPS) if low_latency or latency_stats else None
         self.font = pg.font.SysFont("consolas", 22)
         self.big_font = pg.font.SysFont("consolas", 48, bold=True)
 
@@ -51,7 +82,12 @@ class Game:
         self.plants = []
         self.bullets = []
         self.zombies = []
-        self.particles = []
+        # seeded from the game's RNG once, so a seeded run stays reproducible
+        self.particles = ParticlePool(PARTICLE_BUDGET, PARTICLE_COALESCE_PX, seed=random.getrandbits(32))
+        self.lane_kernel = None
+        if numpy_kernel:
+            from .sim.kernel import LaneKernel
+            self.lane_kernel = LaneKernel.create(self)
 
         # speeds/config passed into entities if needed
         self.speeds = {'pea': PEA_SPEED}
@@ -74,16 +110,60 @@ class Game:
         self.spawn_timer = 1.0
         self.game_over = False
         # settings state
-        self.settings = {'particles': True, 'fancy_vfx': True}
+        self.settings = {'particles': True, 'fancy_vfx': True, 'render_scale': snap_render_scale(render_scale),
+                         'pause_unfocused': True, 'speed': 1}
+        # fast-forward: simulated time owed to fixed ticks, and frames since the last draw at max speed
+        self._turbo_time = 0.0
+        self._turbo_frames = 0
+        self.window_focused = True
+        self.window_minimized = False
+        # run the simulation on its own thread and draw from its snapshots
+        self.threaded = threaded
+        self.rewind = savestate.RewindBuffer(REWIND_SLOTS, REWIND_EVERY_TICKS)
+        # F8 profiles the next `profile_frames` frames of update + draw
+        self.profiler = FrameProfiler(profile_dir, sampling=profile_sampling)
+        self.profile_frames = profile_frames
+        # running totals for telemetry; the recorder writes one line per frame
+        self.counters = TickCounters()
+        self.metrics = None
+        if metrics_path:
+            from .perf.metrics import MetricsRecorder
+            self.metrics = MetricsRecorder(metrics_path)
+        # per-tick world state in shared memory for external viewers
+        self.exporter = None
+        if export_shm:
+            from .sim.shared_state import StateExporter
+            self.exporter = StateExporter(export_shm)
+        # (host, port) to stream the board to remote spectators
+        self.spectators = None
+        if spectate:
+            from .net.spectator import SpectatorServer
+            self.spectators = SpectatorServer(*spectate)
+        # an autoplayer (sim/autoplay.py) feeding input events alongside the real ones
+        self.autoplayer = None
+        self.scene_renderer = None
+        # F3 shows surface cache stats; the text is re-rendered twice a second
+        self.show_stats = False
+        self._stats_text = None
+        self._stats_updated = 0
         self.effects_volume = 0.8
         self.music_volume = 0.0
-        self.settings_panel = SettingsPanel(self.font)
-        self.plant_inspector = PlantInspector(self.font)
+        # panels, the scaled renderer and the simulation thread are imported on first use
+        self.settings_panel = LazyPanel(self._make_settings_panel)
+        self.plant_inspector = LazyPanel(self._make_plant_inspector)
         # apply initial volumes
         if self.snd and self.snd.enabled:
             self.snd.set_effects_volume(self.effects_volume)
             self.snd.set_music_volume(self.music_volume)
 
+    def _make_settings_panel(self):
+        from .ui.settings import SettingsPanel
+        return SettingsPanel(self.font)
+
+    def _make_plant_inspector(self):
+        from .ui.plant_settings import PlantInspector
+        return PlantInspector(self.font)
+
     def tile_at_pos(self, pos):
         x, y = pos
         for t in self.tiles:
@@ -100,24 +180,77 @@ class Game:
         return True
 
     def spawn_flash(self, x, y, color=(255, 255, 200)):
-        self.particles.append(Particle(x, y, 0, 0, 8, 0.12, color))
+        self.particles.emit(x, y, 0, 0, 8, 0.12, color, PRIORITY_FLASH)
 
     def spawn_smoke(self, x, y, count=4):
-        for _ in range(count):
-            vx = random.uniform(10, 40)
-            vy = random.uniform(-30, -10)
-            r = random.randint(3, 5)
-            life = random.uniform(0.3, 0.6)
-            self.particles.append(Particle(x, y, vx, vy, r, life, (180, 220, 180)))
+        rng = self.particles.rng
+        for _ in range(self.particles.scaled_count(count, PRIORITY_SMOKE)):
+            vx = rng.uniform(10, 40)
+            vy = rng.uniform(-30, -10)
+            r = rng.randint(3, 5)
+            life = rng.uniform(0.3, 0.6)
+            self.particles.emit(x, y, vx, vy, r, life, (180, 220, 180), PRIORITY_SMOKE)
+
+    def spawn_hit(self, x, y):
+        particles = self.particles
+        burst = particles.claim_burst(x, y, PRIORITY_SPARK)
+        if burst is None:
+            return
+        rng = particles.rng
+        for _ in range(particles.scaled_count(4, PRIORITY_SPARK)):
+            particles.emit(x, y, rng.uniform(-50, 30), rng.uniform(-40, 20), 3, 0.3, (140, 255, 140), PRIORITY_SPARK,
+                           burst=burst)
 
     def spawn_bite(self, x, y):
         if not self.settings.get('particles', True):
             return
-        for _ in range(3):
-            vx = random.uniform(-50, 50)
-            vy = random.uniform(-20, 20)
-            life = random.uniform(0.2, 0.35)
-            self.particles.append(Particle(x, y, vx, vy, 4, life, (255, 120, 90)))
+        particles = self.particles
+        burst = particles.claim_burst(x, y, PRIORITY_BITE)
+        if burst is None:
+            return
+        rng = particles.rng
+        for _ in range(particles.scaled_count(3, PRIORITY_BITE)):
+            vx = rng.uniform(-50, 50)
+            vy = rng.uniform(-20, 20)
+            life = rng.uniform(0.2, 0.35)
+            particles.emit(x, y, vx, vy, 4, life, (255, 120, 90), PRIORITY_BITE, burst=burst)
+
+    def set_speed(self, mode: int):
+        """Switch fast-forward mode (see SPEED_MODES); effects thin out as speed goes up."""
+        self.settings['speed'] = mode
+        self._turbo_time = 0.0
+        self.particles.thin = mode
+        if self.snd:
+            self.snd.thin = mode
+
+    def cycle_speed(self):
+        modes = SPEED_MODES
+        current = self.settings.get('speed', 1)
+        self.set_speed(modes[(modes.index(current) + 1) % len(modes)] if current in modes else 1)
+
+    def fast_forward(self, dt) -> bool:
+        """Run the fixed-step ticks owed for `dt` seconds of wall time; returns whether to draw."""
+        step = 1.0 / FPS
+        speed = self.settings.get('speed', 1)
+        if speed:
+            self._turbo_time = min(self._turbo_time + dt * speed, step * speed * SPEED_MAX_LAG_FRAMES)
+            while self._turbo_time >= step and not self.is_idle():
+                self._turbo_time -= step
+                self.update(step)
+            return True
+        # max: tick for one display refresh worth of wall time, draw every few refreshes
+        deadline = time.perf_counter() + step
+        while time.perf_counter() < deadline and not self.is_idle():
+            self.update(step)
+        self._turbo_frames += 1
+        return self._turbo_frames % SPEED_MAX_DRAW_EVERY == 0 or self.is_idle()
+
+    def plant_removed(self, plant):
+        tile = self.tiles[plant.row * COLS + plant.col]
+        if tile.plant is plant:
+            tile.plant = None
+        if self.plant_inspector.plant is plant:
+            self.plant_inspector.hide()
 
     def row_for_y(self, y: float) -> int:
         row = int((y - GRID_TOP) // TILE_H)
@@ -129,105 +262,113 @@ class Game:
             return
         if self.settings_panel.open:
             return
+        start = time.perf_counter()
+        counters = self.counters
+        counters.ticks += 1
         for c in self.cards:
             c.update(dt)
-        # plants
-        for p in list(self.plants):
-            p.update(dt, self)
-            if hasattr(p, "animate"):
-                p.animate(dt)
-            if not p.alive:
-                for t in self.tiles:
-                    if t.plant is p:
-                        t.plant = None
-                        break
-                self.plants.remove(p)
-                if self.plant_inspector.plant is p:
-                    self.plant_inspector.hide()
-
-        # bullets
-        for b in list(self.bullets):
-            b.update(dt)
-            if not b.alive:
-                self.bullets.remove(b)
-
-        # bullet collisions
-        for b in list(self.bullets):
-            br = b.rect()
-            hit_any = False
-            for z in self.zombies:
-                if z.row != self.row_for_y(b.y):
-                    continue
-                if br.colliderect(z.rect()):
-                    z.hp -= b.damage
-                    if getattr(b, 'slow', 0.0) and getattr(b, 'slow_time', 0.0):
-                        if hasattr(z, 'apply_slow'):
-                            z.apply_slow(b.slow, b.slow_time)
-                    if self.settings.get('particles', True):
-                        ix, iy = br.centerx, br.centery
-                        for _ in range(4):
-                            self.particles.append(Particle(ix, iy, random.uniform(-50, 30), random.uniform(-40, 20), 3, 0.3, (140, 255, 140)))
-                    if self.snd:
-                        self.snd.play_hit()
-                    hit_any = True
-                    break
-            if hit_any:
-                b.alive = False
-                self.bullets.remove(b)
-
-        # zombies
-        for z in list(self.zombies):
-            z.update(dt, self)
-            if not z.alive:
-                self.zombies.remove(z)
+        if self.lane_kernel is not None:
+            self.lane_kernel.step(dt)
+        else:
+            step_lanes(self, dt)
 
         # particles
         if self.settings.get('particles', True):
-            for p in list(self.particles):
-                p.update(dt)
-                if p.life <= 0:
-                    self.particles.remove(p)
+            self.particles.update(dt)
 
         # spawning
         self.spawn_timer -= dt
         if self.spawn_timer <= 0:
             lane = random.randint(0, ROWS - 1)
-            z_cls = random.choices([BasicZombie, FastZombie, TankZombie], weights=[0.6, 0.25, 0.15])[0]
+            z_cls = random.choices(SPAWN_TYPES, weights=SPAWN_WEIGHTS)[0]
             self.zombies.append(z_cls(lane))
+            counters.spawns += 1
             self.spawn_timer = ZOMBIE_SPAWN_EVERY * random.uniform(0.8, 1.2)
 
-    def draw(self):
-        self.screen.fill(BG)
-        # grid
-        for t in self.tiles:
-            t.draw(self.screen)
+        self.rewind.tick(self)
+        if self.exporter is not None:
+            self.exporter.publish(self)
+        if self.spectators is not None:
+            self.spectators.publish(self)
+        counters.update_time += time.perf_counter() - start
+
+    def draw(self, scene=None):
+        """Draw a frame; `scene` is a WorldSnapshot to draw instead of the live entities."""
+        if self.renderer is not None:
+            self.renderer.draw(self, scene)
+            return
+        self.render_frame(self.screen, scene)
+        pg.display.flip()
+
+    def render_frame(self, surf, scene=None):
+        """Draw a whole frame into `surf`, the window or any offscreen surface of its size."""
+        scale = self.settings.get('render_scale', 1.0)
+        if scale < 1.0:
+            if self.scene_renderer is None or self.scene_renderer.scale != scale:
+                from .render.scaled import ScaledSceneRenderer
+                self.scene_renderer = ScaledSceneRenderer((WIDTH, HEIGHT), scale)
+            pg.transform.scale(self.scene_renderer.draw(self, scene), (WIDTH, HEIGHT), surf)
+        else:
+            self.scene_renderer = None
+            self.draw_scene(surf, scene)
+        self.draw_ui(surf)
+
+    def draw_scene(self, surf, scene=None):
+        if scene is None:
+            scene = self
+        # background and grid never change: one blit instead of a fill and 90 rects
+        if SURFACES.fits(surf.get_pitch() * surf.get_height()):
+            surf.blit(self._get_board_background(surf), (0, 0))
+        else:  # a cache budget too small to hold it
+            surf.fill(BG)
+            for t in self.tiles:
+                t.draw(surf)
         # plants
-        for p in self.plants:
-            p.draw(self.screen)
+        for p in scene.plants:
+            p.draw(surf)
         # bullets
-        for b in self.bullets:
-            b.draw(self.screen, fancy_vfx=self.settings.get('fancy_vfx', True))
+        for b in scene.bullets:
+            b.draw(surf, fancy_vfx=self.settings.get('fancy_vfx', True))
         # zombies
-        for z in self.zombies:
-            z.draw(self.screen)
+        for z in scene.zombies:
+            z.draw(surf)
         # particles
         if self.settings.get('particles', True):
-            for p in self.particles:
-                p.draw(self.screen)
+            for p in scene.particles:
+                p.draw(surf)
+
+    def ui_state(self):
+        """Everything draw_ui depends on, or None while an open panel or the stats overlay is shown.
 
+        A renderer keeping the UI in its own layer only redraws it when this changes.
+        """
+        if self.settings_panel.open or self.plant_inspector.plant is not None or self.show_stats:
+            return None
+        drag = None
+        if self.dragging_card is not None:
+            tile = self.tile_at_pos(self.drag_pos)
+            drag = (self.dragging_card, self.drag_pos, tile is not None and tile.plant is None)
+        return (tuple(c.can_pick() for c in self.cards), self.settings_button.state(),
+                self.settings.get('speed', 1), drag, self.game_over)
+
+    def draw_ui(self, surf):
         # bottom bar
         bar_rect = pg.Rect(0, GRID_TOP + ROWS * TILE_H, WIDTH, BAR_H)
-        pg.draw.rect(self.screen, (200, 220, 210), bar_rect)
-        pg.draw.line(self.screen, BORDER, (0, bar_rect.top), (WIDTH, bar_rect.top), 3)
+        pg.draw.rect(surf, (200, 220, 210), bar_rect)
+        pg.draw.line(surf, BORDER, (0, bar_rect.top), (WIDTH, bar_rect.top), 3)
         for c in self.cards:
-            c.draw(self.screen, self.font)
-        self.settings_button.draw(self.screen)
+            c.draw(surf, self.font)
+        self.settings_button.draw(surf)
+        speed = self.settings.get('speed', 1)
+        if speed != 1:
+            badge = get_text(self.font, f">> {speed_label(speed)}", BORDER)
+            surf.blit(badge, (self.settings_button.rect.centerx - badge.get_width() // 2, bar_rect.top + 8))
 
         if self.dragging_card is not None:
             mx, my = self.drag_pos
             tile = self.tile_at_pos(self.drag_pos)
             if tile and tile.plant is None:
-                tile.draw(self.screen, highlight=True)
+                tile.draw(surf, highlight=True)
 
             preview = None
             if hasattr(self.dragging_card, "get_preview"):
@@ -236,28 +377,61 @@ class Game:
             if preview:
                 rect = preview.get_rect()
                 rect.midbottom = (mx, my)
-                self.screen.blit(preview, rect)
+                surf.blit(preview, rect)
             else:
                 ghost = pg.Rect(0, 0, 54, 54)
                 ghost.center = (mx, my)
-                pg.draw.ellipse(self.screen, (100, 200, 120), ghost)
-                pg.draw.ellipse(self.screen, (40, 80, 60), ghost, 2)
+                pg.draw.ellipse(surf, (100, 200, 120), ghost)
+                pg.draw.ellipse(surf, (40, 80, 60), ghost, 2)
 
-        self.plant_inspector.draw(self.screen)
+        self.plant_inspector.draw(surf)
 
         if self.game_over:
-            overlay = pg.Surface((WIDTH, HEIGHT), pg.SRCALPHA)
-            overlay.fill((0, 0, 0, 140))
-            self.screen.blit(overlay, (0, 0))
-            text = self.big_font.render("Game Over", True, WHITE)
-            self.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - text.get_height() // 2))
-            sub = self.font.render("Press R to restart", True, WHITE)
-            self.screen.blit(sub, (WIDTH // 2 - sub.get_width() // 2, HEIGHT // 2 + 40))
+            for layer, pos in self._get_game_over_layer():
+                surf.blit(layer, pos)
 
         # Settings overlay
-        self.settings_panel.draw(self.screen)
-
-        pg.display.flip()
+        self.settings_panel.draw(surf)
+
+        if self.show_stats:
+            surf.blit(self._get_stats_text(), (8, 8))
+
+    def _get_board_background(self, surf):
+        def build():
+            background = pg.Surface(surf.get_size(), 0, surf)
+            background.fill(BG)
+            for t in self.tiles:
+                t.draw(background)
+            return background
+        return SURFACES.get("board", build, variant=(surf.get_size(), surf.get_bitsize(), surf.get_masks()))
+
+    def _get_game_over_layer(self):
+        # the text stays separate: antialiased glyphs pre-blended onto the
+        # translucent dim layer would come out darker than on the board
+        def build():
+            overlay = pg.Surface((WIDTH, HEIGHT), pg.SRCALPHA)
+            overlay.fill((0, 0, 0, 140))
+            return overlay
+        text = get_text(self.big_font, "Game Over", WHITE)
+        sub = get_text(self.font, "Press R to restart", WHITE)
+        return (
+            (SURFACES.get("overlay", build, variant=(WIDTH, HEIGHT), tint=(0, 0, 0, 140)), (0, 0)),
+            (text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - text.get_height() // 2)),
+            (sub, (WIDTH // 2 - sub.get_width() // 2, HEIGHT // 2 + 40)),
+        )
+
+    def _get_stats_text(self):
+        # changes every frame, so it is rendered here rather than through the cache
+        now = pg.time.get_ticks()
+        if self._stats_text is None or now - self._stats_updated >= 500:
+            self._stats_text = self.font.render(SURFACES.summary(), True, WHITE, BORDER)
+            self._stats_updated = now
+        return self._stats_text
+
+    def new_game(self):
+        """Start over: an empty board, and no rewinding into the previous game."""
+        self.reset()
+        self.rewind.clear()
 
     def reset(self):
         self.plants.clear()
@@ -270,6 +444,23 @@ class Game:
         self.game_over = False
         self.plant_inspector.hide()
 
+    def save_state(self, path):
+        try:
+            savestate.save(self, path)
+        except OSError as e:
+            print(f"Could not save state to {path}: {e}")
+            return False
+        print("Saved state to", path)
+        return True
+
+    def load_state(self, path):
+        try:
+            savestate.load(self, path)
+        except (OSError, ValueError) as e:
+            print(f"Could not load state from {path}: {e}")
+            return False
+        return True
+
     def handle_mouse_down(self, pos):
         if self.game_over:
             return
@@ -309,44 +500,242 @@ class Game:
         if self.dragging_card is not None:
             self.drag_pos = pos
 
+    @property
+    def window_paused(self):
+        return self.window_minimized or (not self.window_focused and self.settings.get('pause_unfocused', True))
+
+    def is_idle(self):
+        # nothing on screen moves in these states, so frames are only drawn in response to events
+        return self.settings_panel.open or self.game_over or self.window_paused
+
+    def handle_event(self, event):
+        """Route one event; returns False when the game should quit."""
+        running = True
+        if event.type == pg.WINDOWFOCUSLOST:
+            self.window_focused = False
+        elif event.type == pg.WINDOWFOCUSGAINED:
+            self.window_focused = True
+        elif event.type in (pg.WINDOWMINIMIZED, pg.WINDOWHIDDEN):
+            self.window_minimized = True
+        elif event.type in (pg.WINDOWRESTORED, pg.WINDOWSHOWN, pg.WINDOWMAXIMIZED):
+            self.window_minimized = False
+        if not self.settings_panel.open and self.plant_inspector.handle_event(event):
+            return running
+        if event.type == pg.QUIT:
+            running = False
+        elif event.type == pg.KEYDOWN:
+            if event.key == pg.K_ESCAPE:
+                if self.settings_panel.open:
+                    self.settings_panel.hide()
+                else:
+                    running = False
+            if event.key == pg.K_r:
+                self.new_game()
+            elif event.key == pg.K_f:
+                self.cycle_speed()
+            elif event.key == pg.K_F3:
+                self.show_stats = not self.show_stats
+            elif event.key == pg.K_F5:
+                self.save_state(SAVE_DIR / "quicksave.pohs")
+            elif event.key == pg.K_F9:
+                self.load_state(SAVE_DIR / "quicksave.pohs")
+            elif event.key == pg.K_F8:
+                self.profiler.start(self.profile_frames)
+            elif event.key == pg.K_BACKSPACE:
+                data = self.rewind.rewind(REWIND_STEP)
+                if data is not None:
+                    savestate.deserialize(self, data)
+        elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+            if not self.settings_panel.open:
+                self.handle_mouse_down(event.pos)
+        elif event.type == pg.MOUSEBUTTONUP and event.button == 1:
+            if not self.settings_panel.open:
+                self.handle_mouse_up(event.pos)
+        elif event.type == pg.MOUSEMOTION:
+            if not self.settings_panel.open:
+                self.handle_mouse_motion(event.pos)
+        # route events to settings when open
+        if self.settings_panel.open:
+            self.settings_panel.handle_event(event, self)
+        return running
+
+    def _dispatch(self, events) -> bool:
+        """Handle a batch of input events and let the autoplayer act; False on quit."""
+        running = True
+        for event in events:
+            if not self.handle_event(event):
+                running = False
+        if self.autoplayer is not None:
+            self.autoplayer.tick(self)
+        return running
+
+    def _timed_draw(self, scene=None) -> float:
+        start = time.perf_counter()
+        self.draw(scene)
+        return (time.perf_counter() - start) * 1000.0
+
     def run(self):
+        # show the first frame before synthesizing the sound effects
+        self.draw()
+        if self.snd:
+            self.snd.prepare()
+        sim = None
+        lock = nullcontext()
+        if self.threaded:
+            from .sim.thread import SimulationThread
+            sim = SimulationThread(self, 1.0 / FPS)
+            lock = sim.lock
+            sim.start()
         running = True
         while running:
-            dt_ms = self.clock.tick(FPS)
-            dt = dt_ms / 1000.0
-            for event in pg.event.get():
-                if not self.settings_panel.open and self.plant_inspector.handle_event(event):
-                    continue
-                if event.type == pg.QUIT:
+            idle = self.is_idle()
+            if idle:
+                # block until input arrives instead of redrawing the same frame FPS times a second
+                event = pg.event.wait(IDLE_WAIT_MS)
+                events = [] if event.type == pg.NOEVENT else [event]
+                events.extend(pg.event.get())
+                self.clock.tick()
+                dt = 0.0
+                if self.latency is not None:
+                    self.latency.resume()
+            else:
+                # unthreaded max speed is paced by its own tick batches rather than the frame cap
+                turbo_max = sim is None and self.settings.get('speed', 1) == 0
+                if self.pacer is not None and not turbo_max:
+                    dt = self.pacer.wait()
+                else:
+                    dt = self.clock.tick(0 if turbo_max else FPS) / 1000.0
+                if self.latency is not None:
+                    self.latency.frame(dt)
+                # low latency: the unthreaded loop polls after update, just before drawing
+                events = [] if self.pacer is not None and sim is None else pg.event.get()
+            polled = time.perf_counter()
+            with lock:
+                if not self._dispatch(events):
                     running = False
-                elif event.type == pg.KEYDOWN:
-                    if event.key == pg.K_ESCAPE:
-                        if self.settings_panel.open:
-                            self.settings_panel.hide()
-                        else:
+                if sim is not None and events:
+                    sim.invalidate()
+            if sim is not None:
+                if self.settings.get('speed', 1) == 0 and not idle:
+                    self._turbo_frames += 1
+                    if self._turbo_frames % SPEED_MAX_DRAW_EVERY:
+                        continue
+                if not (idle and (not events or self.window_minimized)):
+                    with self.profiler.frame():
+                        draw_ms = self._timed_draw(sim.latest)
+                    if self.latency is not None:
+                        self.latency.input(events, polled, time.perf_counter())
+                    if self.metrics is not None:
+                        self.metrics.record(self, dt * 1000.0, draw_ms)
+                continue
+            if not idle:
+                with self.profiler.frame():
+                    if self.settings.get('speed', 1) == 1:
+                        self.update(dt)
+                        show = True
+                    else:
+                        show = self.fast_forward(dt)
+                    if self.pacer is not None:
+                        events = pg.event.get()
+                        polled = time.perf_counter()
+                        if not self._dispatch(events):
                             running = False
-                    if event.key == pg.K_r:
-                        self.reset()
-                elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-                    if not self.settings_panel.open:
-                        self.handle_mouse_down(event.pos)
-                elif event.type == pg.MOUSEBUTTONUP and event.button == 1:
-                    if not self.settings_panel.open:
-                        self.handle_mouse_up(event.pos)
-                elif event.type == pg.MOUSEMOTION:
-                    if not self.settings_panel.open:
-                        self.handle_mouse_motion(event.pos)
-                # route events to settings when open
-                if self.settings_panel.open:
-                    self.settings_panel.handle_event(event, self)
-            self.update(dt)
-            self.draw()
+                    draw_ms = self._timed_draw() if show else 0.0
+                if self.latency is not None and show:
+                    self.latency.input(events, polled, time.perf_counter())
+                if self.metrics is not None:
+                    self.metrics.record(self, dt * 1000.0, draw_ms)
+                continue
+            if not self.window_paused:
+                # game over / settings: update() only tidies UI state here
+                self.update(dt)
+            if events and not self.window_minimized:
+                self.draw()
+        if sim is not None:
+            sim.stop()
+        if self.latency is not None:
+            print(self.latency.summary())
+        if self.metrics is not None:
+            self.metrics.close()
+        if self.exporter is not None:
+            self.exporter.close()
+        if self.spectators is not None:
+            self.spectators.close()
+        if self.snd:
+            self.snd.close()
         pg.quit()
 
 
-def main():
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="plants_of_hell", description="Plants of Hell")
+    parser.add_argument("--renderer", choices=["surface", "sdl2"], default="surface",
+                        help="drawing backend; sdl2 uses Renderer/Texture and falls back to surface if unavailable")
+    parser.add_argument("--render-driver", default=None,
+                        help="SDL render driver for the sdl2 backend, e.g. 'software' for headless CI")
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="draw the board at this fraction (0.5-1.0) of the window size and upscale it")
+    parser.add_argument("--threaded", action="store_true",
+                        help="run the simulation on its own thread at a fixed rate and draw from its snapshots")
+    parser.add_argument("--export-shm", metavar="NAME", nargs="?", const="plants_of_hell", default=None,
+                        help="publish every tick to a shared-memory ring; watch it with "
+                             "python -m plants_of_hell.sim.shared_state NAME")
+    parser.add_argument("--spectate", metavar="[HOST:]PORT", default=None,
+                        help="stream the game to spectators; watch with python -m plants_of_hell.net.spectator watch HOST:PORT")
+    parser.add_argument("--profile-frames", type=int, metavar="N", default=None,
+                        help=f"profile the first N frames (F8 profiles the next N at any time, default {PROFILE_FRAMES})")
+    parser.add_argument("--profile-dir", default=str(PROFILE_DIR),
+                        help="where .prof and collapsed-stack (.collapsed) files are written")
+    parser.add_argument("--profile-sampling", action="store_true",
+                        help="sample stacks every millisecond instead of tracing every call (lower overhead, no .prof)")
+    parser.add_argument("--surface-cache-mb", type=float, default=None,
+                        help=f"memory budget for cached sprites and their variants (default {SURFACE_CACHE_MB})")
+    parser.add_argument("--metrics", metavar="PATH", default=None,
+                        help="log per-frame timings and entity counts as JSON lines (or CSV if PATH ends in .csv)")
+    parser.add_argument("--low-latency", action="store_true",
+                        help="pace frames precisely and read input just before drawing (snappier drag and drop)")
+    parser.add_argument("--latency-stats", action="store_true",
+                        help="report frame-time jitter and input-to-display latency on exit (implied by --low-latency)")
+    parser.add_argument("--autoplay", metavar="STRATEGY", choices=["greedy", "random", "layout"], default=None,
+                        help="let a bot play (greedy lane defence, random drops, or a fixed layout)")
+    parser.add_argument("--speed", choices=[speed_label(m) for m in SPEED_MODES], default=None,
+                        help="start fast-forwarded (F cycles the speed in game)")
+    parser.add_argument("--numpy-kernel", action="store_true",
+                        help="step plants, zombies and peas with the vectorized NumPy lane kernel (needs numpy)")
+    parser.add_argument("--load", metavar="PATH", default=None,
+                        help="start from a save state written with F5 (saves/quicksave.pohs)")
+    args = parser.parse_args(argv)
+    if args.spectate:
+        from .net.spectator import parse_address
+        try:
+            args.spectate = parse_address(args.spectate)
+        except ValueError as e:
+            parser.error(f"--spectate: {e}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.surface_cache_mb is not None:
+        SURFACES.set_budget(int(args.surface_cache_mb * 2**20))
     try:
-        Game().run()
+        game = Game(renderer=args.renderer, render_driver=args.render_driver, render_scale=args.render_scale,
+                    threaded=args.threaded, export_shm=args.export_shm, spectate=args.spectate,
+                    profile_dir=args.profile_dir, profile_frames=args.profile_frames or PROFILE_FRAMES,
+                    profile_sampling=args.profile_sampling, metrics_path=args.metrics,
+                    low_latency=args.low_latency, latency_stats=args.latency_stats,
+                    numpy_kernel=args.numpy_kernel)
+        if args.profile_frames:
+            game.profiler.start(args.profile_frames)
+        if args.autoplay:
+            from .sim.autoplay import make_player
+            game.autoplayer = make_player(args.autoplay)
+        if args.speed:
+            game.set_speed({speed_label(m): m for m in SPEED_MODES}[args.speed])
+        if args.load:
+            game.load_state(args.load)
+        game.run()
     except Exception as e:
         print("Error:", e)
         pg.quit()
@@ -0,0 +1,428 @@
+import argparse
+import socket
+import struct
+import threading
+
+from ..entities.base import Entity
+from ..entities.bullet import Bullet
+from ..sim.savestate import PLANT_CODES, ZOMBIE_CODES, PLANT_TYPES, ZOMBIE_TYPES
+
+# Spectator stream: length-prefixed binary messages over TCP.
+#
+#   message  u32 length, then: kind 'K' (keyframe, replaces the world) or 'D' (delta),
+#            tick u32, game_over u8, then one section each for plants, zombies, bullets
+#   section  removed/added/changed counts u16, removed ids u32[], added records, changed records
+#
+# Added records carry the fields that never change (type, cell, color, ...) followed
+# by the state; changed records carry the id and the state only. Positions are sent
+# in quarter pixels and timers in 1/512 s, which is below what the draw code shows.
+
+DEFAULT_PORT = 47800
+KEYFRAME_EVERY = 120  # ticks
+
+POS_SCALE = 4
+TIMER_SCALE = 512
+HP_SCALE = 8
+PHASE_SCALE = 1024
+
+_LEN = struct.Struct("<I")
+_HEADER = struct.Struct("<cIB")
+_COUNTS = struct.Struct("<HHH")
+_ID = struct.Struct("<I")
+
+# per kind: (static part of an added record, state part)
+_PLANT_STATIC = struct.Struct("<IBBB")  # id, type, row, col
+_PLANT_STATE = struct.Struct("<HHBBBB?")  # hp, max_hp, hurt, muzzle, recoil, anim frame (255 = idle), zombified
+_ZOMBIE_STATIC = struct.Struct("<IBBhBBB")  # id, type, row, y, color
+_ZOMBIE_STATE = struct.Struct("<hhI?")  # x, hp, anim_phase, eating
+_BULLET_STATIC = struct.Struct("<IhBBBB")  # id, y, radius, color
+_BULLET_STATE = struct.Struct("<h")  # x
+
+_KINDS = (
+    (_PLANT_STATIC, _PLANT_STATE),
+    (_ZOMBIE_STATIC, _ZOMBIE_STATE),
+    (_BULLET_STATIC, _BULLET_STATE),
+)
+
+
+def _timer(t):
+    return min(255, int(t * TIMER_SCALE))
+
+
+def capture(game):
+    """Raw per-entity fields for the encoder: cheap enough to run on the game thread."""
+    plants = [
+        (p.id, PLANT_CODES[p.__class__], p.row, p.col, p.hp, p.max_hp, p.hurt_timer, p.muzzle_timer,
+         p.__dict__.get("recoil_timer", 0.0), p.__dict__.get("anim_index", 0) if p.__dict__.get("anim_playing") else -1,
+         p.zombified)
+        for p in game.plants
+    ]
+    zombies = [(z.id, ZOMBIE_CODES[z.__class__], z.row, z.y, z.color, z.x, z.hp, z.anim_phase, z.eating)
+               for z in game.zombies]
+    bullets = [(b.id, b.y, b.radius, b.color, b.x) for b in game.bullets]
+    return plants, zombies, bullets, game.game_over
+
+
+def quantize(raw):
+    """Split captured entities into {id: (static record, state record)} per kind."""
+    plants, zombies, bullets, game_over = raw
+    qp = {
+        pid: ((pid, code, row, col),
+              (min(65535, round(hp * HP_SCALE)), min(65535, int(max_hp)), _timer(hurt), _timer(muzzle),
+               _timer(recoil), 255 if frame < 0 else min(frame, 254), zombified))
+        for pid, code, row, col, hp, max_hp, hurt, muzzle, recoil, frame, zombified in plants
+    }
+    qz = {
+        zid: ((zid, code, row, round(y), *color), (round(x * POS_SCALE), max(-32768, min(32767, int(hp))), round(phase * PHASE_SCALE), eating))
+        for zid, code, row, y, color, x, hp, phase, eating in zombies
+    }
+    qb = {bid: ((bid, round(y), radius, *color), (round(x * POS_SCALE),)) for bid, y, radius, color, x in bullets}
+    return (qp, qz, qb), game_over
+
+
+def encode(tick, state, prev=None):
+    """Encode `state` as a delta against `prev`, or as a keyframe when `prev` is None."""
+    kinds, game_over = state
+    parts = [_HEADER.pack(b"K" if prev is None else b"D", tick, game_over)]
+    for i, (static, st) in enumerate(_KINDS):
+        cur = kinds[i]
+        old = {} if prev is None else prev[0][i]
+        removed = [eid for eid in old if eid not in cur]
+        added = []
+        changed = []
+        for eid, (fixed, values) in cur.items():
+            before = old.get(eid)
+            if before is None:
+                added.append(static.pack(*fixed) + st.pack(*values))
+            elif before[1] != values:
+                changed.append(_ID.pack(eid) + st.pack(*values))
+        parts.append(_COUNTS.pack(len(removed), len(added), len(changed)))
+        parts.extend(_ID.pack(eid) for eid in removed)
+        parts.extend(added)
+        parts.extend(changed)
+    body = b"".join(parts)
+    return _LEN.pack(len(body)) + body
+
+
+class SpectatorServer:
+    """Streams the board to TCP spectators from a background thread.
+
+    The game thread only captures raw entity fields (and only while someone is
+    watching); quantizing, diffing and sending happen on the encoder thread,
+    which always encodes the newest tick and skips any it could not keep up with.
+    Deltas are taken against the last tick actually sent, so skipping is safe.
+    """
+
+    SEND_TIMEOUT = 0.25  # slower spectators are dropped
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, keyframe_every: int = KEYFRAME_EVERY):
+        self.keyframe_every = keyframe_every
+        self.listener = socket.create_server((host, port))
+        self.listener.settimeout(0.5)
+        self.address = self.listener.getsockname()
+        self.clients = []
+        self._joining = []
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._pending = None
+        self._tick = 0
+        self._stopping = False
+        self.bytes_sent = 0
+        self._accept_thread = threading.Thread(target=self._accept_loop, name="spectator-accept", daemon=True)
+        self._encode_thread = threading.Thread(target=self._encode_loop, name="spectator-encode", daemon=True)
+        self._accept_thread.start()
+        self._encode_thread.start()
+
+    def publish(self, game):
+        self._tick += 1
+        if not self.clients and not self._joining:
+            return
+        raw = capture(game)
+        with self._ready:
+            self._pending = (self._tick, raw)
+            self._ready.notify()
+
+    def close(self):
+        with self._ready:
+            self._stopping = True
+            self._ready.notify()
+        self.listener.close()
+        self._accept_thread.join(timeout=1.0)
+        self._encode_thread.join(timeout=1.0)
+        for sock in self.clients + self._joining:
+            sock.close()
+
+    def _accept_loop(self):
+        while not self._stopping:
+            try:
+                sock, _addr = self.listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.settimeout(self.SEND_TIMEOUT)
+            with self._lock:
+                self._joining.append(sock)
+
+    def _send(self, sock, data):
+        try:
+            sock.sendall(data)
+        except OSError:
+            sock.close()
+            return False
+        self.bytes_sent += len(data)
+        return True
+
+    def _encode_loop(self):
+        prev = None
+        last_key = 0
+        while True:
+            with self._ready:
+                while self._pending is None and not self._stopping:
+                    self._ready.wait()
+                if self._stopping:
+                    return
+                tick, raw = self._pending
+                self._pending = None
+                joining, self._joining = self._joining, []
+            state = quantize(raw)
+            if prev is None or tick - last_key >= self.keyframe_every:
+                message = encode(tick, state)
+                last_key = tick
+                self.clients = [s for s in self.clients + joining if self._send(s, message)]
+            else:
+                message = encode(tick, state, prev)
+                self.clients = [s for s in self.clients if self._send(s, message)]
+                if joining:
+                    key = encode(tick, state)
+                    self.clients += [s for s in joining if self._send(s, key)]
+            prev = state
+
+
+class ReplayWorld:
+    """Client-side board rebuilt from the stream, drawable like a WorldSnapshot.
+
+    Entities are real plant/zombie/bullet instances, so the regular draw code
+    and the alternative renderers work on them unchanged.
+    """
+
+    particles = ()
+
+    def __init__(self):
+        self.tick = 0
+        self.game_over = False
+        self._entities = ({}, {}, {})
+        self.plants = []
+        self.zombies = []
+        self.bullets = []
+
+    def apply(self, body: bytes):
+        kind, self.tick, game_over = _HEADER.unpack_from(body, 0)
+        self.game_over = bool(game_over)
+        off = _HEADER.size
+        if kind == b"K":
+            for entities in self._entities:
+                entities.clear()
+        for i, (static, st) in enumerate(_KINDS):
+            entities = self._entities[i]
+            n_removed, n_added, n_changed = _COUNTS.unpack_from(body, off)
+            off += _COUNTS.size
+            for _ in range(n_removed):
+                entities.pop(_ID.unpack_from(body, off)[0], None)
+                off += _ID.size
+            for _ in range(n_added):
+                fixed = static.unpack_from(body, off)
+                off += static.size
+                e = _spawn(i, fixed)
+                e.id = fixed[0]  # keep the host's ids so the world can be compared and inspected
+                _apply_state(i, e, st.unpack_from(body, off))
+                off += st.size
+                entities[fixed[0]] = e
+            for _ in range(n_changed):
+                (eid,) = _ID.unpack_from(body, off)
+                off += _ID.size
+                e = entities.get(eid)
+                if e is not None:
+                    _apply_state(i, e, st.unpack_from(body, off))
+                off += st.size
+        self.plants = list(self._entities[0].values())
+        self.zombies = list(self._entities[1].values())
+        self.bullets = list(self._entities[2].values())
+
+
+def _spawn(kind, fixed):
+    if kind == 0:
+        _pid, code, row, col = fixed
+        return PLANT_TYPES[code](row, col)
+    if kind == 1:
+        _zid, code, row, y, r, g, b = fixed
+        z = object.__new__(ZOMBIE_TYPES[code])
+        Entity.__init__(z)
+        z.row, z.y, z.color = row, y, (r, g, b)
+        return z
+    _bid, y, radius, r, g, b = fixed
+    return Bullet(0, y, 0, radius, color=(r, g, b))
+
+
+def _apply_state(kind, e, values):
+    if kind == 0:
+        hp, max_hp, hurt, muzzle, recoil, frame, zombified = values
+        e.hp = hp / HP_SCALE
+        e.max_hp = max_hp
+        e.hurt_timer = hurt / TIMER_SCALE
+        e.muzzle_timer = muzzle / TIMER_SCALE
+        if "recoil_timer" in e.__dict__:
+            e.recoil_timer = recoil / TIMER_SCALE
+        if "anim_playing" in e.__dict__:
+            e.anim_playing = frame != 255
+            e.anim_index = 0 if frame == 255 else frame
+        if zombified != e.zombified:
+            e.set_zombified(zombified)
+    elif kind == 1:
+        x, e.hp, phase, e.eating = values
+        e.x = x / POS_SCALE
+        e.anim_phase = phase / PHASE_SCALE
+    else:
+        e.x = values[0] / POS_SCALE
+
+
+class SpectatorClient:
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, timeout: float = 5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.timeout = timeout
+        self.world = ReplayWorld()
+        self.messages = 0
+        self.bytes_received = 0
+        self._buffer = bytearray()
+
+    def poll(self, block: bool = False) -> int:
+        """Read whatever has arrived and apply every complete message; returns how many."""
+        self.sock.settimeout(self.timeout if block else 0.0)
+        try:
+            chunk = self.sock.recv(65536)
+        except (BlockingIOError, socket.timeout):
+            chunk = None
+        if chunk == b"":
+            raise ConnectionError("spectator stream closed")
+        if chunk:
+            self._buffer += chunk
+            self.bytes_received += len(chunk)
+        applied = 0
+        buf = self._buffer
+        while len(buf) >= _LEN.size:
+            (length,) = _LEN.unpack_from(buf, 0)
+            if len(buf) < _LEN.size + length:
+                break
+            self.world.apply(bytes(buf[_LEN.size:_LEN.size + length]))
+            del buf[:_LEN.size + length]
+            applied += 1
+        self.messages += applied
+        return applied
+
+    def close(self):
+        self.sock.close()
+
+
+def parse_address(text):
+    """(host, port) from "[HOST:]PORT"; ValueError says what is wrong with it."""
+    host, _, port = text.rpartition(":")
+    try:
+        port = int(port)
+    except ValueError:
+        raise ValueError(f"expected [HOST:]PORT, got {text!r}") from None
+    if not 0 < port < 65536:
+        raise ValueError(f"port {port} is out of range")
+    return host or "127.0.0.1", port
+
+
+def watch(host, port):
+    """Open a window and draw the remote game with the regular draw code."""
+    import pygame as pg
+    from ..game import Game
+
+    client = SpectatorClient(host, port)
+    game = Game()
+    pg.display.set_caption(f"Plants of Hell — spectating {host}:{port}")
+    running = True
+    try:
+        while running:
+            game.clock.tick(60)
+            for event in pg.event.get():
+                if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
+                    running = False
+            client.poll()
+            game.game_over = client.world.game_over
+            game.draw(client.world)
+    except ConnectionError as e:
+        print(e)
+    finally:
+        client.close()
+        if game.snd:
+            game.snd.close()
+        pg.quit()
+
+
+def loopback(ticks: int = 1800, seed: int = 1):
+    """Run a headless host with a loopback spectator and check the replay matches."""
+    import os
+    import random
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from ..game import Game
+
+    random.seed(seed)
+    game = Game(spectate=("127.0.0.1", 0))
+    server = game.spectators
+    client = SpectatorClient(*server.address)
+    plant_types = PLANT_TYPES
+    for row in range(5):
+        game.place_plant(game.tiles[row * 9], plant_types[row % len(plant_types)])
+        game.place_plant(game.tiles[row * 9 + 3], plant_types[(row + 1) % len(plant_types)])
+    while not (server.clients or server._joining):
+        time.sleep(0.01)
+    mismatches = 0
+    update_time = 0.0
+    for _ in range(ticks):
+        start = time.perf_counter()
+        game.update(1 / 60)
+        update_time += time.perf_counter() - start
+        expected = quantize(capture(game))
+        deadline = time.perf_counter() + 1.0
+        while client.world.tick < server._tick and time.perf_counter() < deadline:
+            client.poll(block=True)
+        replay = quantize(capture(client.world))
+        if replay[0] != expected[0]:
+            mismatches += 1
+        if game.game_over:
+            game.reset()
+    client.close()
+    server.close()
+    game.snd.close()
+    print(f"{ticks} ticks, {client.messages} messages, {server.bytes_sent / ticks:.0f} bytes/tick, "
+          f"{update_time / ticks * 1000:.3f} ms/update on the host, {mismatches} mismatching ticks")
+    return mismatches == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="plants_of_hell.net.spectator", description="Plants of Hell spectator")
+    sub = parser.add_subparsers(dest="command", required=True)
+    w = sub.add_parser("watch", help="watch a game started with --spectate")
+    w.add_argument("address", nargs="?", default=f"127.0.0.1:{DEFAULT_PORT}", help="HOST:PORT")
+    lb = sub.add_parser("loopback", help="headless host + loopback client consistency check")
+    lb.add_argument("--ticks", type=int, default=1800)
+    lb.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    if args.command == "watch":
+        try:
+            address = parse_address(args.address)
+        except ValueError as e:
+            parser.error(str(e))
+        watch(*address)
+    elif not loopback(args.ticks, args.seed):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
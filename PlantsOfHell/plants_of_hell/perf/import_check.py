@@ -0,0 +1,94 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Entry module, and the modules it should leave until they are first used.
+ENTRY = "plants_of_hell.game"
+LAZY_MODULES = (
+    "plants_of_hell.ui.settings",
+    "plants_of_hell.ui.plant_settings",
+    "plants_of_hell.render.scaled",
+    "plants_of_hell.render.sdl2_backend",
+    "plants_of_hell.sim.thread",
+    "plants_of_hell.sim.kernel",
+    "plants_of_hell.sim.shared_state",
+    "plants_of_hell.net.spectator",
+    "argparse",
+    "cProfile",
+    "pstats",
+    "statistics",
+    "json",
+    "wave",
+)
+# Modules that run without a window; they must not pull in UI, audio or the Game.
+HEADLESS_MODULES = (
+    "plants_of_hell.sim.lanes",
+    "plants_of_hell.sim.shards",
+    "plants_of_hell.sim.kernel",
+    "plants_of_hell.sim.savestate",
+    "plants_of_hell.sim.snapshot",
+)
+HEADLESS_FORBIDDEN = ("plants_of_hell.ui", "plants_of_hell.audio", "plants_of_hell.game")
+
+
+def _python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    root = str(Path(__file__).resolve().parents[2])
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (root, env.get("PYTHONPATH"))))
+    env.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    return subprocess.run([sys.executable, *flags, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+
+def import_ms(module: str = ENTRY, runs: int = 7) -> float:
+    """Median cumulative import time of `module` in fresh interpreters, pygame already imported."""
+    times = []
+    for _ in range(runs):
+        err = _python(f"import pygame; import {module}", "-X", "importtime").stderr
+        for line in err.splitlines():
+            # import time: self [us] | cumulative | imported package
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == module:
+                times.append(int(parts[1]) / 1000.0)
+    return statistics.median(times)
+
+
+def loaded_after(module: str, before: str = "") -> set:
+    """Modules `module` adds to sys.modules, beyond those `before` already loaded."""
+    out = _python(f"import sys\n{before}\nbase = set(sys.modules)\nimport {module}\n"
+                  "print('\\n'.join(sorted(set(sys.modules) - base)))").stdout
+    return set(out.split())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="plants_of_hell.perf.import_check",
+                                     description="Fail if importing the game takes longer than the budget or "
+                                                 "loads subsystems that should wait until they are used")
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreters to take the median of")
+    parser.add_argument("--budget-ms", type=float, default=12.0,
+                        help=f"allowed cumulative import time of {ENTRY}, pygame excluded")
+    args = parser.parse_args(argv)
+
+    failures = []
+    ms = import_ms(ENTRY, args.runs)
+    print(f"{ENTRY}: {ms:.1f} ms (median of {args.runs})")
+    if ms > args.budget_ms:
+        failures.append(f"{ENTRY} imports in {ms:.1f} ms, budget {args.budget_ms} ms")
+    eager = sorted(set(LAZY_MODULES) & loaded_after(ENTRY, "import pygame"))
+    if eager:
+        failures.append(f"{ENTRY} loads {', '.join(eager)} at import")
+    for module in HEADLESS_MODULES:
+        leaked = sorted(m for m in loaded_after(module) if m.startswith(HEADLESS_FORBIDDEN))
+        if leaked:
+            failures.append(f"{module} loads {', '.join(leaked)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        raise SystemExit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
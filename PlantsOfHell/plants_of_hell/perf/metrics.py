@@ -0,0 +1,112 @@
+import threading
+import time
+from array import array
+from pathlib import Path
+
+from ..render.surface_cache import SURFACES
+
+# One record per rendered frame. Counters (spawns, hits, sounds) are per frame;
+# update_ms covers every simulation tick since the previous frame; cache_kb is
+# what the surface cache holds, cache_hits/misses its lookups in the frame.
+COLUMNS = ("t", "frame_ms", "update_ms", "draw_ms", "plants", "zombies", "bullets", "particles",
+           "spawns", "hits", "sounds", "cache_kb", "cache_hits", "cache_misses")
+_INT_COLUMNS = frozenset(("plants", "zombies", "bullets", "particles", "spawns", "hits", "sounds",
+                          "cache_kb", "cache_hits", "cache_misses"))
+
+
+class TickCounters:
+    """Running totals kept by Game.update; readers take differences, never reset them."""
+
+    __slots__ = ("ticks", "spawns", "hits", "update_time")
+
+    def __init__(self):
+        self.ticks = 0
+        self.spawns = 0
+        self.hits = 0
+        self.update_time = 0.0
+
+
+class MetricsRecorder:
+    """Buffers per-frame metrics in a preallocated ring and writes them from a background thread.
+
+    Each column is a fixed-size array, so recording a frame only stores numbers.
+    The writer thread wakes every `flush_interval` seconds and appends whatever
+    accumulated as JSON lines, or as CSV when the path ends in .csv. If the
+    writer falls a full ring behind, the oldest frames are dropped and counted.
+    """
+
+    def __init__(self, path, capacity: int = 4096, flush_interval: float = 1.0):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.columnar = self.path.suffix.lower() == ".csv"
+        self._columns = [array("d", bytes(8 * capacity)) for _ in COLUMNS]
+        self._head = 0  # frames recorded
+        self._tail = 0  # frames written
+        self.dropped = 0
+        self._start = time.perf_counter()
+        self._last = (0, 0, 0.0, 0, SURFACES.hits, SURFACES.misses)  # counters at the previous frame
+        self._stopping = threading.Event()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", newline="")
+        if self.columnar:
+            self._file.write(",".join(COLUMNS) + "\n")
+        self._thread = threading.Thread(target=self._flush_loop, name="metrics-writer", daemon=True)
+        self._thread.start()
+
+    def record(self, game, frame_ms: float, draw_ms: float):
+        c = game.counters
+        voices = game.snd.voices if game.snd else None
+        sounds = voices.played if voices is not None else 0
+        spawns, hits, update_time, played, cache_hits, cache_misses = self._last
+        i = self._head % self.capacity
+        cols = self._columns
+        cols[0][i] = time.perf_counter() - self._start
+        cols[1][i] = frame_ms
+        cols[2][i] = (c.update_time - update_time) * 1000.0
+        cols[3][i] = draw_ms
+        cols[4][i] = len(game.plants)
+        cols[5][i] = len(game.zombies)
+        cols[6][i] = len(game.bullets)
+        cols[7][i] = len(game.particles)
+        cols[8][i] = c.spawns - spawns
+        cols[9][i] = c.hits - hits
+        cols[10][i] = sounds - played
+        cols[11][i] = SURFACES.bytes // 1024
+        cols[12][i] = SURFACES.hits - cache_hits
+        cols[13][i] = SURFACES.misses - cache_misses
+        self._last = (c.spawns, c.hits, c.update_time, sounds, SURFACES.hits, SURFACES.misses)
+        self._head += 1
+
+    def close(self):
+        self._stopping.set()
+        self._thread.join(timeout=2.0)
+        self._flush()
+        self._file.close()
+
+    def _flush_loop(self):
+        while not self._stopping.wait(self.flush_interval):
+            self._flush()
+
+    def _flush(self):
+        import json
+
+        head = self._head
+        tail = self._tail
+        if head - tail > self.capacity:
+            self.dropped += head - tail - self.capacity
+            tail = head - self.capacity
+        if head == tail:
+            return
+        lines = []
+        cols = self._columns
+        for n in range(tail, head):
+            i = n % self.capacity
+            values = [int(col[i]) if name in _INT_COLUMNS else round(col[i], 3) for name, col in zip(COLUMNS, cols)]
+            if self.columnar:
+                lines.append(",".join(map(str, values)))
+            else:
+                lines.append(json.dumps(dict(zip(COLUMNS, values)), separators=(",", ":")))
+        self._tail = head
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
@@ -0,0 +1,103 @@
+import math
+import time
+from collections import deque
+
+import pygame as pg
+
+# events whose effect the player watches for on screen
+INPUT_EVENTS = frozenset((pg.MOUSEMOTION, pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP, pg.KEYDOWN,
+                          pg.FINGERDOWN, pg.FINGERMOTION, pg.FINGERUP))
+
+
+class FramePacer:
+    """Paces frames to a fixed period by sleeping most of the wait and spinning the rest.
+
+    Clock.tick sleeps in whole milliseconds and often overshoots by one or
+    two; tick_busy_loop is precise but burns a core for the whole frame. Here
+    only the last `spin` seconds are spun, yielding the GIL on every turn so a
+    simulation thread keeps running.
+    """
+
+    def __init__(self, fps: int, spin: float = 0.002):
+        self.period = 1.0 / fps
+        self.spin = spin
+        self._deadline = None
+        self._last = None
+
+    def wait(self) -> float:
+        """Block until the next frame is due; returns the seconds since the previous one."""
+        now = time.perf_counter()
+        if self._deadline is None:
+            self._deadline = self._last = now
+        else:
+            remaining = self._deadline - now
+            if remaining > self.spin:
+                time.sleep(remaining - self.spin)
+            while time.perf_counter() < self._deadline:
+                time.sleep(0)
+            now = time.perf_counter()
+            if now - self._deadline > self.period:
+                # a long frame (or an idle stretch): start over instead of rushing to catch up
+                self._deadline = now
+        self._deadline += self.period
+        dt = now - self._last
+        self._last = now
+        return dt
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(q * len(ordered))) - 1)]
+
+
+class LatencyStats:
+    """Frame intervals and input-to-flip times over the last `capacity` frames.
+
+    Input latency runs from when the frame polled its events to the flip that
+    shows their effect. SDL does not hand event timestamps to Python, so time
+    spent waiting in the queue is invisible, except for synthetic events that
+    carry a `posted` perf_counter() time, as load tests can post.
+    """
+
+    def __init__(self, fps: int, capacity: int = 3600):
+        self.period = 1.0 / fps
+        self.intervals = deque(maxlen=capacity)
+        self.latencies = deque(maxlen=capacity)
+        self._resumed = True
+
+    def resume(self):
+        """The loop was idle; the next interval is not a frame-pacing sample."""
+        self._resumed = True
+
+    def frame(self, interval: float):
+        if self._resumed:
+            self._resumed = False
+            return
+        self.intervals.append(interval)
+
+    def input(self, events, polled: float, flipped: float):
+        """Record a frame that handled `events` (polled at `polled`) and was shown at `flipped`."""
+        first = None
+        for event in events:
+            if event.type in INPUT_EVENTS:
+                posted = getattr(event, "posted", polled)
+                first = posted if first is None else min(first, posted)
+        if first is not None:
+            self.latencies.append(flipped - first)
+
+    def summary(self) -> str:
+        import statistics
+
+        lines = []
+        if len(self.intervals) > 1:
+            ms = [i * 1000.0 for i in self.intervals]
+            deviation = [abs(i - self.period * 1000.0) for i in ms]
+            late = sum(i > self.period * 1500.0 for i in ms)
+            lines.append(f"frame interval {statistics.fmean(ms):.2f} ms (target {self.period * 1000.0:.2f}), "
+                         f"jitter {statistics.pstdev(ms):.2f} ms, p99 deviation {_percentile(deviation, 0.99):.2f} ms, "
+                         f"{late} of {len(ms)} frames late")
+        if self.latencies:
+            ms = [v * 1000.0 for v in self.latencies]
+            lines.append(f"input to flip {statistics.fmean(ms):.2f} ms mean, p95 {_percentile(ms, 0.95):.2f} ms, "
+                         f"max {max(ms):.2f} ms over {len(ms)} frames with input")
+        return "\n".join(lines) or "no frames measured"
@@ -0,0 +1,196 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+
+def _label(code_key):
+    filename, line, name = code_key
+    if filename == "~":  # builtins
+        return name.strip("<>").replace(";", ",")
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(";", ",")
+
+
+def collapse_stats(stats: "pstats.Stats", max_depth: int = 64) -> Counter:
+    """Approximate collapsed stacks (microseconds per stack) from a deterministic profile.
+
+    cProfile only records caller/callee pairs, so each function's time is split
+    between its call paths in proportion to the time each caller spent in it.
+    """
+    table = stats.stats
+    callees = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in table.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    stacks = Counter()
+
+    def walk(func, path, share):
+        cc, nc, tt, ct, _callers = table[func]
+        path = path + (func,)
+        us = round(tt * share * 1e6)
+        if us:
+            stacks[";".join(_label(f) for f in path)] += us
+        if len(path) >= max_depth:
+            return
+        for callee, edge_ct in callees.get(func, ()):
+            total = table[callee][3]
+            if callee in path or total <= 0:
+                continue
+            walk(callee, path, share * min(1.0, edge_ct / total))
+
+    roots = [f for f, v in table.items() if not v[4]]
+    for root in roots:
+        walk(root, (), 1.0)
+    return stacks
+
+
+def _write_collapsed(path: Path, stacks: Counter):
+    with open(path, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+
+class FrameProfiler:
+    """Profiles the next N frames of update + draw on request.
+
+    Use `with profiler.frame():` around one frame on the main loop and
+    `with profiler.section():` around work on other threads (the simulation
+    thread). Deterministic mode writes a .prof file for pstats/snakeviz and a
+    collapsed-stack file for flamegraph.pl or speedscope; sampling mode only
+    records stacks every `interval` seconds, which costs far less per frame.
+    """
+
+    def __init__(self, out_dir, sampling: bool = False, interval: float = 0.001):
+        self.out_dir = Path(out_dir)
+        self.sampling = sampling
+        self.interval = interval
+        self.frames_left = 0
+        self.last_outputs = ()
+        self._lock = threading.Lock()
+        self._profiles = {}
+        self._inside = set()
+        self._samples = Counter()
+        self._sampler = None
+        self._started = 0.0
+        self._frames = 0
+
+    @property
+    def active(self) -> bool:
+        return self.frames_left > 0
+
+    def start(self, frames: int):
+        if self.active or frames <= 0:
+            return
+        self._profiles = {}
+        self._samples = Counter()
+        self._frames = frames
+        self._started = time.perf_counter()
+        self.frames_left = frames
+        if self.sampling:
+            self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+            self._sampler.start()
+        print(f"Profiling the next {frames} frames ({'sampling' if self.sampling else 'cProfile'})")
+
+    def frame(self):
+        return _Section(self, counts_frame=True)
+
+    def section(self):
+        return _Section(self, counts_frame=False)
+
+    def _enter(self) -> bool:
+        """Start recording this thread; False if it cannot be profiled."""
+        ident = threading.get_ident()
+        self._inside.add(ident)
+        if self.sampling:
+            return True
+        prof = self._profiles.get(ident)
+        if prof is None:
+            import cProfile
+
+            with self._lock:
+                prof = self._profiles[ident] = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:
+            # Python 3.12+ allows one active cProfile per process: the first
+            # thread in wins and the others (the simulation thread) go unprofiled
+            with self._lock:
+                self._profiles.pop(ident, None)
+            self._inside.discard(ident)
+            return False
+        return True
+
+    def _exit(self, counts_frame, profiled=True):
+        ident = threading.get_ident()
+        if profiled and not self.sampling:
+            self._profiles[ident].disable()
+        self._inside.discard(ident)
+        if counts_frame:
+            self.frames_left -= 1
+            if self.frames_left == 0:
+                self._finish()
+
+    def _sample_loop(self):
+        current_frames = sys._current_frames
+        while self.active:
+            time.sleep(self.interval)
+            frames = current_frames()
+            for ident in tuple(self._inside):
+                f = frames.get(ident)
+                stack = []
+                while f is not None:
+                    code = f.f_code
+                    stack.append(_label((code.co_filename, code.co_firstlineno, code.co_name)))
+                    f = f.f_back
+                if stack:
+                    self._samples[";".join(reversed(stack))] += 1
+
+    def _finish(self):
+        # let a section still running on another thread (the simulation) close first
+        deadline = time.perf_counter() + 0.5
+        while self._inside and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        base = self.out_dir / f"profile-{stamp}"
+        elapsed = time.perf_counter() - self._started
+        outputs = []
+        if self.sampling:
+            self._sampler.join(timeout=1.0)
+            self._sampler = None
+            stacks = self._samples
+        else:
+            import pstats
+
+            stats = pstats.Stats(*self._profiles.values())
+            prof_path = base.with_suffix(".prof")
+            stats.dump_stats(prof_path)
+            outputs.append(prof_path)
+            stacks = collapse_stats(stats)
+        collapsed_path = base.with_suffix(".collapsed")
+        _write_collapsed(collapsed_path, stacks)
+        outputs.append(collapsed_path)
+        self.last_outputs = tuple(outputs)
+        print(f"Profiled {self._frames} frames in {elapsed:.2f}s: " + ", ".join(str(p) for p in outputs))
+
+
+class _Section:
+    __slots__ = ("profiler", "counts_frame", "entered", "profiled")
+
+    def __init__(self, profiler, counts_frame):
+        self.profiler = profiler
+        self.counts_frame = counts_frame
+        self.entered = False
+        self.profiled = False
+
+    def __enter__(self):
+        if self.profiler.active:
+            self.entered = True
+            self.profiled = self.profiler._enter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.entered:
+            self.profiler._exit(self.counts_frame, self.profiled)
@@ -0,0 +1,208 @@
+import argparse
+import gc
+import os
+import random
+import statistics
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+from ..sim.autoplay import LAYOUTS, LayoutPlayer, make_player, STRATEGIES
+
+TICK = 1 / 60
+
+
+def audit(game):
+    """Sizes of every long-lived cache and collection a long session could grow."""
+    from ..render.surface_cache import SURFACES
+    import pygame as pg
+
+    sizes = {
+        "surface_entries": len(SURFACES),
+        "surface_kb": SURFACES.bytes // 1024,
+        "plants": len(game.plants),
+        "zombies": len(game.zombies),
+        "bullets": len(game.bullets),
+        "particles": len(game.particles),
+        "rewind_slots": len(game.rewind),
+        "threads": threading.active_count(),
+    }
+    if game.snd and game.snd.enabled and pg.mixer.get_init():
+        sizes["busy_channels"] = sum(pg.mixer.Channel(i).get_busy() for i in range(pg.mixer.get_num_channels()))
+    return sizes
+
+
+class ScriptedPlayer:
+    """An autoplayer at the controls, plus settings changes between rounds."""
+
+    def __init__(self, game, rng, strategy="layout"):
+        self.game = game
+        self.rng = rng
+        self.bot = make_player(strategy, rng.randrange(1 << 30))
+
+    def new_round(self, index):
+        if isinstance(self.bot, LayoutPlayer):
+            self.bot.layout = LAYOUTS[index % len(LAYOUTS)]
+        # flip effects now and then so both code paths and their caches get exercised
+        self.game.settings['particles'] = self.rng.random() > 0.2
+        self.game.settings['fancy_vfx'] = self.rng.random() > 0.2
+        self.game.settings['render_scale'] = self.rng.choice((1.0, 1.0, 0.75, 0.5))
+
+    def act(self):
+        self.bot.think(self.game)
+
+
+def _type_counts():
+    return Counter(type(o).__name__ for o in gc.get_objects())
+
+
+def soak(minutes: float, reset_minutes: float = 5.0, samples: int = 20, draw_every: int = 30,
+         seed: int = 1, trace: bool = True, strategy: str = "layout", log=print):
+    """Run scripted play headless and return a report dict (see main for the checks)."""
+    from ..game import Game
+
+    rng = random.Random(seed)
+    random.seed(seed)
+    game = Game()
+    player = ScriptedPlayer(game, rng, strategy)
+    ticks_per_round = int(reset_minutes * 60 / TICK)
+    rounds = max(2, int(minutes / reset_minutes))
+    sample_every = max(1, (rounds - 1) // samples)
+
+    if trace:
+        tracemalloc.start()
+    history = []
+    first_objects = last_objects = None
+    baseline_snapshot = None
+    started = time.perf_counter()
+    for round_index in range(rounds):
+        game.reset()
+        player.new_round(round_index)
+        update_time = 0.0
+        for tick in range(ticks_per_round):
+            if tick % 30 == 0:
+                player.act()
+            t0 = time.perf_counter()
+            game.update(TICK)
+            update_time += time.perf_counter() - t0
+            if draw_every and tick % draw_every == 0:
+                game.draw()
+            if game.game_over:
+                game.reset()
+        # the first round warms caches and the rewind ring; measure from the second on
+        if round_index == 0 or (round_index - 1) % sample_every:
+            continue
+        game.reset()
+        # rewind snapshots vary in size with the board; the ring's bound is audited separately
+        game.rewind.clear()
+        gc.collect()
+        last_objects = _type_counts()
+        if first_objects is None:
+            first_objects = last_objects
+        sample = {
+            "round": round_index,
+            "sim_minutes": (round_index + 1) * reset_minutes,
+            "tick_ms": update_time / ticks_per_round * 1000,
+            "traced_kb": tracemalloc.get_traced_memory()[0] / 1024 if trace else None,
+            "objects": sum(last_objects.values()),
+            "audit": audit(game),
+        }
+        if trace and baseline_snapshot is None:
+            baseline_snapshot = tracemalloc.take_snapshot()
+        history.append(sample)
+        log(f"{sample['sim_minutes']:>8.0f} sim-min  tick {sample['tick_ms']:.3f} ms  "
+            + (f"heap {sample['traced_kb']:.0f} KiB  " if trace else "")
+            + f"objects {sample['objects']}  "
+            + " ".join(f"{k}={v}" for k, v in sample["audit"].items()))
+
+    top_growth = []
+    if trace:
+        own = [tracemalloc.Filter(False, __file__)]  # the harness's own bookkeeping
+        top_growth = tracemalloc.take_snapshot().filter_traces(own).compare_to(
+            baseline_snapshot.filter_traces(own), "lineno")[:10]
+        tracemalloc.stop()
+    if game.snd:
+        game.snd.close()
+    return {"history": history, "first_objects": first_objects, "last_objects": last_objects,
+            "top_growth": top_growth, "wall_seconds": time.perf_counter() - started}
+
+
+def check(report, leak_kb: float = 512.0, object_growth: int = 200, drift: float = 0.25):
+    """Return a list of failure messages for leaks, growing caches and slowing ticks."""
+    history = report["history"]
+    failures = []
+    if len(history) < 3:
+        return ["not enough samples; run more simulated minutes"]
+    # compare thirds rather than single samples: every round plays a different board
+    third = max(1, len(history) // 3)
+    early, late = history[:third], history[-third:]
+    span = late[-1]["sim_minutes"] - early[0]["sim_minutes"]
+
+    if history[0]["traced_kb"] is not None:
+        growth = statistics.median(s["traced_kb"] for s in late) - statistics.median(s["traced_kb"] for s in early)
+        if growth > leak_kb:
+            failures.append(f"heap grew {growth:.0f} KiB over {span:.0f} simulated minutes (budget {leak_kb:.0f} KiB)")
+
+    first_objects, last_objects = report["first_objects"], report["last_objects"]
+    for name, count in last_objects.items():
+        delta = count - first_objects.get(name, 0)
+        if delta > object_growth:
+            failures.append(f"{delta} more live {name} objects than at the first sample")
+
+    # caches may fill while new combinations show up; by the second half they must have stopped
+    middle, last = history[len(history) // 2]["audit"], history[-1]["audit"]
+    for key, value in last.items():
+        if key in ("plants", "zombies", "bullets", "particles"):
+            if value:
+                failures.append(f"{value} {key} left after reset")
+        elif key not in ("busy_channels", "surface_entries", "surface_kb") and value > middle.get(key, value):
+            failures.append(f"{key} still growing in the second half ({middle[key]} -> {value})")
+    # the surface cache may keep filling with variants, but only up to its budget
+    from ..render.surface_cache import SURFACES
+    peak_kb = max(s["audit"]["surface_kb"] for s in history)
+    if peak_kb > SURFACES.budget // 1024:
+        failures.append(f"surface cache held {peak_kb} KiB, over its {SURFACES.budget // 1024} KiB budget")
+
+    early = statistics.median(s["tick_ms"] for s in early)
+    late = statistics.median(s["tick_ms"] for s in late)
+    if late > early * (1 + drift):
+        failures.append(f"tick time drifted from {early:.3f} ms to {late:.3f} ms (+{(late / early - 1) * 100:.0f}%)")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="plants_of_hell.perf.soak",
+                                     description="Headless soak test: scripted play for many simulated minutes, "
+                                                 "failing on memory growth, growing caches or tick-time drift")
+    parser.add_argument("--minutes", type=float, default=1000, help="simulated minutes to play")
+    parser.add_argument("--reset-every", type=float, default=5, help="simulated minutes between Game.reset calls")
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--draw-every", type=int, default=30, help="draw every Nth tick (0 disables drawing)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="layout", help="autoplayer at the controls")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="faster, but no heap numbers")
+    parser.add_argument("--leak-kb", type=float, default=512.0, help="allowed heap growth between first and last sample")
+    parser.add_argument("--object-growth", type=int, default=200, help="allowed growth in live objects of one type")
+    parser.add_argument("--drift", type=float, default=0.25, help="allowed relative tick-time increase")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    report = soak(args.minutes, args.reset_every, args.samples, args.draw_every, args.seed,
+                  trace=not args.no_tracemalloc, strategy=args.strategy)
+    print(f"{args.minutes:.0f} simulated minutes in {report['wall_seconds']:.0f} s")
+    if report["top_growth"]:
+        print("largest heap growth since the first sample:")
+        for stat in report["top_growth"][:5]:
+            print("  ", stat)
+    failures = check(report, args.leak_kb, args.object_growth, args.drift)
+    for failure in failures:
+        print("FAIL:", failure)
+    if failures:
+        raise SystemExit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+import argparse
+import importlib
+import os
+import random
+import statistics
+import time
+from pathlib import Path
+
+import pygame as pg
+
+try:
+    import numpy as np
+except ImportError:  # optional: frame arrays and max channel deltas need it
+    np = None
+
+from ..config import BG, WIDTH, HEIGHT
+
+# Scenarios: a function preparing a fresh, seeded Game for one frame. Drawing
+# only depends on the game state, so each scenario gives the same pixels on
+# every run and machine (up to font rendering).
+
+
+def _play(game, ticks, layout=0, zombies_every=0):
+    from ..sim.autoplay import LAYOUTS, LayoutPlayer
+    from ..sim.lanes import SPAWN_TYPES
+
+    player = LayoutPlayer(random.Random(1), LAYOUTS[layout])
+    for tick in range(ticks):
+        player.tick(game)
+        game.update(1 / 60)
+        if zombies_every and tick % zombies_every == 0:
+            game.zombies.append(random.choice(SPAWN_TYPES)(random.randrange(5)))
+
+
+def _opening(game):
+    _play(game, 600)
+
+
+def _siege(game):
+    _play(game, 1500, layout=1, zombies_every=20)
+
+
+def _hurt(game):
+    _play(game, 600, layout=2)
+    for i, plant in enumerate(game.plants):
+        plant.hurt_timer = 0.25 * (i % 5) / 4
+
+
+def _low_detail(game):
+    _play(game, 600)
+    game.settings.update(particles=False, fancy_vfx=False)
+
+
+def _drag(game):
+    _play(game, 300)
+    card = game.cards[1]
+    card.cooldown = 0
+    game.handle_event(pg.event.Event(pg.MOUSEBUTTONDOWN, pos=card.rect.center, button=1))
+    game.handle_event(pg.event.Event(pg.MOUSEMOTION, pos=game.tiles[4 * 9 + 8].rect.center, rel=(0, 0),
+                                     buttons=(1, 0, 0)))
+
+
+def _game_over(game):
+    _play(game, 900, zombies_every=10)
+    game.game_over = True
+
+
+SCENARIOS = {
+    "empty": lambda game: None,
+    "opening": _opening,
+    "siege": _siege,
+    "hurt": _hurt,
+    "low_detail": _low_detail,
+    "drag": _drag,
+    "game_over": _game_over,
+}
+
+
+def scenario_game(name: str, seed: int = 1):
+    from ..game import Game
+
+    random.seed(seed)
+    game = Game()
+    SCENARIOS[name](game)
+    return game
+
+
+# Renderers: a factory taking a Game and returning draw(surf) for one full
+# frame. "reference" is the plain per-entity draw code (Tile, Plant,
+# ZombieBase, Bullet, particles, then the UI); a faster renderer is checked
+# against it pixel for pixel and timed side by side.
+
+def reference(game):
+    def draw(surf):
+        surf.fill(BG)
+        for t in game.tiles:
+            t.draw(surf)
+        for p in game.plants:
+            p.draw(surf)
+        fancy_vfx = game.settings.get('fancy_vfx', True)
+        for b in game.bullets:
+            b.draw(surf, fancy_vfx=fancy_vfx)
+        for z in game.zombies:
+            z.draw(surf)
+        if game.settings.get('particles', True):
+            for p in game.particles:
+                p.draw(surf)
+        game.draw_ui(surf)
+    return draw
+
+
+def game_renderer(game):
+    """What the window shows: Game.render_frame at the game's current settings."""
+    return game.render_frame
+
+
+RENDERERS = {"reference": reference, "game": game_renderer}
+
+
+def resolve_renderer(name: str):
+    if name in RENDERERS:
+        return RENDERERS[name]
+    module, _, attr = name.partition(":")
+    if not attr:
+        raise ValueError(f"unknown renderer {name!r}; use one of {', '.join(RENDERERS)} or module:factory")
+    return getattr(importlib.import_module(module), attr)
+
+
+def offscreen_surface() -> pg.Surface:
+    """A window-sized target in the display's pixel format; no window needs to be shown."""
+    surf = pg.Surface((WIDTH, HEIGHT))
+    return surf.convert() if pg.display.get_surface() is not None else surf
+
+
+def frame_array(surf: pg.Surface):
+    """The frame's pixels as a (width, height, 3) NumPy view, without copying.
+
+    The surface stays locked while the array is alive; drop it before drawing
+    or blitting again.
+    """
+    return pg.surfarray.pixels3d(surf)
+
+
+def time_draw(draw, surf, repeats: int = 50) -> float:
+    """Median milliseconds per call of draw(surf) over `repeats` calls, after one warm-up call."""
+    draw(surf)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        draw(surf)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000.0
+
+
+class ImageDiff:
+    def __init__(self, pixels, total, max_delta=None, bounds=None):
+        self.pixels = pixels  # pixels with a channel differing by more than the tolerance
+        self.total = total
+        self.max_delta = max_delta  # largest channel difference, if NumPy was available
+        self.bounds = bounds  # pg.Rect around the differing pixels
+
+    @property
+    def fraction(self) -> float:
+        return self.pixels / self.total
+
+    def __str__(self):
+        if not self.pixels:
+            return "identical" if not self.max_delta else f"within tolerance (max delta {self.max_delta})"
+        text = f"{self.pixels} pixels differ ({self.fraction:.3%})"
+        if self.max_delta is not None:
+            text += f", max delta {self.max_delta}"
+        if self.bounds is not None:
+            text += f", in {tuple(self.bounds)}"
+        return text
+
+
+def compare(a: pg.Surface, b: pg.Surface, tolerance: int = 0, diff_out: pg.Surface | None = None) -> ImageDiff:
+    """Pixels of two same-sized frames whose R, G or B differ by more than `tolerance`.
+
+    `diff_out`, if given, gets those pixels painted magenta.
+    """
+    if a.get_size() != b.get_size():
+        raise ValueError(f"frame sizes differ: {a.get_size()} != {b.get_size()}")
+    if b.get_bitsize() != a.get_bitsize() or b.get_masks() != a.get_masks():
+        converted = pg.Surface(a.get_size(), 0, a)
+        converted.blit(b, (0, 0))
+        b = converted
+    total = a.get_width() * a.get_height()
+    max_delta = None
+    if np is not None:
+        delta = np.abs(frame_array(a).astype(np.int16) - frame_array(b)).max(axis=2)
+        max_delta = int(delta.max())
+        over = delta > tolerance
+        pixels = int(over.sum())
+        bounds = None
+        if pixels:
+            xs, ys = np.nonzero(over)
+            bounds = pg.Rect(int(xs.min()), int(ys.min()), int(xs.max() - xs.min()) + 1, int(ys.max() - ys.min()) + 1)
+        del delta, over
+    else:
+        within = pg.transform.threshold(None, a, None, (tolerance, tolerance, tolerance, 255), set_behavior=0,
+                                         search_surf=b)
+        pixels = total - within
+        bounds = None
+    if diff_out is not None and pixels:
+        pg.transform.threshold(diff_out, a, None, (tolerance, tolerance, tolerance, 255), (255, 0, 255),
+                               set_behavior=1, search_surf=b)
+    return ImageDiff(pixels, total, max_delta, bounds)
+
+
+def check(candidate, against=reference, scenarios=tuple(SCENARIOS), seed: int = 1, repeats: int = 50,
+          goldens: Path | None = None, record: bool = False, tolerance: int = 2):
+    """Yields (scenario, pixel diff to `against`, golden diff or None, candidate ms, against ms) per scenario.
+
+    The candidate's frame is compared with `against` exactly; with `goldens`
+    it is also compared with (or, with `record`, saved as) <scenario>.png
+    there, within `tolerance`.
+    """
+    for name in scenarios:
+        game = scenario_game(name, seed)
+        expected, actual = offscreen_surface(), offscreen_surface()
+        draw_expected, draw_actual = against(game), candidate(game)
+        draw_expected(expected)
+        draw_actual(actual)
+        diff = compare(expected, actual)
+        golden_diff = None
+        if goldens is not None:
+            path = goldens / f"{name}.png"
+            if record:
+                goldens.mkdir(parents=True, exist_ok=True)
+                pg.image.save(actual, path)
+            else:
+                marked = actual.copy()
+                golden_diff = compare(pg.image.load(path), actual, tolerance, marked)
+                if golden_diff.pixels:
+                    pg.image.save(marked, goldens / f"{name}.diff.png")
+        ms = time_draw(draw_actual, actual, repeats)
+        against_ms = time_draw(draw_expected, expected, repeats)
+        if game.snd:
+            game.snd.close()
+        yield name, diff, golden_diff, ms, against_ms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="plants_of_hell.render.capture",
+                                     description="Render scenario frames offscreen, check a renderer against the "
+                                                 "reference draw code (and golden images) and time both")
+    parser.add_argument("renderer", nargs="?", default="game",
+                        help=f"renderer to check: {', '.join(RENDERERS)} or module:factory (default: game)")
+    parser.add_argument("--against", default="reference", help="renderer giving the expected pixels")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to render (repeatable; default: all)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=50, help="timed draws per scenario and renderer")
+    parser.add_argument("--goldens", type=Path, default=None, help="directory of golden <scenario>.png images")
+    parser.add_argument("--record", action="store_true", help="write the frames as the new goldens")
+    parser.add_argument("--tolerance", type=int, default=2,
+                        help="per-channel difference still matching a golden image (default: 2)")
+    parser.add_argument("--max-diff", type=float, default=0.001,
+                        help="fraction of pixels allowed outside the tolerance of a golden (default: 0.001)")
+    parser.add_argument("--min-speedup", type=float, default=None,
+                        help="fail unless every scenario draws at least this many times faster than --against")
+    args = parser.parse_args(argv)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    if args.record and args.goldens is None:
+        parser.error("--record needs --goldens")
+
+    candidate, against = resolve_renderer(args.renderer), resolve_renderer(args.against)
+    failed = False
+    for name, diff, golden_diff, ms, against_ms in check(
+            candidate, against, args.scenario or tuple(SCENARIOS), args.seed, args.repeats,
+            args.goldens, args.record, args.tolerance):
+        speedup = against_ms / ms if ms > 0 else float("inf")
+        line = f"{name}: {ms:.3f} ms vs {against_ms:.3f} ms ({speedup:.2f}x), {args.against}: {diff}"
+        if golden_diff is not None:
+            line += f", golden: {golden_diff}"
+        print(line)
+        if diff.pixels or (golden_diff is not None and golden_diff.fraction > args.max_diff):
+            failed = True
+        if args.min_speedup is not None and speedup < args.min_speedup:
+            print(f"  FAIL: {speedup:.2f}x is below --min-speedup {args.min_speedup}")
+            failed = True
+    if args.record:
+        print(f"goldens written to {args.goldens}")
+    if failed:
+        raise SystemExit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import pygame as pg
+
+from ..entities.bullet import Bullet
+from ..entities.zombie import ZombieBase
+
+# Margin around the entity rect so sway/bob and the pea trail stay inside the frame.
+ZOMBIE_PAD = 12
+BULLET_PAD = 16
+
+
+def zombie_frame_surface(z, offsets) -> pg.Surface:
+    s = pg.Surface((z.width + ZOMBIE_PAD * 2, z.height + ZOMBIE_PAD * 2), pg.SRCALPHA)
+    r = pg.Rect(ZOMBIE_PAD, ZOMBIE_PAD, z.width, z.height)
+    ZombieBase.draw_figure(s, r, z.color, z.eating, offsets)
+    return s
+
+
+def zombie_frame_key(z, offsets):
+    return (z.width, z.height, z.color, z.eating, offsets)
+
+
+def bullet_frame_surface(color, radius, fancy_vfx) -> pg.Surface:
+    size = BULLET_PAD * 2 + radius * 2
+    s = pg.Surface((size, size), pg.SRCALPHA)
+    c = BULLET_PAD + radius
+    Bullet.draw_at(s, c, c, color, radius, fancy_vfx)
+    return s
+
+
+def circle_surface(radius, color=(255, 255, 255)) -> pg.Surface:
+    s = pg.Surface((radius * 2, radius * 2), pg.SRCALPHA)
+    pg.draw.circle(s, color, (radius, radius), radius)
+    return s
@@ -0,0 +1,105 @@
+import pygame as pg
+
+from ..config import BG, ZOMBIE_HP, RED, clamp
+from ..entities.plants import BODY_COLORS, HP_BAR_FILL, get_hp_bar, get_hurt_sprite, get_scaled_sprite, hurt_step
+from .surface_cache import SURFACES
+from .frames import ZOMBIE_PAD, BULLET_PAD, zombie_frame_surface, zombie_frame_key, bullet_frame_surface, circle_surface
+
+class ScaledSceneRenderer:
+    """Draws the board into an offscreen surface at a fraction of the window size.
+
+    Everything is drawn from pre-scaled sprites and pre-rendered frames, so the
+    per-pixel cost shrinks with the square of the scale. The caller upscales the
+    result to the window and draws the UI on top at native resolution.
+    """
+
+    def __init__(self, size, scale: float):
+        self.scale = scale
+        self.size = (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+        self.surface = pg.Surface(self.size)
+
+    def _s(self, v) -> int:
+        return round(v * self.scale)
+
+    def _srect(self, x, y, w, h) -> pg.Rect:
+        return pg.Rect(self._s(x), self._s(y), max(1, self._s(w)), max(1, self._s(h)))
+
+    def _scaled(self, surface):
+        w, h = surface.get_size()
+        return pg.transform.smoothscale(surface, (max(1, self._s(w)), max(1, self._s(h))))
+
+    def _background_surface(self, game):
+        def build():
+            native = pg.Surface((round(self.size[0] / self.scale), round(self.size[1] / self.scale)))
+            native.fill(BG)
+            for t in game.tiles:
+                t.draw(native)
+            return pg.transform.smoothscale(native, self.size)
+        return SURFACES.get("board", build, variant=self.size, scale=self.scale)
+
+    def _zombie_frame(self, z, offsets):
+        return SURFACES.get("zombie", lambda: self._scaled(zombie_frame_surface(z, offsets)),
+                            variant=zombie_frame_key(z, offsets), scale=self.scale)
+
+    def _bullet_frame(self, b, fancy_vfx):
+        return SURFACES.get("pea", lambda: self._scaled(bullet_frame_surface(b.color, b.radius, fancy_vfx)),
+                            variant=(b.radius, fancy_vfx), scale=self.scale, tint=b.color)
+
+    def _circle(self, radius, color):
+        radius = max(1, self._s(radius))
+        # set_alpha is applied to the shared surface right before each blit
+        return SURFACES.get("circle", lambda: circle_surface(radius, color), variant=radius, tint=color), radius
+
+    def _bar(self, surf, x, y, w, fill_w, color):
+        filled = max(1, self._s(fill_w)) if fill_w > 0 else 0
+        bar = get_hp_bar(max(1, self._s(w)), filled, color, max(1, self._s(6)), max(1, self._s(3)))
+        surf.blit(bar, (self._s(x), self._s(y)))
+
+    def _draw_plant(self, surf, p):
+        r = p.cell
+        inner = p.body
+        sprite, offset = p.sprite_pose()
+        if sprite is None:
+            sprite = p.preview_surface() if not p.use_base_body else None
+        step = hurt_step(p.hurt_timer)
+        if sprite is not None:
+            scaled = get_scaled_sprite(get_hurt_sprite(sprite, step), self.scale)
+            dest = scaled.get_rect()
+            dest.midbottom = (self._s(r.centerx + offset[0]), self._s(r.bottom + offset[1]))
+            surf.blit(scaled, dest)
+        else:
+            pg.draw.rect(surf, BODY_COLORS[step], self._srect(*inner), border_radius=self._s(10))
+        if p.muzzle_timer > 0:
+            outer_r, outer_col, inner_r, inner_col = p.muzzle_style
+            for x, y in p.muzzle_points():
+                for radius, col in ((outer_r, outer_col), (inner_r, inner_col)):
+                    circle, sr = self._circle(radius, col)
+                    surf.blit(circle, (self._s(x) - sr, self._s(y) - sr))
+        hp_ratio = clamp(p.hp / p.max_hp, 0, 1)
+        self._bar(surf, inner.left, inner.top - 8, inner.width, int(inner.width * hp_ratio), HP_BAR_FILL)
+
+    def draw(self, game, scene=None) -> pg.Surface:
+        if scene is None:
+            scene = game
+        surf = self.surface
+        surf.blit(self._background_surface(game), (0, 0))
+        for p in scene.plants:
+            self._draw_plant(surf, p)
+        fancy = game.settings.get('fancy_vfx', True)
+        for b in scene.bullets:
+            frame = self._bullet_frame(b, fancy)
+            off = BULLET_PAD + b.radius
+            surf.blit(frame, (self._s(int(b.x) - off), self._s(int(b.y) - off)))
+        for z in scene.zombies:
+            r = z.rect()
+            surf.blit(self._zombie_frame(z, z.pose_offsets()), (self._s(r.x - ZOMBIE_PAD), self._s(r.y - ZOMBIE_PAD)))
+            hp_ratio = clamp(z.hp / ZOMBIE_HP, 0, 1)
+            self._bar(surf, r.left, r.top - 10, r.width, int(r.width * hp_ratio), RED)
+        if game.settings.get('particles', True):
+            for p in scene.particles:
+                if p.life <= 0:
+                    continue
+                circle, sr = self._circle(p.radius, p.color)
+                circle.set_alpha(int(255 * clamp(p.life, 0, 1)) if p.fade else 255)
+                surf.blit(circle, (self._s(p.x) - sr, self._s(p.y) - sr))
+        return surf
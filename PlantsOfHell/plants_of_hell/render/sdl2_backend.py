@@ -0,0 +1,166 @@
+import pygame as pg
+
+try:
+    from pygame._sdl2 import video
+except ImportError:  # pygame built without the SDL2 video bindings
+    video = None
+
+from ..config import BG, ZOMBIE_HP, RED, clamp
+from ..entities.plants import HP_BAR_FILL, HURT_TINT_STEPS, get_fallback_art, get_hp_bar, get_plant_body, hurt_step
+from .frames import ZOMBIE_PAD, BULLET_PAD, zombie_frame_surface, zombie_frame_key, bullet_frame_surface, circle_surface
+from .surface_cache import SURFACES, SurfaceCache
+
+
+_BLEND = 1  # SDL_BLENDMODE_BLEND
+
+
+def texture_bytes(texture) -> int:
+    return texture.width * texture.height * 4
+
+
+class TextureRenderer:
+    """Draws the board with SDL2 textures instead of software blits.
+
+    Sprites are uploaded once and reused; zombies, bullets and particles are
+    pre-rendered into small frames keyed by everything that changes their
+    pixels, so a frame is mostly texture copies, and kept in a SurfaceCache
+    with the same budget as the surfaces. The UI (bar, cards, panels) is still
+    drawn by the regular surface code into one layer, redrawn and uploaded only
+    when Game.ui_state() changes.
+    """
+
+    def __init__(self, size, title: str, driver: str | None = None):
+        self.size = size
+        self.window = video.Window(title, size=size)
+        index = -1
+        if driver:
+            names = [d.name for d in video.get_drivers()]
+            if driver not in names:
+                raise RuntimeError(f"unknown render driver {driver!r} (available: {', '.join(names)})")
+            index = names.index(driver)
+        self.renderer = video.Renderer(self.window, index=index, accelerated=0 if driver == "software" else -1)
+        self.textures = SurfaceCache(SURFACES.budget, sizeof=texture_bytes, name="textures")
+        self._background = None
+        self._ui_surface = pg.Surface(size, pg.SRCALPHA)
+        self._ui_texture = video.Texture(self.renderer, size, streaming=True)
+        self._ui_texture.blend_mode = _BLEND
+        self._ui_state = None
+
+    @classmethod
+    def create(cls, size, title: str, driver: str | None = None):
+        if video is None:
+            print("SDL2 renderer unavailable (pygame._sdl2 missing), using surface renderer")
+            return None
+        try:
+            return cls(size, title, driver)
+        except Exception as e:
+            print(f"SDL2 renderer unavailable ({e}), using surface renderer")
+            return None
+
+    # texture caches
+
+    def _upload(self, asset, make_surface, variant=None):
+        return self.textures.get(asset, lambda: video.Texture.from_surface(self.renderer, make_surface()), variant)
+
+    def texture_for(self, surface: pg.Surface):
+        # the key holds the surface, so its texture cannot outlive it
+        return self._upload(surface, lambda: surface)
+
+    def _circle(self, radius: int):
+        return self._upload("circle", lambda: circle_surface(radius), radius)
+
+    def _zombie_frame(self, z, offsets):
+        return self._upload("zombie", lambda: zombie_frame_surface(z, offsets), zombie_frame_key(z, offsets))
+
+    def _bullet_frame(self, b, fancy_vfx):
+        return self._upload("pea", lambda: bullet_frame_surface(b.color, b.radius, fancy_vfx),
+                            (b.color, b.radius, fancy_vfx))
+
+    def _background_texture(self, game):
+        if self._background is None:
+            s = pg.Surface(self.size)
+            s.fill(BG)
+            for t in game.tiles:
+                t.draw(s)
+            self._background = video.Texture.from_surface(self.renderer, s)
+        return self._background
+
+    # drawing
+
+    def _draw_surface(self, surface, x, y):
+        tex = self.texture_for(surface)
+        tex.draw(dstrect=(x, y, tex.width, tex.height))
+
+    def _draw_plant(self, p):
+        # same layers as Plant.draw: sprite or vector fallback, muzzle flash, base body, health bar
+        r = p.cell
+        inner = p.body
+        sprite, offset = p.sprite_pose()
+        step = hurt_step(p.hurt_timer)
+        if sprite is not None:
+            tex = self.texture_for(sprite)
+            dest = sprite.get_rect()
+            dest.midbottom = (r.centerx + offset[0], r.bottom + offset[1])
+            if step:
+                shade = int(255 - 135 * step / HURT_TINT_STEPS)
+                tex.color = (255, shade, shade)
+            tex.draw(dstrect=dest)
+            if step:
+                tex.color = (255, 255, 255)
+        elif not p.use_base_body:
+            self._draw_surface(get_fallback_art(p), r.x, r.y)
+        if p.muzzle_timer > 0:
+            outer_r, outer_col, inner_r, inner_col = p.muzzle_style
+            for pos in p.muzzle_points():
+                self._draw_circle(pos, outer_r, outer_col)
+                self._draw_circle(pos, inner_r, inner_col)
+        if p.use_base_body:
+            self._draw_surface(get_plant_body(inner.size, step), inner.x, inner.y)
+        hp_ratio = clamp(p.hp / p.max_hp, 0, 1)
+        self._draw_surface(get_hp_bar(inner.width, int(inner.width * hp_ratio), HP_BAR_FILL), *p.hp_bar.topleft)
+
+    def _draw_circle(self, pos, radius, color, alpha=255):
+        tex = self._circle(radius)
+        tex.color = color
+        tex.alpha = alpha
+        tex.draw(dstrect=(int(pos[0] - radius), int(pos[1] - radius), radius * 2, radius * 2))
+
+    def _draw_zombie(self, z):
+        r = z.rect()
+        tex = self._zombie_frame(z, z.pose_offsets())
+        tex.draw(dstrect=(r.x - ZOMBIE_PAD, r.y - ZOMBIE_PAD, tex.width, tex.height))
+        hp_ratio = clamp(z.hp / ZOMBIE_HP, 0, 1)
+        self._draw_surface(get_hp_bar(r.width, int(r.width * hp_ratio), RED), r.left, r.top - 10)
+
+    def draw(self, game, scene=None):
+        if scene is None:
+            scene = game
+        renderer = self.renderer
+        renderer.draw_color = (0, 0, 0, 255)
+        renderer.clear()
+        self._background_texture(game).draw()
+        for p in scene.plants:
+            self._draw_plant(p)
+        fancy = game.settings.get('fancy_vfx', True)
+        for b in scene.bullets:
+            tex = self._bullet_frame(b, fancy)
+            off = BULLET_PAD + b.radius
+            tex.draw(dstrect=(int(b.x) - off, int(b.y) - off, tex.width, tex.height))
+        for z in scene.zombies:
+            self._draw_zombie(z)
+        if game.settings.get('particles', True):
+            for p in scene.particles:
+                if p.life <= 0:
+                    continue
+                alpha = int(255 * clamp(p.life, 0, 1)) if p.fade else 255
+                self._draw_circle((p.x, p.y), p.radius, p.color, alpha)
+
+        state = game.ui_state()
+        if state is None or state != self._ui_state:
+            ui = self._ui_surface
+            ui.fill((0, 0, 0, 0))
+            game.draw_ui(ui)
+            self._ui_texture.update(ui)
+            self._ui_state = state
+        self._ui_texture.draw()
+        renderer.present()
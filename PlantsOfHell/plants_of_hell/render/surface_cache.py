@@ -0,0 +1,154 @@
+from collections import OrderedDict
+
+import pygame as pg
+
+from ..config import SURFACE_CACHE_MB
+
+
+def surface_bytes(value) -> int:
+    """Pixel memory of a cached value: a Surface, a tuple of them, or None."""
+    if value is None:
+        return 0
+    if isinstance(value, tuple):
+        return sum(surface_bytes(v) for v in value)
+    return value.get_pitch() * value.get_height()
+
+
+def _members(key, value):
+    """(surface, key) pairs of a cached value; frame i of a tuple has variant (variant, i)."""
+    if isinstance(value, tuple):
+        asset, variant, scale, tint = key
+        return [(v, (asset, (variant, i), scale, tint)) for i, v in enumerate(value) if v is not None]
+    return [(value, key)] if value is not None else []
+
+
+class SurfaceCache:
+    """The one cache all art goes through, keyed by (asset, variant, scale, tint).
+
+    `asset` names the source art (a string, or a Surface that was not loaded
+    through the cache); `variant` picks a frame, pose or size; `scale` is the
+    render scale and `tint` a color or tint step. Pinned entries (the loaded
+    plant art, held by live plants anyway) are never evicted; everything else
+    is derived from them on demand and evicted least recently used first
+    whenever the resident bytes exceed the budget. A value too big to fit
+    beside the pinned entries is returned without being cached.
+    """
+
+    def __init__(self, budget_bytes: int, sizeof=surface_bytes, name: str = "surfaces"):
+        self.budget = budget_bytes
+        self.name = name
+        self.sizeof = sizeof
+        self._entries = OrderedDict()  # key -> (value, bytes, False), least recently used first
+        self._pinned = {}  # key -> (value, bytes, True)
+        self._keys = {}  # id(surface) -> key, for surfaces stored under a key
+        self.bytes = 0
+        self.pinned_bytes = 0
+        self.peak_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.oversized = 0
+
+    def __len__(self):
+        return len(self._entries) + len(self._pinned)
+
+    def get(self, asset, build, variant=None, scale: float = 1.0, tint=None, pin: bool = False):
+        """The cached value for the key, calling build() to make it on a miss."""
+        key = (asset, variant, scale, tint)
+        entry = self._pinned.get(key) or self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            if not entry[2]:
+                self._entries.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        value = build()
+        self._store(key, value, pin)
+        return value
+
+    def key_of(self, surface: pg.Surface):
+        """The key `surface` is cached under; surfaces from elsewhere become their own asset."""
+        return self._keys.get(id(surface)) or (surface, None, 1.0, None)
+
+    def derive(self, surface: pg.Surface, build, scale: float | None = None, tint=None):
+        """A variant of `surface` at another scale or tint, cached next to it."""
+        asset, variant, base_scale, base_tint = self.key_of(surface)
+        return self.get(asset, build, variant, base_scale if scale is None else scale,
+                        base_tint if tint is None else tint)
+
+    def fits(self, size: int) -> bool:
+        """Whether a derived value of `size` bytes would stay cached."""
+        return size <= self.budget - self.pinned_bytes
+
+    def _store(self, key, value, pin):
+        size = self.sizeof(value)
+        if not pin and not self.fits(size):
+            # it would push out everything else and then itself on the next miss
+            self.oversized += 1
+            return
+        (self._pinned if pin else self._entries)[key] = (value, size, pin)
+        for surface, member in _members(key, value):
+            # a variant that is its source unchanged keeps the source's key
+            self._keys.setdefault(id(surface), member)
+        self.bytes += size
+        if pin:
+            self.pinned_bytes += size
+        self.peak_bytes = max(self.peak_bytes, self.bytes)
+        self._evict(keep=key)
+
+    def _evict(self, keep=None):
+        entries = self._entries
+        while self.bytes > self.budget and entries:
+            key = next(iter(entries))
+            if key == keep:
+                break
+            self._drop(key)
+            self.evictions += 1
+
+    def _drop(self, key):
+        value, size, pinned = (self._pinned if key in self._pinned else self._entries).pop(key)
+        for surface, member in _members(key, value):
+            if self._keys.get(id(surface)) == member:
+                del self._keys[id(surface)]
+        self.bytes -= size
+        if pinned:
+            self.pinned_bytes -= size
+
+    def set_budget(self, budget_bytes: int):
+        self.budget = budget_bytes
+        self._evict()
+
+    def clear(self, pinned: bool = False):
+        """Drop every derived surface, and the pinned ones too if `pinned`."""
+        for key in list(self._entries) + (list(self._pinned) if pinned else []):
+            self._drop(key)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "bytes": self.bytes,
+            "pinned_bytes": self.pinned_bytes,
+            "peak_bytes": self.peak_bytes,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "oversized": self.oversized,
+            "hit_rate": self.hits / lookups if lookups else 1.0,
+        }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (f"{self.name} {s['bytes'] / 2**20:.1f}/{s['budget'] / 2**20:g} MB "
+                f"({s['pinned_bytes'] / 2**20:.1f} pinned, {s['entries']} entries), "
+                f"hit rate {s['hit_rate']:.1%}, {s['misses']} misses, {s['evictions']} evicted"
+                + (f", {s['oversized']} too big to cache" if s['oversized'] else ""))
+
+
+SURFACES = SurfaceCache(SURFACE_CACHE_MB * 2**20)
+
+
+def get_text(font: pg.font.Font, text: str, color) -> pg.Surface:
+    """An antialiased label, rendered once per font, text and color."""
+    return SURFACES.get(font, lambda: font.render(text, True, color), variant=text, tint=color)
@@ -0,0 +1,104 @@
+import argparse
+import os
+import random
+import sys
+
+import pygame as pg
+
+# Rect-returning calls visible to a profile hook; constructing pg.Rect directly
+# is counted by temporarily swapping pygame.Rect for a counting factory.
+RECT_METHODS = frozenset({
+    "inflate", "copy", "move", "clip", "union", "unionall", "fit", "clamp", "get_rect", "get_bounding_rect",
+})
+
+
+class RectCounter:
+    """Counts Rect allocations made inside a `with` block on this thread."""
+
+    def __init__(self):
+        self.count = 0
+        self._rect = pg.Rect
+
+    def _construct(self, *args):
+        self.count += 1
+        return self._rect(*args)
+
+    def _profile(self, frame, event, arg):
+        if event == "c_call" and arg.__name__ in RECT_METHODS:
+            self.count += 1
+
+    def __enter__(self):
+        pg.Rect = self._construct
+        sys.setprofile(self._profile)
+        return self
+
+    def __exit__(self, *exc):
+        sys.setprofile(None)
+        pg.Rect = self._rect
+
+
+def _busy_game(seed):
+    from ..game import Game
+    from ..entities.plants import Peashooter, Repeater, SnowPea, Wallnut
+
+    random.seed(seed)
+    game = Game()
+    kinds = (Peashooter, Repeater, SnowPea, Wallnut)
+    for row in range(5):
+        for col, kind in ((0, kinds[row % 4]), (1, kinds[(row + 1) % 4]), (2, Peashooter), (5, Wallnut)):
+            game.place_plant(game.tiles[row * 9 + col], lambda r, c, k=kind: k(r, c))
+    return game
+
+
+def measure(ticks: int = 600, warmup: int = 600, seed: int = 1):
+    """Rect allocations per update tick and per drawn frame on a busy board."""
+    game = _busy_game(seed)
+    dt = 1 / 60
+    for _ in range(warmup):
+        game.update(dt)
+        if game.game_over:
+            game.reset()
+
+    update_rects = draw_rects = 0
+    entities = 0
+    for _ in range(ticks):
+        with RectCounter() as counter:
+            game.update(dt)
+        update_rects += counter.count
+        with RectCounter() as counter:
+            game.draw_scene(game.screen)
+        draw_rects += counter.count
+        entities += len(game.plants) + len(game.zombies) + len(game.bullets)
+        if game.game_over:
+            game.reset()
+    if game.snd:
+        game.snd.close()
+    return {
+        "ticks": ticks,
+        "entities_per_tick": entities / ticks,
+        "update_rects_per_tick": update_rects / ticks,
+        "draw_rects_per_frame": draw_rects / ticks,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="plants_of_hell.sim.alloc_check",
+                                     description="Fail if a simulation tick allocates more Rects than the budget")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="allowed Rect allocations per update tick (new entities allocate their own rect once)")
+    args = parser.parse_args(argv)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    result = measure(args.ticks, seed=args.seed)
+    for key, value in result.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+    if result["update_rects_per_tick"] > args.budget:
+        print(f"FAIL: {result['update_rects_per_tick']:.2f} Rects per tick exceeds budget {args.budget}")
+        raise SystemExit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
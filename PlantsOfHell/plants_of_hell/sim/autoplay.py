@@ -0,0 +1,215 @@
+import argparse
+import os
+import random
+
+import pygame as pg
+
+from ..config import COLS, ROWS, GRID_LEFT, TILE_W
+
+# Scripted layouts as (row, col, card index), card order as in Game.cards:
+# Peashooter, Repeater, Snow Pea, Wall-nut.
+LAYOUTS = (
+    tuple((r, c, k) for r in range(5) for c, k in ((0, 0), (1, 1), (4, 3))),
+    tuple((r, c, k) for r in range(5) for c, k in ((0, 2), (1, 0), (2, 0), (6, 3))),
+    tuple((r, 0, r % 3) for r in range(5)),
+)
+PEASHOOTER, REPEATER, SNOW_PEA, WALLNUT = range(4)
+
+
+class Autoplayer:
+    """Plays the game through its input handlers, like a player with a mouse.
+
+    Subclasses implement `moves`, yielding (card index, tile) pairs; each move
+    is a drag from the card to the tile sent through Game.handle_event, so it
+    goes through handle_mouse_down / handle_mouse_up / place_plant and the
+    card cooldowns exactly as a real drag would. The player thinks every
+    `think_ticks` simulation ticks and restarts with R after a game over.
+    """
+
+    name = None
+    think_ticks = 15
+    moves_per_think = 1
+
+    def __init__(self, rng: random.Random | None = None):
+        self.rng = rng or random.Random()
+        self.placed = 0
+        self.restarts = 0
+        self._last_think = None
+
+    def moves(self, game):
+        return ()
+
+    def tick(self, game):
+        """Call once per frame (or tick) with input handling; acts when a think is due."""
+        if game.settings_panel.open:
+            return
+        if game.game_over:
+            game.handle_event(pg.event.Event(pg.KEYDOWN, key=pg.K_r, mod=0, unicode="r"))
+            self.restarts += 1
+            self._last_think = None
+            return
+        ticks = game.counters.ticks
+        if self._last_think is not None and ticks - self._last_think < self.think_ticks:
+            return
+        self._last_think = ticks
+        self.think(game)
+
+    def think(self, game):
+        done = 0
+        for card_index, tile in self.moves(game):
+            if done == self.moves_per_think:
+                break
+            if self.drag(game, game.cards[card_index], tile):
+                done += 1
+
+    def drag(self, game, card, tile) -> bool:
+        if tile.plant is not None or not card.can_pick():
+            return False
+        post = game.handle_event
+        post(pg.event.Event(pg.MOUSEBUTTONDOWN, pos=card.rect.center, button=1))
+        post(pg.event.Event(pg.MOUSEMOTION, pos=tile.rect.center, rel=(0, 0), buttons=(1, 0, 0)))
+        post(pg.event.Event(pg.MOUSEBUTTONUP, pos=tile.rect.center, button=1))
+        if tile.plant is None:
+            return False
+        self.placed += 1
+        return True
+
+
+class RandomPlayer(Autoplayer):
+    """Drops a random ready plant on a random free tile now and then."""
+
+    name = "random"
+    think_ticks = 30
+
+    def moves(self, game):
+        if self.rng.random() < 0.5:
+            return
+        ready = [i for i, c in enumerate(game.cards) if c.can_pick()]
+        free = [t for t in game.tiles if t.plant is None]
+        if ready and free:
+            yield self.rng.choice(ready), self.rng.choice(free)
+
+
+class LayoutPlayer(Autoplayer):
+    """Keeps a fixed layout planted, replacing plants as they are eaten."""
+
+    name = "layout"
+    moves_per_think = len(LAYOUTS[0])
+
+    def __init__(self, rng=None, layout=LAYOUTS[0]):
+        super().__init__(rng)
+        self.layout = layout
+
+    def moves(self, game):
+        for row, col, card_index in self.layout:
+            yield card_index, game.tiles[row * COLS + col]
+
+
+class GreedyDefender(Autoplayer):
+    """Reinforces whichever lane is under the most pressure.
+
+    Pressure is zombie HP weighted by how close each zombie is, minus the
+    firepower already in the lane. The front zombie gets a Wall-nut right in
+    its path unless the lane already has one, and the lane gets another
+    shooter as far back as possible, a Snow Pea when a tank is coming. Like a
+    busy player it only reacts once a zombie is within `alert_tiles` of the
+    house, so lanes fill up gradually and zombies do reach (and eat) plants.
+    """
+
+    name = "greedy"
+    # rough damage per second of each card's plant; Wall-nuts shoot nothing
+    FIREPOWER = (17, 34, 14, 0)
+    max_per_lane = 5
+    alert_tiles = 4
+
+    def moves(self, game):
+        pressure = [0.0] * ROWS
+        front = [None] * ROWS
+        tank = [False] * ROWS
+        for z in game.zombies:
+            tiles_away = max(0.5, (z.x - GRID_LEFT) / TILE_W)
+            pressure[z.row] += z.hp / tiles_away
+            if front[z.row] is None or z.x < front[z.row].x:
+                front[z.row] = z
+            tank[z.row] |= type(z).__name__ == "TankZombie"
+        lanes = [[] for _ in range(ROWS)]
+        for p in game.plants:
+            lanes[p.row].append(p)
+        for row in range(ROWS):
+            pressure[row] -= 4 * sum(self.FIREPOWER[self._card_of(p)] for p in lanes[row])
+
+        for row in sorted(range(ROWS), key=lambda r: -pressure[r]):
+            if pressure[row] <= 0 or front[row] is None or len(lanes[row]) >= self.max_per_lane:
+                continue
+            if front[row].x - GRID_LEFT > self.alert_tiles * TILE_W:
+                continue
+            tiles = game.tiles[row * COLS:(row + 1) * COLS]
+            zombie_col = int((front[row].x - GRID_LEFT) // TILE_W)
+            if 0 < zombie_col <= COLS and not any(type(p).__name__ == "Wallnut" for p in lanes[row]):
+                yield WALLNUT, tiles[zombie_col - 1]
+            shooters = (SNOW_PEA, REPEATER, PEASHOOTER) if tank[row] else (REPEATER, SNOW_PEA, PEASHOOTER)
+            free = [t for t in tiles[:max(1, min(zombie_col, COLS))] if t.plant is None]
+            if free:
+                for card_index in shooters:
+                    yield card_index, free[0]
+
+    @staticmethod
+    def _card_of(plant):
+        return {"Peashooter": PEASHOOTER, "Repeater": REPEATER, "SnowPea": SNOW_PEA}.get(
+            type(plant).__name__, WALLNUT)
+
+
+STRATEGIES = {cls.name: cls for cls in (GreedyDefender, RandomPlayer, LayoutPlayer)}
+
+
+def make_player(strategy: str, seed: int | None = None) -> Autoplayer:
+    try:
+        cls = STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"unknown autoplayer {strategy!r}; choose from {', '.join(STRATEGIES)}") from None
+    return cls(random.Random(seed))
+
+
+def play(game, player, ticks: int, dt: float = 1 / 60, draw_every: int = 0):
+    """Drive `game` headless for `ticks` ticks with `player` at the controls."""
+    for tick in range(ticks):
+        player.tick(game)
+        game.update(dt)
+        if draw_every and tick % draw_every == 0:
+            game.draw()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="plants_of_hell.sim.autoplay",
+                                     description="Let an autoplayer play headless and report what happened")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="greedy")
+    parser.add_argument("--minutes", type=float, default=5.0, help="simulated minutes to play")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--draw-every", type=int, default=0, help="draw every Nth tick (0: never)")
+    args = parser.parse_args(argv)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from ..game import Game
+
+    random.seed(args.seed)
+    game = Game()
+    player = make_player(args.strategy, args.seed)
+    eaten = [0]
+    plant_removed = game.plant_removed
+
+    def count_removed(plant):
+        eaten[0] += 1
+        plant_removed(plant)
+    game.plant_removed = count_removed
+
+    ticks = int(args.minutes * 60 * 60)
+    play(game, player, ticks, draw_every=args.draw_every)
+    c = game.counters
+    print(f"{args.strategy}: {args.minutes:g} simulated minutes, {player.placed} plants placed, {eaten[0]} eaten, "
+          f"{c.spawns} zombies spawned, {c.hits} hits, {player.restarts} restarts")
+    if game.snd:
+        game.snd.close()
+
+
+if __name__ == "__main__":
+    main()
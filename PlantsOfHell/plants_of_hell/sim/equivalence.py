@@ -0,0 +1,211 @@
+import argparse
+import hashlib
+import importlib
+import os
+import random
+
+from .autoplay import LAYOUTS, LayoutPlayer, STRATEGIES, make_player
+from . import savestate
+
+# Gameplay state compared every tick. Cosmetic fields (animation phase, recoil
+# and muzzle timers, colors) are left out so an engine may skip them while not
+# drawing; entity ids are process-unique and never match between two games.
+PLANT_FIELDS = ("row", "col", "hp", "max_hp", "hurt_timer", "zombified", "cooldown",
+                "pending_shot", "shot_delay", "burst_shots", "burst_delay")
+ZOMBIE_FIELDS = ("row", "x", "y", "hp", "speed_base", "slow_timer", "slow_mult", "eating", "bite_timer")
+BULLET_FIELDS = ("x", "y", "vx", "radius", "damage", "slow", "slow_time")
+
+_MISSING = "-"
+
+
+def canonical_state(game, digits: int | None = None):
+    """The board as nested plain tuples, in list order; floats rounded to `digits` if given."""
+    def value(v):
+        # numbers compare as floats: a restored or vectorised engine may hold 100.0
+        # (or a NumPy scalar) where the reference holds 100
+        if v is None or isinstance(v, (bool, str)):
+            return v
+        if type(v).__name__ == "bool_":
+            return bool(v)
+        v = float(v)
+        return round(v, digits) if digits is not None else v
+
+    def record(entity, fields):
+        d = entity.__dict__
+        return (type(entity).__name__,) + tuple(value(d.get(f, _MISSING)) for f in fields)
+
+    zombies = []
+    for z in game.zombies:
+        target = z.target_plant
+        zombies.append(record(z, ZOMBIE_FIELDS) + ((target.row, target.col) if target is not None else None,))
+    return (
+        ("spawn_timer", value(game.spawn_timer)),
+        ("game_over", game.game_over),
+        ("rng", hashlib.blake2b(repr(random.getstate()).encode(), digest_size=8).hexdigest()),
+        ("cards", tuple(value(c.cooldown) for c in game.cards)),
+        ("plants", tuple(record(p, PLANT_FIELDS) for p in game.plants)),
+        ("zombies", tuple(zombies)),
+        ("bullets", tuple(record(b, BULLET_FIELDS) for b in game.bullets)),
+    )
+
+
+def digest(state) -> str:
+    return hashlib.blake2b(repr(state).encode(), digest_size=16).hexdigest()
+
+
+def diff_states(a, b, limit: int = 20):
+    """Human-readable differences between two canonical states, at most `limit` lines."""
+    names = {"plants": ("type",) + PLANT_FIELDS, "zombies": ("type",) + ZOMBIE_FIELDS + ("eating_plant",),
+             "bullets": ("type",) + BULLET_FIELDS}
+    lines = []
+    for (key, va), (_, vb) in zip(a, b):
+        if va == vb:
+            continue
+        if key not in names:
+            lines.append(f"{key}: {va!r} != {vb!r}")
+            continue
+        if len(va) != len(vb):
+            lines.append(f"{key}: {len(va)} != {len(vb)} entities")
+        for i, (ea, eb) in enumerate(zip(va, vb)):
+            for field, fa, fb in zip(names[key], ea, eb):
+                if fa != fb:
+                    lines.append(f"{key}[{i}].{field}: {fa!r} != {fb!r}")
+        for i in range(min(len(va), len(vb)), max(len(va), len(vb))):
+            lines.append(f"{key}[{i}]: only in {'first' if len(va) > len(vb) else 'second'}: "
+                         f"{(va if len(va) > len(vb) else vb)[i]!r}")
+    if len(lines) > limit:
+        lines[limit:] = [f"... {len(lines) - limit} more"]
+    return lines
+
+
+# Engines: a factory taking a Game and returning its step(dt) function.
+# Alternative engines register here (or are named on the command line as
+# module:factory) and are checked against the reference Game.update.
+
+def reference(game):
+    return game.update
+
+
+def roundtrip(game):
+    """Reference ticks with the whole board saved and restored before each one."""
+    def step(dt):
+        savestate.deserialize(game, savestate.serialize(game))
+        game.update(dt)
+    return step
+
+
+def kernel(game):
+    """The NumPy lane kernel (sim/kernel.py) in place of step_lanes."""
+    from .kernel import engine
+    return engine(game)
+
+
+ENGINES = {"reference": reference, "roundtrip": roundtrip, "kernel": kernel}
+
+
+def resolve_engine(name: str):
+    if name in ENGINES:
+        return ENGINES[name]
+    module, _, attr = name.partition(":")
+    if not attr:
+        raise ValueError(f"unknown engine {name!r}; use one of {', '.join(ENGINES)} or module:factory")
+    return getattr(importlib.import_module(module), attr)
+
+
+class _Run:
+    """One game driven by one engine, with its own copy of the global RNG."""
+
+    def __init__(self, factory, seed, strategy):
+        from ..game import Game
+
+        random.seed(seed)
+        self.game = Game()
+        self.step = factory(self.game)
+        self.rng_state = random.getstate()
+        self.player = make_player(strategy, seed)
+        if isinstance(self.player, LayoutPlayer):
+            self.player.layout = LAYOUTS[seed % len(LAYOUTS)]
+
+    def __enter__(self):
+        random.setstate(self.rng_state)
+        return self.game
+
+    def __exit__(self, *exc):
+        self.rng_state = random.getstate()
+
+    def close(self):
+        if self.game.snd:
+            self.game.snd.close()
+
+
+class Divergence:
+    def __init__(self, tick, before, after, lines):
+        self.tick = tick
+        self.before = before  # digest both runs agreed on at the previous tick
+        self.after = after  # (first digest, second digest)
+        self.lines = lines
+
+    def __str__(self):
+        return "\n".join([f"diverged at tick {self.tick} (last agreed digest {self.before})"] +
+                         ["  " + line for line in self.lines])
+
+
+def compare(first, second, ticks: int = 20000, seed: int = 1, dt: float = 1 / 60, strategy: str = "layout",
+            digits: int | None = None):
+    """Step two engines side by side from the same seed, each played by its own copy of an autoplayer.
+
+    Returns None if their canonical states agree after every tick, else the
+    first Divergence.
+    """
+    runs = (_Run(first, seed, strategy), _Run(second, seed, strategy))
+    agreed = None
+    try:
+        for tick in range(ticks):
+            states = []
+            for run in runs:
+                with run as game:
+                    run.player.tick(game)
+                    run.step(dt)
+                    states.append(canonical_state(game, digits))
+            a, b = digest(states[0]), digest(states[1])
+            if a != b:
+                return Divergence(tick, agreed, (a, b), diff_states(*states))
+            agreed = a
+        return None
+    finally:
+        for run in runs:
+            run.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="plants_of_hell.sim.equivalence",
+                                     description="Run an engine against the reference Game.update from the same "
+                                                 "seed and inputs and report the first tick where they diverge")
+    parser.add_argument("engine", help=f"engine to check: {', '.join(ENGINES)} or module:factory")
+    parser.add_argument("--against", default="reference", help="engine to compare with (default: reference)")
+    parser.add_argument("--ticks", type=int, default=20000)
+    parser.add_argument("--seeds", type=int, default=3, help="run seeds 1..N (each uses a different plant layout)")
+    parser.add_argument("--player", choices=sorted(STRATEGIES), default="layout",
+                        help="autoplayer providing the inputs (default: a fixed layout per seed)")
+    parser.add_argument("--digits", type=int, default=None,
+                        help="round floats to this many decimals before comparing (default: exact)")
+    args = parser.parse_args(argv)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    first, second = resolve_engine(args.against), resolve_engine(args.engine)
+    failed = False
+    for seed in range(1, args.seeds + 1):
+        result = compare(first, second, args.ticks, seed, strategy=args.player, digits=args.digits)
+        if result is None:
+            print(f"seed {seed}: {args.ticks} ticks identical")
+        else:
+            failed = True
+            print(f"seed {seed}: {result}")
+    if failed:
+        raise SystemExit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
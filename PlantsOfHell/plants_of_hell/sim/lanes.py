@@ -0,0 +1,68 @@
+from ..entities.zombie import BasicZombie, FastZombie, TankZombie
+
+# zombie types picked by the spawner and how often
+SPAWN_TYPES = (BasicZombie, FastZombie, TankZombie)
+SPAWN_WEIGHTS = (0.6, 0.25, 0.15)
+
+
+def step_lanes(world, dt):
+    """One tick of plants, bullets and zombies: the lane-local part of Game.update.
+
+    `world` is the Game, or a headless lane group in a shard worker. Nothing
+    here reaches across lanes: bullets hit zombies in their own row and
+    zombies eat plants in theirs. Entity lists are compacted in place (dead
+    entries dropped while iterating) so a tick allocates no list copies.
+    """
+    counters = world.counters
+    # plants
+    plants = world.plants
+    keep = 0
+    for p in plants:
+        p.update(dt, world)
+        p.animate(dt)
+        if p.alive:
+            plants[keep] = p
+            keep += 1
+        else:
+            world.plant_removed(p)
+    del plants[keep:]
+
+    # bullets: move, then hit the first zombie they overlap in their lane
+    bullets = world.bullets
+    zombies = world.zombies
+    particles = world.settings.get('particles', True)
+    snd = world.snd
+    keep = 0
+    for b in bullets:
+        b.update(dt)
+        if not b.alive:
+            continue
+        br = b.rect()
+        row = world.row_for_y(b.y)
+        for z in zombies:
+            if z.row != row:
+                continue
+            if br.colliderect(z.rect()):
+                z.hp -= b.damage
+                counters.hits += 1
+                if b.slow and b.slow_time:
+                    z.apply_slow(b.slow, b.slow_time)
+                if particles:
+                    world.spawn_hit(br.centerx, br.centery)
+                if snd:
+                    snd.play_hit()
+                b.alive = False
+                break
+        if b.alive:
+            bullets[keep] = b
+            keep += 1
+    del bullets[keep:]
+
+    # zombies
+    keep = 0
+    for z in zombies:
+        z.update(dt, world)
+        if z.alive:
+            zombies[keep] = z
+            keep += 1
+    del zombies[keep:]
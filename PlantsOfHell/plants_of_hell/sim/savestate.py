@@ -0,0 +1,218 @@
+import random
+import struct
+from pathlib import Path
+
+from ..config import COLS
+from ..entities.base import Entity
+from ..entities.bullet import Bullet
+from ..entities.plants import Peashooter, Repeater, SnowPea, Wallnut
+from ..entities.zombie import BasicZombie, FastZombie, TankZombie
+
+# Binary board snapshot, little-endian:
+#   header | RNG state | card cooldowns | plants | zombies | bullets
+# Every entity record starts with a one-byte type code (index into the tables
+# below) followed by a fixed struct per type. Particles are cosmetic and not saved.
+
+MAGIC = b"POHS"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sBdBBHHH")  # magic, version, spawn_timer, game_over, cards, plants, zombies, bullets
+_RNG = struct.Struct("<625IBd")  # Mersenne Twister words + index, has_gauss, gauss_next
+_CARD = struct.Struct("<d")
+_TYPE = struct.Struct("<B")
+
+_PLANT_COMMON = ("row", "col", "zombified", "hp", "max_hp", "hurt_timer", "cooldown", "recoil_timer", "muzzle_timer")
+_PLANT_COMMON_FMT = "BB?dddddd"
+_PLANT_TYPES = (
+    (Peashooter, _PLANT_COMMON_FMT + "dI??d",
+     _PLANT_COMMON + ("anim_timer", "anim_index", "anim_playing", "pending_shot", "shot_delay")),
+    (Repeater, _PLANT_COMMON_FMT + "dB", _PLANT_COMMON + ("burst_delay", "burst_shots")),
+    (SnowPea, _PLANT_COMMON_FMT, _PLANT_COMMON),
+    (Wallnut, "BB?dddd", ("row", "col", "zombified", "hp", "max_hp", "hurt_timer", "muzzle_timer")),
+)
+
+# type codes shared by every binary format in sim/
+PLANT_TYPES = tuple(cls for cls, _, _ in _PLANT_TYPES)
+ZOMBIE_TYPES = (BasicZombie, FastZombie, TankZombie)
+
+# row, alive, eating, target plant index (-1 = none), x, y, speed_base, slow_timer, hp,
+# slow_mult, anim_phase, bite_timer, color
+_ZOMBIE = struct.Struct("<B??hddddidddBBB")
+# alive, x, y, vx, radius, damage, color, slow, slow_time
+_BULLET = struct.Struct("<?dddBhBBBdd")
+
+
+def _struct(fmt):
+    return struct.Struct("<" + fmt)
+
+
+_PLANT_STRUCTS = tuple((cls, _struct(fmt), fields) for cls, fmt, fields in _PLANT_TYPES)
+PLANT_CODES = {cls: i for i, cls in enumerate(PLANT_TYPES)}
+ZOMBIE_CODES = {cls: i for i, cls in enumerate(ZOMBIE_TYPES)}
+
+
+def serialize(game) -> bytes:
+    cards = getattr(game, "cards", ())
+    parts = [_HEADER.pack(MAGIC, VERSION, game.spawn_timer, game.game_over,
+                          len(cards), len(game.plants), len(game.zombies), len(game.bullets))]
+    _version, mt, gauss = random.getstate()
+    parts.append(_RNG.pack(*mt, gauss is not None, gauss or 0.0))
+    for c in cards:
+        parts.append(_CARD.pack(c.cooldown))
+
+    plant_index = {}
+    for i, p in enumerate(game.plants):
+        plant_index[id(p)] = i
+        code = PLANT_CODES[p.__class__]
+        _, st, fields = _PLANT_STRUCTS[code]
+        parts.append(_TYPE.pack(code))
+        d = p.__dict__
+        parts.append(st.pack(*[d[f] for f in fields]))
+
+    for z in game.zombies:
+        target = plant_index.get(id(z.target_plant), -1) if z.target_plant is not None else -1
+        r, g, b = z.color
+        parts.append(_TYPE.pack(ZOMBIE_CODES[z.__class__]))
+        parts.append(_ZOMBIE.pack(z.row, z.alive, z.eating, target, z.x, z.y, z.speed_base, z.slow_timer,
+                                  z.hp, z.slow_mult, z.anim_phase, z.bite_timer, r, g, b))
+
+    for bl in game.bullets:
+        r, g, b = bl.color
+        parts.append(_BULLET.pack(bl.alive, bl.x, bl.y, bl.vx, bl.radius, bl.damage, r, g, b, bl.slow, bl.slow_time))
+    return b"".join(parts)
+
+
+def deserialize(game, data: bytes):
+    """Replace the board in `game` with the state stored in `data`.
+
+    The whole snapshot is parsed before the board is touched, so a truncated or
+    corrupt one raises ValueError and leaves the game as it was.
+    """
+    try:
+        state = _parse(data, len(game.tiles))
+    except (struct.error, KeyError, IndexError) as e:
+        raise ValueError("corrupt save state") from e
+    spawn_timer, game_over, rng, cooldowns, plants, zombies, bullets = state
+
+    game.reset()
+    random.setstate(rng)
+    game.spawn_timer = spawn_timer
+    game.game_over = game_over
+    for card, cooldown in zip(getattr(game, "cards", ()), cooldowns):
+        card.cooldown = cooldown
+    for p in plants:
+        game.plants.append(p)
+        game.tiles[p.row * COLS + p.col].plant = p
+    game.zombies.extend(zombies)
+    game.bullets.extend(bullets)
+
+
+def _parse(data, n_tiles):
+    magic, version, spawn_timer, game_over, n_cards, n_plants, n_zombies, n_bullets = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a Plants of Hell save state (or an incompatible version)")
+    off = _HEADER.size
+    rng = _RNG.unpack_from(data, off)
+    off += _RNG.size
+    rng = (3, rng[:625], rng[626] if rng[625] else None)
+    try:
+        random.Random().setstate(rng)  # rejects a Mersenne Twister index out of range
+    except ValueError:
+        raise ValueError("corrupt save state") from None
+
+    cooldowns = []
+    for _ in range(n_cards):
+        (cooldown,) = _CARD.unpack_from(data, off)
+        off += _CARD.size
+        cooldowns.append(cooldown)
+
+    plants = []
+    for _ in range(n_plants):
+        (code,) = _TYPE.unpack_from(data, off)
+        cls, st, fields = _PLANT_STRUCTS[code]
+        values = st.unpack_from(data, off + _TYPE.size)
+        off += _TYPE.size + st.size
+        if values[1] >= COLS or values[0] * COLS + values[1] >= n_tiles:
+            raise IndexError(f"plant outside the board at row {values[0]}, col {values[1]}")
+        p = cls(values[0], values[1])
+        p.__dict__.update(zip(fields, values))
+        # plants only die through take_damage; one killed this tick is still listed until the next
+        p.alive = p.hp > 0
+        plants.append(p)
+
+    zombies = []
+    for _ in range(n_zombies):
+        (code,) = _TYPE.unpack_from(data, off)
+        v = _ZOMBIE.unpack_from(data, off + _TYPE.size)
+        off += _TYPE.size + _ZOMBIE.size
+        z = object.__new__(ZOMBIE_TYPES[code])
+        Entity.__init__(z)
+        (z.row, z.alive, z.eating, target, z.x, z.y, z.speed_base, z.slow_timer,
+         z.hp, z.slow_mult, z.anim_phase, z.bite_timer) = v[:12]
+        z.color = v[12:15]
+        if target < -1:
+            raise IndexError(f"zombie target {target}")
+        z.target_plant = plants[target] if target >= 0 else None
+        zombies.append(z)
+
+    bullets = []
+    for _ in range(n_bullets):
+        alive, x, y, vx, radius, damage, r, g, b, slow, slow_time = _BULLET.unpack_from(data, off)
+        off += _BULLET.size
+        bl = Bullet(x, y, vx, radius, damage, color=(r, g, b), slow=slow, slow_time=slow_time)
+        bl.alive = alive
+        bullets.append(bl)
+    return spawn_timer, bool(game_over), rng, cooldowns, plants, zombies, bullets
+
+
+def save(game, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(serialize(game))
+
+
+def load(game, path):
+    deserialize(game, Path(path).read_bytes())
+
+
+class RewindBuffer:
+    """Fixed-size ring of recent snapshots, one every `every` ticks.
+
+    A snapshot serializes in well under a millisecond and the ring reuses its
+    slots, so recording never causes a frame-time spike.
+    """
+
+    def __init__(self, capacity: int, every: int):
+        self.capacity = capacity
+        self.every = every
+        self._slots = [None] * capacity
+        self._head = 0  # snapshots ever recorded
+        self._count = 0
+        self._ticks = 0
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        self._slots = [None] * self.capacity
+        self._head = self._count = self._ticks = 0
+
+    def tick(self, game):
+        self._ticks += 1
+        if self._ticks % self.every == 0:
+            self.record(game)
+
+    def record(self, game):
+        self._slots[self._head % self.capacity] = serialize(game)
+        self._head += 1
+        self._count = min(self._count + 1, self.capacity)
+
+    def rewind(self, steps: int = 1):
+        """Drop the newest `steps` snapshots and return the one before them, if any."""
+        if self._count == 0:
+            return None
+        steps = min(steps, self._count - 1)
+        self._head -= steps
+        self._count -= steps
+        self._ticks = 0
+        return self._slots[(self._head - 1) % self.capacity]
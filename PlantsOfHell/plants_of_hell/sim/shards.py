@@ -0,0 +1,381 @@
+import argparse
+import hashlib
+import math
+import multiprocessing as mp
+import os
+import random
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+from ..config import ROWS, COLS, GRID_TOP, TILE_H, PEA_SPEED, ZOMBIE_SPAWN_EVERY, clamp
+from ..perf.metrics import TickCounters
+from .lanes import step_lanes, SPAWN_TYPES, SPAWN_WEIGHTS
+from .savestate import PLANT_TYPES, PLANT_CODES, ZOMBIE_CODES
+
+# Lane-sharded simulation for stress boards with many lanes. Lanes are grouped
+# ROWS at a time so the regular entities (and their row geometry) work
+# unchanged; lane L is row L % ROWS of group L // ROWS. Groups are split over
+# worker processes that step in lockstep with the coordinator, which owns
+# spawning and the game-over flag. Every group has its own RNG, so a board
+# plays out the same whatever the number of workers.
+#
+# Shared memory, little-endian:
+#
+#   header   tick u32, dt f64, command u8 (0 step, 1 stop)
+#   inputs   per shard: count u16, then [kind u8, lane u32, type u8, col u8] * MAX_COMMANDS
+#   shards   per shard: game_over u8, hits u32, step time f64 (ms)
+#   lanes    per lane:  plants u16, zombies u16, bullets u16, zombie hp f64, front zombie x f64 (inf when empty)
+
+_HEADER = struct.Struct("<IdB")
+_COUNT = struct.Struct("<H")
+_COMMAND = struct.Struct("<BIBB")
+_SHARD = struct.Struct("<?Id")
+_LANE = struct.Struct("<HHHdd")
+
+MAX_COMMANDS = 256  # per shard and tick; the rest wait for the next tick
+SPAWN, PLANT = 0, 1
+STEP, STOP = 0, 1
+TICK_TIMEOUT = 10.0  # seconds the coordinator waits for a tick before giving up on the workers
+
+
+def _seed_for(seed, group):
+    return seed * 1_000_003 + group
+
+
+class LaneGroup:
+    """Up to ROWS lanes stepped by step_lanes, headless: no particles, sound or UI."""
+
+    def __init__(self, index: int, lanes: int, seed: int):
+        self.index = index
+        self.lanes = lanes
+        self.plants = []
+        self.bullets = []
+        self.zombies = []
+        self.settings = {'particles': False, 'fancy_vfx': False}
+        self.snd = None
+        self.speeds = {'pea': PEA_SPEED}
+        self.counters = TickCounters()
+        self.game_over = False
+        self.occupied = [None] * (ROWS * COLS)
+        self.rng_state = random.Random(_seed_for(seed, index)).getstate()
+
+    # entities only reach the world through these
+    def spawn_hit(self, x, y):
+        pass
+
+    def spawn_bite(self, x, y):
+        pass
+
+    def spawn_flash(self, x, y, color=None):
+        pass
+
+    def spawn_smoke(self, x, y, count=4):
+        pass
+
+    def plant_removed(self, plant):
+        i = plant.row * COLS + plant.col
+        if self.occupied[i] is plant:
+            self.occupied[i] = None
+
+    def row_for_y(self, y: float) -> int:
+        return clamp(int((y - GRID_TOP) // TILE_H), 0, ROWS - 1)
+
+    def apply(self, kind, row, code, col):
+        if kind == SPAWN:
+            self.zombies.append(SPAWN_TYPES[code](row))
+        elif self.occupied[row * COLS + col] is None:
+            plant = PLANT_TYPES[code](row, col)
+            self.occupied[row * COLS + col] = plant
+            self.plants.append(plant)
+
+    def step(self, dt, commands=()):
+        # the entities draw from the global RNG; give them this group's stream
+        random.setstate(self.rng_state)
+        for command in commands:
+            self.apply(*command)
+        step_lanes(self, dt)
+        self.rng_state = random.getstate()
+
+    def lane_stats(self):
+        """(plants, zombies, bullets, zombie hp, front zombie x) for each lane of the group."""
+        stats = [[0, 0, 0, 0.0, math.inf] for _ in range(self.lanes)]
+        for p in self.plants:
+            stats[p.row][0] += 1
+        for z in self.zombies:
+            s = stats[z.row]
+            s[1] += 1
+            s[3] += z.hp
+            if z.x < s[4]:
+                s[4] = z.x
+        for b in self.bullets:
+            stats[self.row_for_y(b.y)][2] += 1
+        return stats
+
+
+def stress_layout(lanes: int):
+    """A busy defence for every lane: two shooters (varying by lane) and a Wall-nut."""
+    shooters = PLANT_TYPES[:3]
+    for lane in range(lanes):
+        yield lane, 0, shooters[lane % 3]
+        yield lane, 1, shooters[(lane + 1) % 3]
+        yield lane, 5, PLANT_TYPES[3]
+
+
+class _Layout:
+    def __init__(self, lanes, shards):
+        self.inputs = _HEADER.size
+        self.input_size = _COUNT.size + _COMMAND.size * MAX_COMMANDS
+        self.shards = self.inputs + shards * self.input_size
+        self.lanes = self.shards + shards * _SHARD.size
+        self.end = self.lanes + lanes * _LANE.size
+
+
+def _write_outputs(buf, layout, shard, groups, step_ms):
+    game_over = False
+    hits = 0
+    for group in groups:
+        game_over |= group.game_over
+        hits += group.counters.hits
+        base = layout.lanes + group.index * ROWS * _LANE.size
+        for i, stats in enumerate(group.lane_stats()):
+            _LANE.pack_into(buf, base + i * _LANE.size, *stats)
+    _SHARD.pack_into(buf, layout.shards + shard * _SHARD.size, game_over, hits, step_ms)
+
+
+def _worker(name, shard, group_range, lanes, shards, seed, start, done):
+    shm = shared_memory.SharedMemory(name)
+    buf = shm.buf
+    layout = _Layout(lanes, shards)
+    groups = [LaneGroup(g, min(ROWS, lanes - g * ROWS), seed) for g in range(*group_range)]
+    first = group_range[0]
+    inbox = layout.inputs + shard * layout.input_size
+    try:
+        while True:
+            start.wait()
+            _tick, dt, command = _HEADER.unpack_from(buf, 0)
+            if command == STOP:
+                break
+            t0 = time.perf_counter()
+            (count,) = _COUNT.unpack_from(buf, inbox)
+            per_group = [[] for _ in groups]
+            for i in range(count):
+                kind, lane, code, col = _COMMAND.unpack_from(buf, inbox + _COUNT.size + i * _COMMAND.size)
+                per_group[lane // ROWS - first].append((kind, lane % ROWS, code, col))
+            for group, commands in zip(groups, per_group):
+                group.step(dt, commands)
+            _write_outputs(buf, layout, shard, groups, (time.perf_counter() - t0) * 1000.0)
+            done.wait()
+    finally:
+        del buf
+        shm.close()
+
+
+class ShardedBoard:
+    """A board of `lanes` lanes stepped by `workers` processes in lockstep.
+
+    With workers=0 the groups are stepped in this process, which gives the
+    single-core baseline and the reference the sharded runs must reproduce.
+    Per-tick inputs (spawns, plantings) and outputs (lane summaries) travel
+    through one shared-memory block; two barriers keep everyone on the same tick.
+    """
+
+    def __init__(self, lanes: int, workers: int = 0, seed: int = 1, layout: bool = True):
+        self.lanes = lanes
+        self.groups = math.ceil(lanes / ROWS)
+        self.workers = min(workers, self.groups)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.spawns = 0
+        self.game_over = False
+        # one spawn per ROWS lanes every ZOMBIE_SPAWN_EVERY seconds, like the regular board
+        self.spawn_every = ZOMBIE_SPAWN_EVERY * ROWS / lanes
+        self.spawn_timer = 1.0
+        self._pending = []  # (lane, kind, type code, col)
+        if layout:
+            for lane, col, cls in stress_layout(lanes):
+                self.place(lane, col, cls)
+
+        shards = max(1, self.workers)
+        self.layout = _Layout(lanes, shards)
+        self.shm = shared_memory.SharedMemory(create=True, size=self.layout.end)
+        self.buf = self.shm.buf
+        self._procs = []
+        if self.workers:
+            ctx = mp.get_context()
+            self._start = ctx.Barrier(self.workers + 1)
+            self._done = ctx.Barrier(self.workers + 1)
+            per, extra = divmod(self.groups, self.workers)
+            first = 0
+            self.group_ranges = []
+            for shard in range(self.workers):
+                last = first + per + (shard < extra)
+                self.group_ranges.append((first, last))
+                proc = ctx.Process(target=_worker, name=f"lane-shard-{shard}", daemon=True,
+                                   args=(self.shm.name, shard, (first, last), lanes, shards, seed,
+                                         self._start, self._done))
+                proc.start()
+                self._procs.append(proc)
+                first = last
+        else:
+            self.group_ranges = [(0, self.groups)]
+            self._local = [LaneGroup(g, min(ROWS, lanes - g * ROWS), seed) for g in range(self.groups)]
+
+    def place(self, lane: int, col: int, plant_cls):
+        self._pending.append((lane, PLANT, PLANT_CODES[plant_cls], col))
+
+    def _spawn(self, dt):
+        self.spawn_timer -= dt
+        while self.spawn_timer <= 0:
+            lane = self.rng.randrange(self.lanes)
+            z_cls = self.rng.choices(SPAWN_TYPES, weights=SPAWN_WEIGHTS)[0]
+            self._pending.append((lane, SPAWN, ZOMBIE_CODES[z_cls], 0))
+            self.spawns += 1
+            self.spawn_timer += self.spawn_every * self.rng.uniform(0.8, 1.2)
+
+    def _shard_of(self, lane):
+        group = lane // ROWS
+        for shard, (first, last) in enumerate(self.group_ranges):
+            if first <= group < last:
+                return shard
+        raise IndexError(lane)
+
+    def _write_inputs(self):
+        buf, layout = self.buf, self.layout
+        counts = [0] * len(self.group_ranges)
+        waiting = []
+        for lane, kind, code, col in self._pending:
+            shard = self._shard_of(lane)
+            i = counts[shard]
+            if i == MAX_COMMANDS:
+                waiting.append((lane, kind, code, col))
+                continue
+            base = layout.inputs + shard * layout.input_size + _COUNT.size
+            _COMMAND.pack_into(buf, base + i * _COMMAND.size, kind, lane, code, col)
+            counts[shard] = i + 1
+        for shard, count in enumerate(counts):
+            _COUNT.pack_into(buf, layout.inputs + shard * layout.input_size, count)
+        self._pending = waiting
+
+    def step(self, dt: float):
+        if self.game_over:
+            return
+        self._spawn(dt)
+        self.tick += 1
+        if not self.workers:
+            per_group = [[] for _ in self._local]
+            for lane, kind, code, col in self._pending:
+                per_group[lane // ROWS].append((kind, lane % ROWS, code, col))
+            self._pending = []
+            t0 = time.perf_counter()
+            for group, commands in zip(self._local, per_group):
+                group.step(dt, commands)
+            _write_outputs(self.buf, self.layout, 0, self._local, (time.perf_counter() - t0) * 1000.0)
+        else:
+            self._write_inputs()
+            _HEADER.pack_into(self.buf, 0, self.tick, dt, STEP)
+            try:
+                self._start.wait(TICK_TIMEOUT)
+                self._done.wait(TICK_TIMEOUT)
+            except threading.BrokenBarrierError:
+                dead = [p.name for p in self._procs if not p.is_alive()]
+                raise RuntimeError(f"lane workers stopped responding at tick {self.tick}"
+                                   + (f" ({', '.join(dead)} exited)" if dead else "")) from None
+        for shard in range(len(self.group_ranges)):
+            if _SHARD.unpack_from(self.buf, self.layout.shards + shard * _SHARD.size)[0]:
+                self.game_over = True
+
+    def shard_stats(self):
+        """(game_over, hits, step ms) per shard for the last tick."""
+        return [_SHARD.unpack_from(self.buf, self.layout.shards + i * _SHARD.size)
+                for i in range(len(self.group_ranges))]
+
+    def lane_stats(self):
+        """(plants, zombies, bullets, zombie hp, front zombie x) per lane after the last tick."""
+        return [_LANE.unpack_from(self.buf, self.layout.lanes + i * _LANE.size) for i in range(self.lanes)]
+
+    def digest(self) -> str:
+        """Hash of every lane summary and the game-over flag; equal across worker counts."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.buf[self.layout.lanes:self.layout.end])
+        h.update(bytes((self.game_over,)))
+        return h.hexdigest()
+
+    def close(self):
+        if self._procs:
+            _HEADER.pack_into(self.buf, 0, self.tick, 0.0, STOP)
+            try:
+                self._start.wait(TICK_TIMEOUT)
+            except threading.BrokenBarrierError:
+                pass
+            for proc in self._procs:
+                proc.join(timeout=2.0)
+                if proc.is_alive():
+                    proc.terminate()
+            self._procs = []
+        self.buf = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+def run(lanes, workers, ticks, seed=1, dt=1 / 60, digests=False):
+    board = ShardedBoard(lanes, workers, seed)
+    trail = []
+    try:
+        t0 = time.perf_counter()
+        for _ in range(ticks):
+            board.step(dt)
+            if digests:
+                trail.append(board.digest())
+            if board.game_over:
+                break
+        elapsed = time.perf_counter() - t0
+        stats = board.lane_stats()
+        return {
+            "ticks": board.tick,
+            "seconds": elapsed,
+            "ticks_per_second": board.tick / elapsed,
+            "game_over": board.game_over,
+            "spawns": board.spawns,
+            "zombies": sum(s[1] for s in stats),
+            "hits": sum(s[1] for s in board.shard_stats()),
+            "digests": trail,
+        }
+    finally:
+        board.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="plants_of_hell.sim.shards",
+                                     description="Step a many-lane stress board, split across worker processes")
+    parser.add_argument("--lanes", type=int, default=120)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (0 steps every lane in this process)")
+    parser.add_argument("--ticks", type=int, default=3600)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--check", action="store_true",
+                        help="also run in-process and fail unless every tick's lane summaries match")
+    args = parser.parse_args(argv)
+
+    result = run(args.lanes, args.workers, args.ticks, args.seed, digests=args.check)
+    print(f"{args.lanes} lanes, {args.workers} workers: {result['ticks']} ticks in {result['seconds']:.2f} s "
+          f"({result['ticks_per_second']:.0f} ticks/s), {result['spawns']} spawns, {result['hits']} hits, "
+          f"{result['zombies']} zombies on the board" + (", game over" if result["game_over"] else ""))
+    if args.check:
+        baseline = run(args.lanes, 0, args.ticks, args.seed, digests=True)
+        print(f"{args.lanes} lanes in-process: {baseline['ticks_per_second']:.0f} ticks/s "
+              f"(x{result['ticks_per_second'] / baseline['ticks_per_second']:.2f} with {args.workers} workers)")
+        for tick, (a, b) in enumerate(zip(baseline["digests"], result["digests"]), 1):
+            if a != b:
+                print(f"FAIL: lane summaries diverge at tick {tick}")
+                raise SystemExit(1)
+        if len(baseline["digests"]) != len(result["digests"]):
+            print("FAIL: runs ended on different ticks")
+            raise SystemExit(1)
+        print("OK: identical lane summaries on every tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+import argparse
+import itertools
+import struct
+import time
+from multiprocessing import shared_memory
+
+from ..config import ROWS
+from .savestate import PLANT_CODES, ZOMBIE_CODES, PLANT_TYPES, ZOMBIE_TYPES
+
+# Shared-memory ring of per-tick world states, for viewers and analytics tools
+# running in other processes. Layout (little-endian, fixed for a given header):
+#
+#   header   magic, version, rows, slot count, slot size, max plants/zombies/bullets
+#   head     u64, number of ticks published so far; slot = (head - 1) % slots is newest
+#   slots    [slot] * slot count
+#
+#   slot     seq u64 (odd while being written), tick u64, game_over u8, truncated u8,
+#            plant/zombie/bullet counts u16, then fixed-size arrays:
+#   lane     plants u8, zombies u8, pad u16, front zombie x f32 (inf when empty)  * rows
+#   plant    type u8, row u8, col u8, zombified u8, hp f32, max_hp f32           * max plants
+#   zombie   type u8, row u8, eating u8, pad u8, x f32, y f32, hp f32, slow f32  * max zombies
+#   bullet   x f32, y f32, damage i16, slowing u8, radius u8                     * max bullets
+#
+# Readers copy a slot out and check that `seq` did not change meanwhile.
+
+MAGIC = b"POHW"
+VERSION = 1
+DEFAULT_NAME = "plants_of_hell"
+
+_HEADER = struct.Struct("<4sHHIIHHH2x")
+_HEAD = struct.Struct("<Q")
+_SLOT = struct.Struct("<QQBBHHH")
+_SEQ = struct.Struct("<Q")
+_LANE = struct.Struct("<BB2xf")
+_PLANT = struct.Struct("<BBB?ff")
+_ZOMBIE = struct.Struct("<BB?xffff")
+_BULLET = struct.Struct("<ffh?B")
+
+_HEAD_OFFSET = _HEADER.size
+_SLOTS_OFFSET = _HEAD_OFFSET + _HEAD.size
+
+
+def _slot_size(max_plants, max_zombies, max_bullets):
+    return (_SLOT.size + _LANE.size * ROWS + _PLANT.size * max_plants
+            + _ZOMBIE.size * max_zombies + _BULLET.size * max_bullets)
+
+
+class WorldFrame:
+    """One tick read back from the ring; entity fields are plain tuples."""
+
+    __slots__ = ("tick", "game_over", "truncated", "lanes", "plants", "zombies", "bullets")
+
+    def __init__(self, tick, game_over, truncated, lanes, plants, zombies, bullets):
+        self.tick = tick
+        self.game_over = game_over
+        self.truncated = truncated
+        self.lanes = lanes
+        self.plants = plants
+        self.zombies = zombies
+        self.bullets = bullets
+
+
+class StateExporter:
+    """Writes the board into shared memory after every tick.
+
+    Everything is packed in place into the mapped buffer, so publishing costs a
+    handful of struct.pack_into calls and readers never touch the game process.
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME, slots: int = 64, max_plants: int = 64,
+                 max_zombies: int = 256, max_bullets: int = 512):
+        self.slots = slots
+        self.max_plants = max_plants
+        self.max_zombies = max_zombies
+        self.max_bullets = max_bullets
+        self.slot_size = _slot_size(max_plants, max_zombies, max_bullets)
+        size = _SLOTS_OFFSET + self.slot_size * slots
+        try:
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            # another game may be exporting under this name, and readers may hold it:
+            # never unlink a segment this process did not create
+            raise RuntimeError(f"shared memory {name!r} already exists (another game exporting, or left "
+                               f"behind by a crash); pick another --export-shm name or remove /dev/shm/{name}")
+        self.buf = self.shm.buf
+        _HEADER.pack_into(self.buf, 0, MAGIC, VERSION, ROWS, slots, self.slot_size,
+                          max_plants, max_zombies, max_bullets)
+        _HEAD.pack_into(self.buf, _HEAD_OFFSET, 0)
+        self.head = 0
+        self._lane_plants = [0] * ROWS
+        self._lane_zombies = [0] * ROWS
+        self._lane_front = [0.0] * ROWS
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def publish(self, game):
+        buf = self.buf
+        base = _SLOTS_OFFSET + (self.head % self.slots) * self.slot_size
+        (seq,) = _SEQ.unpack_from(buf, base)
+        _SEQ.pack_into(buf, base, seq + 1)
+
+        lane_plants = self._lane_plants
+        lane_zombies = self._lane_zombies
+        lane_front = self._lane_front
+        for i in range(ROWS):
+            lane_plants[i] = lane_zombies[i] = 0
+            lane_front[i] = float("inf")
+
+        off = base + _SLOT.size + _LANE.size * ROWS
+        n_plants = min(len(game.plants), self.max_plants)
+        for p in itertools.islice(game.plants, n_plants):
+            _PLANT.pack_into(buf, off, PLANT_CODES[p.__class__], p.row, p.col, p.zombified, p.hp, p.max_hp)
+            off += _PLANT.size
+            lane_plants[p.row] += 1
+
+        off = base + _SLOT.size + _LANE.size * ROWS + _PLANT.size * self.max_plants
+        n_zombies = min(len(game.zombies), self.max_zombies)
+        for z in itertools.islice(game.zombies, n_zombies):
+            _ZOMBIE.pack_into(buf, off, ZOMBIE_CODES[z.__class__], z.row, z.eating, z.x, z.y, z.hp, z.slow_timer)
+            off += _ZOMBIE.size
+            lane_zombies[z.row] += 1
+            if z.x < lane_front[z.row]:
+                lane_front[z.row] = z.x
+
+        off = base + _SLOT.size + _LANE.size * ROWS + _PLANT.size * self.max_plants + _ZOMBIE.size * self.max_zombies
+        n_bullets = min(len(game.bullets), self.max_bullets)
+        for b in itertools.islice(game.bullets, n_bullets):
+            _BULLET.pack_into(buf, off, b.x, b.y, b.damage, b.slow > 0, b.radius)
+            off += _BULLET.size
+
+        off = base + _SLOT.size
+        for i in range(ROWS):
+            _LANE.pack_into(buf, off, min(lane_plants[i], 255), min(lane_zombies[i], 255), lane_front[i])
+            off += _LANE.size
+
+        truncated = (n_plants < len(game.plants) or n_zombies < len(game.zombies)
+                     or n_bullets < len(game.bullets))
+        _SLOT.pack_into(buf, base, seq + 1, self.head, game.game_over, truncated, n_plants, n_zombies, n_bullets)
+        _SEQ.pack_into(buf, base, seq + 2)
+        self.head += 1
+        _HEAD.pack_into(buf, _HEAD_OFFSET, self.head)
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class StateReader:
+    """Attaches to a ring written by StateExporter from another process."""
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        try:
+            self.shm = shared_memory.SharedMemory(name, track=False)
+        except TypeError:  # Python < 3.13 always registers with the resource tracker
+            from multiprocessing import resource_tracker
+            self.shm = shared_memory.SharedMemory(name)
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+        self.buf = self.shm.buf
+        magic, version, rows, slots, slot_size, max_plants, max_zombies, max_bullets = _HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{name!r} is not a Plants of Hell state ring (or an incompatible version)")
+        self.rows = rows
+        self.slots = slots
+        self.slot_size = slot_size
+        self.max_plants = max_plants
+        self.max_zombies = max_zombies
+
+    @property
+    def head(self) -> int:
+        return _HEAD.unpack_from(self.buf, _HEAD_OFFSET)[0]
+
+    def read(self, tick: int | None = None, retries: int = 3):
+        """Return the newest tick (or `tick` while it is still in the ring), else None."""
+        for _ in range(retries):
+            head = self.head
+            if tick is None:
+                index = head - 1
+            elif head - self.slots <= tick < head:
+                index = tick
+            else:
+                return None
+            if index < 0:
+                return None
+            frame = self._read_slot(_SLOTS_OFFSET + (index % self.slots) * self.slot_size)
+            if frame is not None and frame.tick == index:
+                return frame
+        return None
+
+    def _read_slot(self, base):
+        buf = self.buf
+        seq, tick, game_over, truncated, n_plants, n_zombies, n_bullets = _SLOT.unpack_from(buf, base)
+        if seq & 1:
+            return None
+        off = base + _SLOT.size
+        lanes = [_LANE.unpack_from(buf, off + i * _LANE.size) for i in range(self.rows)]
+        off += _LANE.size * self.rows
+        plants = [_PLANT.unpack_from(buf, off + i * _PLANT.size) for i in range(n_plants)]
+        off += _PLANT.size * self.max_plants
+        zombies = [_ZOMBIE.unpack_from(buf, off + i * _ZOMBIE.size) for i in range(n_zombies)]
+        off += _ZOMBIE.size * self.max_zombies
+        bullets = [_BULLET.unpack_from(buf, off + i * _BULLET.size) for i in range(n_bullets)]
+        if _SEQ.unpack_from(buf, base)[0] != seq:
+            return None  # overwritten while we were reading
+        return WorldFrame(tick, bool(game_over), bool(truncated), lanes, plants, zombies, bullets)
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="plants_of_hell.sim.shared_state",
+                                     description="Print lane summaries from a running game started with --export-shm")
+    parser.add_argument("name", nargs="?", default=DEFAULT_NAME)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between lines")
+    args = parser.parse_args(argv)
+    reader = StateReader(args.name)
+    try:
+        while True:
+            frame = reader.read()
+            if frame is not None:
+                lanes = "  ".join(
+                    f"L{i}: {p}p {z}z" + (f" front {front:.0f}" if z else "")
+                    for i, (p, z, front) in enumerate(frame.lanes)
+                )
+                kinds = {}
+                for z in frame.zombies:
+                    name = ZOMBIE_TYPES[z[0]].__name__
+                    kinds[name] = kinds.get(name, 0) + 1
+                plants = {}
+                for p in frame.plants:
+                    name = PLANT_TYPES[p[0]].__name__
+                    plants[name] = plants.get(name, 0) + 1
+                print(f"tick {frame.tick}{' GAME OVER' if frame.game_over else ''} | {lanes} | "
+                      f"{len(frame.bullets)} bullets | {plants} | {kinds}", flush=True)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
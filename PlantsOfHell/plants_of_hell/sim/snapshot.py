@@ -0,0 +1,36 @@
+def freeze(entity):
+    """Detached copy of an entity holding only what its draw code reads.
+
+    The copy is an instance of the same class, so the regular draw methods (and
+    the alternative renderers) work on it unchanged. Treat it as read-only; the
+    draw code only ever writes scratch state such as Plant._last_sprite_rect.
+    """
+    frozen = object.__new__(entity.__class__)
+    src = entity.__dict__
+    frozen.__dict__.update({name: src[name] for name in entity.snapshot_fields})
+    return frozen
+
+
+class WorldSnapshot:
+    """Render-side copy of the board at the end of one simulation tick."""
+
+    __slots__ = ("tick", "plants", "bullets", "zombies", "particles", "game_over")
+
+    def __init__(self, tick, plants, bullets, zombies, particles, game_over):
+        self.tick = tick
+        self.plants = plants
+        self.bullets = bullets
+        self.zombies = zombies
+        self.particles = particles
+        self.game_over = game_over
+
+
+def capture(game, tick: int) -> WorldSnapshot:
+    return WorldSnapshot(
+        tick,
+        tuple(freeze(p) for p in game.plants),
+        tuple(freeze(b) for b in game.bullets),
+        tuple(freeze(z) for z in game.zombies),
+        tuple(freeze(p) for p in game.particles),
+        game.game_over,
+    )
@@ -0,0 +1,67 @@
+import threading
+import time
+
+from .snapshot import capture
+
+
+class SimulationThread(threading.Thread):
+    """Steps the game at a fixed rate and publishes a snapshot after every tick.
+
+    The render loop draws whatever `latest` holds and takes `lock` only around
+    input handling, so a slow frame no longer delays simulation ticks.
+    Fast-forward runs `speed` ticks per step period, or back-to-back batches
+    at max speed; the snapshot is only captured after a batch that advanced the
+    world (not while game over or the settings panel pause it), or after
+    invalidate() when input changed the board between ticks.
+    """
+
+    # if the simulation falls further behind than this many steps, drop them
+    # instead of trying to catch up in a burst
+    MAX_LAG_STEPS = 5
+    # ticks per lock hold at max fast-forward speed; the render loop gets the
+    # lock (and a fresh snapshot) between batches
+    MAX_SPEED_BATCH = 16
+
+    def __init__(self, game, step: float):
+        super().__init__(name="simulation", daemon=True)
+        self.game = game
+        self.step = step
+        self.lock = threading.Lock()
+        self.tick = 0
+        self.latest = capture(game, 0)
+        self._stale = False
+        self._stopping = threading.Event()
+
+    def invalidate(self):
+        """Capture a new snapshot after the next step even if no tick runs."""
+        self._stale = True
+
+    def stop(self):
+        self._stopping.set()
+        self.join(timeout=1.0)
+
+    def run(self):
+        game = self.game
+        next_time = time.perf_counter()
+        while not self._stopping.is_set():
+            speed = game.settings.get('speed', 1)
+            with self.lock:
+                if not game.window_paused:
+                    ticks = game.counters.ticks
+                    with game.profiler.section():
+                        for _ in range(speed or self.MAX_SPEED_BATCH):
+                            game.update(self.step)
+                            self.tick += 1
+                    if self._stale or game.counters.ticks != ticks:
+                        self._stale = False
+                        self.latest = capture(game, self.tick)
+            if not speed and not game.is_idle():
+                time.sleep(0)  # let the render thread take the lock
+                next_time = time.perf_counter()
+                continue
+            next_time += self.step
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                self._stopping.wait(delay)
+            elif -delay > self.step * self.MAX_LAG_STEPS:
+                next_time = time.perf_counter()
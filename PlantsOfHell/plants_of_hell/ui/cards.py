@@ -1,5 +1,6 @@
 import pygame as pg
 from ..config import BLACK
+from ..render.surface_cache import get_text
 
 
 class PlantCard:
@@ -10,6 +11,7 @@ class PlantCard:
         self.cooldown = 0.0
         self.cooldown_time = 1.0
         self.preview_provider = preview_provider
+        self._preview = None
 
     def can_pick(self):
         return self.cooldown <= 0
@@ -27,10 +29,14 @@ class PlantCard:
         col = (200, 230, 200) if self.can_pick() else (150, 160, 150)
         pg.draw.rect(surf, col, self.rect, border_radius=10)
         pg.draw.rect(surf, (40, 80, 60), self.rect, 3, border_radius=10)
-        text = font.render(self.label, True, BLACK)
+        text = get_text(font, self.label, BLACK)
         surf.blit(text, (self.rect.centerx - text.get_width() // 2, self.rect.centery - text.get_height() // 2))
 
     def get_preview(self):
-        if callable(self.preview_provider):
-            return self.preview_provider()
-        return self.preview_provider
+        # providers return long-lived art, so resolve once instead of every dragged frame
+        if self._preview is None:
+            if callable(self.preview_provider):
+                self._preview = self.preview_provider()
+            else:
+                self._preview = self.preview_provider
+        return self._preview
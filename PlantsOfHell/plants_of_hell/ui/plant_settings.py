@@ -1,6 +1,6 @@
 import pygame as pg
 
-from ..config import WIDTH, GRID_TOP
+from ..config import WIDTH, HEIGHT, GRID_TOP
 from .widgets import Button, Checkbox
 
 
@@ -24,6 +24,12 @@ class PlantInspector:
 
         self.preview_rect = pg.Rect(self.rect.left + 16, self.rect.top + 56, self.rect.width - 32, 110)
 
+        # Screen-sized so widgets draw at their own coordinates; only the panel
+        # area is ever blitted.
+        self._layer = None
+        self._layer_state = None
+        self._fitted = (None, None)
+
     def show(self, plant):
         self.plant = plant
         self.visible = True
@@ -62,6 +68,18 @@ class PlantInspector:
             return
 
         self.chk_zombie.checked = bool(getattr(self.plant, "zombified", False))
+        preview = self._current_preview_surface()
+        state = (self.plant.__class__, id(preview), self.chk_zombie.state(), self.close_btn.state())
+        if self._layer is None or state != self._layer_state:
+            self._render_layer(preview)
+            self._layer_state = state
+        surf.blit(self._layer, self.rect, area=self.rect)
+
+    def _render_layer(self, preview):
+        if self._layer is None:
+            self._layer = pg.Surface((WIDTH, HEIGHT), pg.SRCALPHA)
+        surf = self._layer
+        surf.fill((0, 0, 0, 0), self.rect)
 
         pg.draw.rect(surf, (235, 244, 238), self.rect, border_radius=12)
         pg.draw.rect(surf, (40, 80, 60), self.rect, 2, border_radius=12)
@@ -72,7 +90,6 @@ class PlantInspector:
         pg.draw.rect(surf, (220, 230, 225), self.preview_rect, border_radius=10)
         pg.draw.rect(surf, (100, 130, 110), self.preview_rect, 1, border_radius=10)
 
-        preview = self._current_preview_surface()
         if preview:
             scaled = self._fit_to_rect(preview, self.preview_rect)
             dest = scaled.get_rect()
@@ -91,9 +108,14 @@ class PlantInspector:
         return sprite
 
     def _fit_to_rect(self, surface: pg.Surface, bounds: pg.Rect) -> pg.Surface:
+        if self._fitted[0] is surface:
+            return self._fitted[1]
         sw, sh = surface.get_size()
         if sw <= bounds.width and sh <= bounds.height:
-            return surface
-        ratio = min(bounds.width / sw, bounds.height / sh)
-        new_size = (max(1, int(sw * ratio)), max(1, int(sh * ratio)))
-        return pg.transform.smoothscale(surface, new_size)
+            fitted = surface
+        else:
+            ratio = min(bounds.width / sw, bounds.height / sh)
+            new_size = (max(1, int(sw * ratio)), max(1, int(sh * ratio)))
+            fitted = pg.transform.smoothscale(surface, new_size)
+        self._fitted = (surface, fitted)
+        return fitted
@@ -1,6 +1,6 @@
 import pygame as pg
 from .widgets import Button, Slider, Checkbox
-from ..config import WIDTH, HEIGHT
+from ..config import WIDTH, HEIGHT, MIN_RENDER_SCALE, snap_render_scale, speed_label
 
 
 class SettingsPanel:
@@ -38,14 +38,26 @@ class SettingsPanel:
         # Performance tab controls
         self.chk_particles = Checkbox(pg.Rect(area_left + 10, area_top + 46, 22, 22), checked=True, label="Particles", font=font)
         self.chk_fancy = Checkbox(pg.Rect(area_left + 10, area_top + 86, 22, 22), checked=True, label="Fancy VFX (muzzle, trails)", font=font)
+        self.scale_slider = Slider(pg.Rect(area_left + 200, area_top + 146, 200, 18), value=1.0)
 
         # Game tab controls
         self.btn_restart = Button(pg.Rect(self.rect.centerx - 100, area_top + 10, 200, 44), "Restart Level", font)
+        self.btn_speed = Button(pg.Rect(area_left + 200, area_top + 100, 120, 40), speed_label(1), font)
 
         # Close button (persistent)
         cw = font.size("Close")[0] + 24
         self.btn_close = Button(pg.Rect(self.rect.right - (cw + 10), self.rect.top + 10, cw, 28), "Close", font)
 
+        # Everything that can change the panel's pixels; the cached layer is
+        # redrawn only when the state of one of these (or the tab) changes.
+        self.controls = [
+            self.music_slider, self.fx_slider,
+            self.chk_particles, self.chk_fancy, self.scale_slider,
+            self.btn_restart, self.btn_speed, self.btn_close,
+        ]
+        self._layer = None
+        self._layer_state = None
+
     def show(self, game):
         self.open = True
         self.active_tab = "Music"
@@ -54,6 +66,12 @@ class SettingsPanel:
         self.fx_slider.value = game.effects_volume
         self.chk_particles.checked = game.settings.get('particles', True)
         self.chk_fancy.checked = game.settings.get('fancy_vfx', True)
+        scale = game.settings.get('render_scale', 1.0)
+        self.scale_slider.value = (scale - MIN_RENDER_SCALE) / (1.0 - MIN_RENDER_SCALE)
+        self.btn_speed.label = speed_label(game.settings.get('speed', 1))
+
+    def render_scale(self) -> float:
+        return snap_render_scale(MIN_RENDER_SCALE + self.scale_slider.value * (1.0 - MIN_RENDER_SCALE))
 
     def hide(self):
         self.open = False
@@ -63,6 +81,7 @@ class SettingsPanel:
         game.effects_volume = self.fx_slider.value
         game.settings['particles'] = self.chk_particles.checked
         game.settings['fancy_vfx'] = self.chk_fancy.checked
+        game.settings['render_scale'] = self.render_scale()
         if game.snd and game.snd.enabled:
             game.snd.set_music_volume(game.music_volume)
             game.snd.set_effects_volume(game.effects_volume)
@@ -97,23 +116,40 @@ class SettingsPanel:
                 handled = True
             if self.chk_fancy.handle_event(event):
                 handled = True
+            if self.scale_slider.handle_event(event):
+                handled = True
         elif self.active_tab == "Game":
             if self.btn_restart.handle_event(event):
-                game.reset()
+                game.new_game()
+                handled = True
+            if self.btn_speed.handle_event(event):
+                game.cycle_speed()
+                self.btn_speed.label = speed_label(game.settings['speed'])
                 handled = True
 
         if handled:
             self.apply_to_game(game)
         return handled
 
+    def _visual_state(self):
+        return (self.active_tab, *(c.state() for c in self.controls))
+
     def draw(self, surf):
         if not self.open:
             return
+        state = self._visual_state()
+        if self._layer is None or state != self._layer_state:
+            self._render_layer()
+            self._layer_state = state
+        surf.blit(self._layer, (0, 0))
+
+    def _render_layer(self):
+        if self._layer is None:
+            self._layer = pg.Surface((WIDTH, HEIGHT), pg.SRCALPHA)
+        surf = self._layer
 
         # Dim background
-        overlay = pg.Surface((WIDTH, HEIGHT), pg.SRCALPHA)
-        overlay.fill((0, 0, 0, 140))
-        surf.blit(overlay, (0, 0))
+        surf.fill((0, 0, 0, 140))
 
         # Panel
         pg.draw.rect(surf, (230, 240, 235), self.rect, border_radius=14)
@@ -150,9 +186,13 @@ class SettingsPanel:
             label("Toggles", ly)
             self.chk_particles.draw(surf)
             self.chk_fancy.draw(surf)
+            label(f"Render Scale {int(self.render_scale() * 100)}%", ly + 136)
+            self.scale_slider.draw(surf)
         elif self.active_tab == "Game":
             label("Session", ly)
             self.btn_restart.draw(surf)
+            label("Speed (F)", self.btn_speed.rect.top + 8)
+            self.btn_speed.draw(surf)
 
         # Close button
         self.btn_close.draw(surf)
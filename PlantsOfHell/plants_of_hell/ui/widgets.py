@@ -1,4 +1,5 @@
 import pygame as pg
+from ..render.surface_cache import get_text
 
 
 class Button:
@@ -17,11 +18,14 @@ class Button:
                 return True
         return False
 
+    def state(self):
+        return (self.label, self.hover)
+
     def draw(self, surf):
         col = self.bg if not self.hover else (max(0, self.bg[0]-10), max(0, self.bg[1]-10), max(0, self.bg[2]-10))
         pg.draw.rect(surf, col, self.rect, border_radius=8)
         pg.draw.rect(surf, (40, 80, 60), self.rect, 2, border_radius=8)
-        text = self.font.render(self.label, True, (10, 10, 10))
+        text = get_text(self.font, self.label, (10, 10, 10))
         surf.blit(text, (self.rect.centerx - text.get_width()//2, self.rect.centery - text.get_height()//2))
 
 
@@ -46,6 +50,9 @@ class Slider:
             return True
         return False
 
+    def state(self):
+        return (self.value,)
+
     def _set_from_pos(self, x: int):
         t = (x - self.rect.left) / max(1, self.rect.width)
         self.value = max(0.0, min(1.0, t))
@@ -76,6 +83,9 @@ class Checkbox:
                 return True
         return False
 
+    def state(self):
+        return (self.checked,)
+
     def draw(self, surf):
         pg.draw.rect(surf, (230, 240, 240), self.rect)
         pg.draw.rect(surf, (40, 80, 60), self.rect, 2)
@@ -83,6 +93,47 @@ class Checkbox:
             inner = self.rect.inflate(-8, -8)
             pg.draw.rect(surf, (60, 160, 110), inner)
         if self.label and self.font:
-            text = self.font.render(self.label, True, (10, 10, 10))
+            text = get_text(self.font, self.label, (10, 10, 10))
             surf.blit(text, (self.rect.right + 10, self.rect.top - 2))
 
+
+class LazyPanel:
+    """Stands in for a panel until it is first shown, so its module is only imported then.
+
+    While nothing was built it is closed: draw and hide do nothing and events
+    pass through. `load` returns the real panel; other attributes go to it.
+    """
+
+    def __init__(self, load):
+        self._load = load
+        self.panel = None
+
+    def get(self):
+        if self.panel is None:
+            self.panel = self._load()
+        return self.panel
+
+    @property
+    def open(self) -> bool:
+        return self.panel is not None and self.panel.open
+
+    @property
+    def plant(self):
+        return self.panel.plant if self.panel is not None else None
+
+    def show(self, *args):
+        self.get().show(*args)
+
+    def hide(self):
+        if self.panel is not None:
+            self.panel.hide()
+
+    def handle_event(self, *args) -> bool:
+        return self.panel is not None and self.panel.handle_event(*args)
+
+    def draw(self, surf):
+        if self.panel is not None:
+            self.panel.draw(surf)
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)